@@ -1,7 +1,8 @@
-from backend.app import app
+from backend.app import create_app
 
-# Elastic Beanstalk expects the WSGI application to be named 'application'
-application = app
+# Elastic Beanstalk expects the WSGI application to be named 'application'.
+# Database warm-up continues on a background thread after this returns.
+application = create_app()
 
 if __name__ == "__main__":
     application.run(debug=True)
@@ -8,5 +8,11 @@ from .storage import storage_bp
 from .auth import auth_api_bp
 from .ace_pot import ace_pot_bp
 from .archive import archive_bp
+from .events import events_bp
+from .live import live_bp
+from .stats import stats_bp
+from .batch import batch_bp
+from .jobs import jobs_bp
 
-all_blueprints = [players_bp, tournaments_bp, storage_bp, auth_api_bp, ace_pot_bp, archive_bp]
+all_blueprints = [players_bp, tournaments_bp, storage_bp, auth_api_bp, ace_pot_bp, archive_bp, events_bp,
+                  live_bp, stats_bp, batch_bp, jobs_bp]
@@ -1,6 +1,10 @@
 """API endpoints for ace pot management."""
 
-from flask import Blueprint, jsonify, request, current_app
+import datetime
+
+from flask import Blueprint, jsonify, request, session, current_app
+from backend.events import publish, publish_tournament, ACE_POT_CHANNEL
+from tournament_core.player_search import PlayerNotFoundError
 
 ace_pot_bp = Blueprint('ace_pot_api', __name__)
 
@@ -9,6 +13,10 @@ def _apm():
     return current_app.rating_system.ace_pot_manager
 
 
+def _publish_balance(balance):
+    publish('ace_pot.balance', {'balance': balance}, ACE_POT_CHANNEL)
+
+
 @ace_pot_bp.route('/api/ace-pot/balance', methods=['GET'])
 def get_balance():
     return jsonify(_apm().get_balance())
@@ -28,9 +36,45 @@ def update_config():
     return jsonify(_apm().get_config())
 
 
+LEDGER_PAGE_SIZE = 50
+LEDGER_MAX_PAGE_SIZE = 500
+
+
 @ace_pot_bp.route('/api/ace-pot/ledger', methods=['GET'])
 def get_ledger():
-    return jsonify(_apm().get_ledger())
+    """Paginated ledger, newest first.
+
+    Query params: limit, before (entry_id cursor), start/end (YYYY-MM-DD),
+    tournament_id, player, summary=1 for per-tournament aggregates.
+    """
+    args = request.args
+    try:
+        limit = min(int(args.get('limit', LEDGER_PAGE_SIZE)), LEDGER_MAX_PAGE_SIZE)
+        before_id = int(args['before']) if args.get('before') else None
+        tournament_id = int(args['tournament_id']) if args.get('tournament_id') else None
+    except ValueError:
+        return jsonify({'error': 'limit, before and tournament_id must be integers'}), 400
+    if limit < 1:
+        return jsonify({'error': 'limit must be positive'}), 400
+    try:
+        start = datetime.date.fromisoformat(args['start']) if args.get('start') else None
+        end = datetime.date.fromisoformat(args['end']) if args.get('end') else None
+    except ValueError:
+        return jsonify({'error': 'start and end must be dates (YYYY-MM-DD)'}), 400
+
+    player_name = args.get('player')
+    if player_name:
+        try:
+            player_name = current_app.rating_system.get_player_name(player_name)
+        except PlayerNotFoundError as e:
+            return jsonify({'error': f"Player '{player_name}' not found", 'suggestions': e.suggestions}), 404
+
+    return jsonify(_apm().get_ledger_page(
+        limit=limit, before_id=before_id,
+        summary=args.get('summary') in ('1', 'true'),
+        start_date=start, end_date=end,
+        tournament_id=tournament_id, player_name=player_name,
+    ))
 
 
 @ace_pot_bp.route('/api/ace-pot/balance', methods=['PUT'])
@@ -39,7 +83,23 @@ def set_balance():
     if not data or 'amount' not in data:
         return jsonify({'error': 'amount required'}), 400
     _apm().set_balance(float(data['amount']), data.get('description'))
-    return jsonify(_apm().get_balance())
+    balance = _apm().get_balance()
+    _publish_balance(balance)
+    return jsonify(balance)
+
+
+@ace_pot_bp.route('/api/ace-pot/verify', methods=['GET'])
+def verify_balance():
+    """Recompute the ledger sum and report drift from the materialized balance."""
+    return jsonify(_apm().verify_balance())
+
+
+@ace_pot_bp.route('/api/ace-pot/verify', methods=['POST'])
+def repair_balance():
+    """Reset the materialized balance to the ledger sum if they have drifted."""
+    if session.get('role') != 'admin':
+        return jsonify({'error': 'Admin required'}), 403
+    return jsonify(_apm().verify_balance(repair=True))
 
 
 @ace_pot_bp.route('/api/ace-pot/tournament', methods=['POST'])
@@ -50,40 +110,16 @@ def process_tournament_ace_pot():
         return jsonify({'error': 'tournament_id required'}), 400
 
     tid = data['tournament_id']
-    result = {}
-
-    buy_ins = data.get('buy_in_players', [])
-    if buy_ins:
-        result['buy_ins'] = _apm().process_batch_buy_ins(tid, buy_ins)
-
-    recipients = data.get('payout_recipients', [])
-    if recipients:
-        from tournament_core.models import Player, Tournament, db
-        pre_balance = _apm().get_balance()
-        total_payout = pre_balance.get('current', pre_balance.get('total', 0))
-        per_person = total_payout / len(recipients) if total_payout > 0 else 0
-
-        # Create a single ledger entry for the full payout listing all recipients
-        names = ', '.join(recipients)
-        _apm().add_entry(
-            description=f"Ace pot payout to {names}",
-            amount=-total_payout,
-            tournament_id=tid,
-        )
-
-        # Credit each recipient's seasonal_cash
-        for name in recipients:
-            p = Player.query.filter_by(name=name).first()
-            if p:
-                p.seasonal_cash = float(p.seasonal_cash) + per_person
-
-        # Store all recipient names on the tournament
-        t = Tournament.query.get(tid)
-        if t:
-            t.ace_pot_paid = True
-            t.ace_pot_paid_to = names
-        db.session.commit()
-    result['payouts'] = len(recipients)
+    result = _apm().process_tournament(
+        tid, data.get('buy_in_players', []), data.get('payout_recipients', []),
+    )
+    result['payouts'] = sum(1 for r in result.get('payout', {}).get('results', {}).values() if r == 'paid')
 
     result['balance'] = _apm().get_balance()
+    _publish_balance(result['balance'])
+    if 'payout' in result:
+        publish_tournament('tournament.ace_pot_paid', tid, {
+            'recipients': [n for n, r in result['payout']['results'].items() if r == 'paid'],
+            'amount': result['payout']['amount'],
+        })
     return jsonify(result)
@@ -123,6 +123,11 @@ def perform_archive():
                 db.text("INSERT INTO ace_pot_tracker (date, description, amount, balance) VALUES (:d, :desc, :amt, :bal)"),
                 {'d': datetime.now().strftime('%Y-%m-%d'), 'desc': f'Carry-over from {season_name}', 'amt': carry_over, 'bal': carry_over}
             )
+        db.session.execute(
+            db.text("UPDATE ace_pot_balance SET balance = :bal, last_entry_id = "
+                    "(SELECT MAX(entry_id) FROM ace_pot_tracker) WHERE id = 1"),
+            {'bal': carry_over}
+        )
 
         db.session.commit()
 
@@ -2,9 +2,19 @@
 
 from flask import Blueprint, jsonify, request, session, current_app
 from tournament_core.models import User
+from backend.auth import HashingBusy, LoginThrottled
 
 auth_api_bp = Blueprint('auth_api', __name__)
 
+# Seconds a client is asked to wait when the password hashing pool is saturated
+HASH_BUSY_RETRY_AFTER = 2
+
+
+def _hashing_busy():
+    resp = jsonify({'error': 'Server busy, try again shortly'})
+    resp.headers['Retry-After'] = str(HASH_BUSY_RETRY_AFTER)
+    return resp, 503
+
 
 @auth_api_bp.route('/api/auth/login', methods=['POST'])
 def login():
@@ -13,8 +23,15 @@ def login():
         return jsonify({'error': 'Username and password required'}), 400
 
     auth = current_app.auth_manager
-    ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-    success, result = auth.authenticate_user(data['username'], data['password'], ip)
+    # remote_addr is the client address resolved by ProxyFix from trusted proxy hops only
+    try:
+        success, result = auth.authenticate_user(data['username'], data['password'], request.remote_addr)
+    except LoginThrottled as e:
+        resp = jsonify({'error': 'Too many login attempts, try again later'})
+        resp.headers['Retry-After'] = str(e.retry_after)
+        return resp, 429
+    except HashingBusy:
+        return _hashing_busy()
 
     if success:
         session['session_token'] = result['session_token']
@@ -75,7 +92,10 @@ def create_user():
         return jsonify({'error': 'Invalid role'}), 400
 
     auth = current_app.auth_manager
-    success, message = auth.create_user(data['username'], data['password'], role)
+    try:
+        success, message = auth.create_user(data['username'], data['password'], role)
+    except HashingBusy:
+        return _hashing_busy()
     if success:
         return jsonify({'message': message}), 201
     return jsonify({'error': message}), 400
@@ -107,7 +127,10 @@ def update_user(user_id):
 
     if 'password' in data and data['password']:
         auth = current_app.auth_manager
-        pw_hash, salt = auth.hash_password(data['password'])
+        try:
+            pw_hash, salt = auth.hash_password(data['password'])
+        except HashingBusy:
+            return _hashing_busy()
         user.password_hash = pw_hash
         user.salt = salt
 
@@ -117,4 +140,5 @@ def update_user(user_id):
             user.role = data['role']
 
     db.session.commit()
+    current_app.auth_manager.invalidate_user(user.id)
     return jsonify({'user_id': user.id, 'username': user.username, 'role': user.role})
@@ -0,0 +1,76 @@
+"""Batched read endpoint: several GETs in one round trip."""
+
+from flask import Blueprint, jsonify, request, current_app
+
+from tournament_core.models import db
+from backend.singleflight import read_only
+from backend.circuit import in_memory
+
+batch_bp = Blueprint('batch_api', __name__)
+
+MAX_BATCH_SIZE = 20
+EXCLUDED_PREFIXES = ('/api/batch',)
+
+
+def _run_subrequest(path):
+    """Dispatch one GET through the app inside the current app context.
+
+    Pushing a request context for the same app reuses the current app
+    context, so every sub-request shares this request's DB session (and,
+    on MySQL's REPEATABLE READ, the snapshot taken by its first read).
+    Cookies and client address are forwarded so auth checks still apply.
+    """
+    app = current_app._get_current_object()
+    headers = {'Cookie': request.headers.get('Cookie', '')}
+    environ = {'REMOTE_ADDR': request.remote_addr}
+    with app.test_request_context(path, method='GET', headers=headers, environ_base=environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            print(f"Error in batch sub-request {path}: {e}")
+            db.session.rollback()
+            return 500, {'error': 'Internal error'}
+        if response.is_streamed or response.mimetype == 'text/event-stream':
+            # Event streams never finish and would hold the batch open
+            response.close()
+            return 400, {'error': 'Streaming endpoints cannot be batched'}
+    body = response.get_json(silent=True)
+    if body is None:
+        body = response.get_data(as_text=True)
+    return response.status_code, body
+
+
+@batch_bp.route('/api/batch', methods=['POST'])
+@read_only
+@in_memory  # sub-requests go through the breaker individually
+def batch():
+    """Run read-only sub-requests and return every result in one response.
+
+    Body: {requests: ["/api/ace-pot/balance", {"id": "ledger", "path": "/api/ace-pot/ledger?limit=20"}]}
+    Responds with {responses: [{id, path, status, body}]} in request order.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('requests')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'requests must be a non-empty list'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} requests per batch'}), 400
+
+    subrequests = []
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict):
+            return jsonify({'error': f'Invalid request {i}'}), 400
+        if str(item.get('method', 'GET')).upper() != 'GET':
+            return jsonify({'error': 'Only GET sub-requests are supported'}), 400
+        path = item.get('path')
+        if not isinstance(path, str) or not path.startswith('/api/') or path.startswith(EXCLUDED_PREFIXES):
+            return jsonify({'error': f'Invalid path in request {i}'}), 400
+        subrequests.append((item.get('id', i), path))
+
+    responses = []
+    for sub_id, path in subrequests:
+        status, body = _run_subrequest(path)
+        responses.append({'id': sub_id, 'path': path, 'status': status, 'body': body})
+    return jsonify({'responses': responses})
@@ -0,0 +1,55 @@
+"""Server-Sent Events streams for live tournament updates."""
+
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
+
+from backend.events import TOURNAMENTS_CHANNEL, ACE_POT_CHANNEL, StreamLimitReached, tournament_channel
+from backend.circuit import in_memory
+
+events_bp = Blueprint('events_api', __name__)
+
+STREAM_BUSY_RETRY_AFTER = 10
+
+
+def _sse_response(channels):
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        last_id = None
+    broker = current_app.event_broker
+    # Subscribe now, not on the stream's first read, so the cap is checked before responding
+    try:
+        sub = broker.subscribe(channels, last_event_id=last_id)
+    except StreamLimitReached:
+        resp = jsonify({'error': 'Too many live streams open, try again shortly'})
+        resp.headers['Retry-After'] = str(STREAM_BUSY_RETRY_AFTER)
+        return resp, 503
+    response = Response(stream_with_context(broker.stream(sub)), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    # A stream closed before its first read never reaches the generator's cleanup
+    response.call_on_close(lambda: broker.unsubscribe(sub))
+    return response
+
+
+@events_bp.route('/api/events', methods=['GET'])
+@in_memory
+def stream_all():
+    """League-wide stream: tournament lifecycle plus ace pot balance changes."""
+    requested = request.args.get('channels')
+    channels = requested.split(',') if requested else [TOURNAMENTS_CHANNEL, ACE_POT_CHANNEL]
+    return _sse_response(channels)
+
+
+@events_bp.route('/api/tournaments/<int:tid>/events', methods=['GET'])
+@in_memory
+def stream_tournament(tid):
+    """Stream for spectators of a single event."""
+    return _sse_response([tournament_channel(tid), ACE_POT_CHANNEL])
+
+
+@events_bp.route('/api/events/stats', methods=['GET'])
+@in_memory
+def stream_stats():
+    return jsonify(current_app.event_broker.stats())
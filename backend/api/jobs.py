@@ -0,0 +1,23 @@
+"""Status of background recording jobs."""
+
+from flask import Blueprint, jsonify
+
+from tournament_core.models import RecordingJob
+from backend.jobs import job_to_dict
+from backend.replica import primary_only
+
+jobs_bp = Blueprint('jobs_api', __name__)
+
+
+@jobs_bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+@primary_only
+def get_job(job_id):
+    """Poll a recording job: status is Queued, Running, Succeeded or Failed.
+
+    ``result`` holds what the synchronous record endpoint used to return
+    (including needs_manual_payout for ties) once the job has finished.
+    """
+    job = RecordingJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_to_dict(job))
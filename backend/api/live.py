@@ -0,0 +1,123 @@
+"""API endpoints for hole-by-hole live scoring."""
+
+from flask import Blueprint, jsonify, request, current_app
+
+from tournament_core.models import Tournament
+from tournament_core.player_search import PlayerNotFoundError
+from backend.events import publish, tournament_channel
+from backend.recording import record_results
+
+live_bp = Blueprint('live_api', __name__)
+
+
+def _live():
+    return current_app.rating_system.live_scoring
+
+
+def _round_payload(state, start=0, limit=None):
+    return {
+        'tournament_id': state.tournament_id,
+        'holes': len(state.pars),
+        'par': sum(state.pars),
+        'complete': state.is_complete(),
+        'standings': state.standings_page(start, limit),
+    }
+
+
+@live_bp.route('/api/tournaments/<int:tid>/live', methods=['POST'])
+def start_round(tid):
+    """Open live scoring for an in-progress tournament.
+
+    Body: {teams: [{player1, player2}], pars: [3, 3, 4, ...]} or
+    {teams, holes: 18, par: 3} for a uniform layout.
+    """
+    t = Tournament.query.get(tid)
+    if not t or t.status != 'In Progress':
+        return jsonify({'error': 'Tournament not found or not in progress'}), 400
+
+    data = request.get_json() or {}
+    try:
+        teams = _resolve_teams(data.get('teams', []))
+        pars = data.get('pars') or [data.get('par', 3)] * int(data.get('holes', 18))
+        state = _live().start_round(tid, teams, pars)
+    except PlayerNotFoundError as e:
+        return jsonify({'error': f"Player '{e.name}' not found", 'suggestions': e.suggestions}), 404
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    payload = _round_payload(state)
+    publish('live.started', payload, tournament_channel(tid))
+    return jsonify(payload), 201
+
+
+def _resolve_teams(teams):
+    """[(player1, player2)] with canonical names. Raises PlayerNotFoundError or TypeError."""
+    rs = current_app.rating_system
+    resolved = []
+    for tm in teams:
+        if not isinstance(tm, dict):
+            raise TypeError('Each team must be an object with player1 and player2')
+        if 'player1' not in tm or 'player2' not in tm:
+            continue
+        if not isinstance(tm['player1'], str) or not isinstance(tm['player2'], str):
+            raise TypeError('player1 and player2 must be names')
+        resolved.append((rs.get_player_name(tm['player1']), rs.get_player_name(tm['player2'])))
+    return resolved
+
+
+@live_bp.route('/api/tournaments/<int:tid>/live', methods=['GET'])
+def get_standings(tid):
+    state = _live().get_round(tid)
+    if state is None:
+        return jsonify({'error': 'No live round for this tournament'}), 404
+    start = request.args.get('start', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    return jsonify(_round_payload(state, start, limit))
+
+
+@live_bp.route('/api/tournaments/<int:tid>/live/scores', methods=['POST'])
+def submit_score(tid):
+    """Submit strokes for one hole: {card, hole, strokes} or {player1, player2, hole, strokes}."""
+    data = request.get_json() or {}
+    live = _live()
+    state = live.get_round(tid)
+    if state is None:
+        return jsonify({'error': 'No live round for this tournament'}), 404
+
+    card = data.get('card')
+    if card is None and 'player1' in data and 'player2' in data:
+        card = state.find_card(data['player1'], data['player2'])
+    try:
+        standing = live.submit_score(tid, int(card), int(data['hole']), int(data['strokes']))
+    except (KeyError, TypeError):
+        return jsonify({'error': 'card (or player1/player2), hole and strokes are required'}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    publish('live.score', {'tournament_id': tid, 'hole': int(data['hole']), 'standing': standing},
+            tournament_channel(tid))
+    return jsonify(standing)
+
+
+@live_bp.route('/api/tournaments/<int:tid>/live/close', methods=['POST'])
+def close_round(tid):
+    """Finish the round and record final totals through the normal results path."""
+    t = Tournament.query.get(tid)
+    if not t or t.status != 'In Progress':
+        return jsonify({'error': 'Tournament not found or not in progress'}), 400
+    live = _live()
+    state = live.get_round(tid)
+    if state is None:
+        return jsonify({'error': 'No live round for this tournament'}), 404
+
+    data = request.get_json() or {}
+    if not state.is_complete() and not data.get('force'):
+        return jsonify({'error': 'Not every card has finished; pass force to close anyway'}), 400
+
+    data['team_results'] = [
+        {'player1': p1, 'player2': p2, 'score': total}
+        for (p1, p2), total in state.final_results()
+    ]
+    # Closing the round commits together with the results
+    body, status = record_results(tid, data, on_commit=lambda _: live.close_round(tid, tid))
+    return jsonify(body), status
@@ -4,6 +4,11 @@ API endpoints for player management.
 
 from flask import Blueprint, jsonify, request, current_app
 from tournament_core.models import db, Player, PlayerHistory, Tournament, Season
+from tournament_core.player_search import PlayerNotFoundError
+from tournament_core.serializers import history_encoder, to_iso
+from backend.singleflight import coalesce
+from backend.circuit import in_memory, snapshot_fallback
+from backend.pagination import MAX_PAGE_SIZE, parse_page, parse_sort, parse_fields, page_response
 
 players_bp = Blueprint('players_api', __name__)
 
@@ -12,21 +17,122 @@ def _rs():
     return current_app.rating_system
 
 
+PLAYER_FIELDS = ('name', 'rating', 'tournaments_played', 'is_club_member')
+
+
 @players_bp.route('/api/players', methods=['GET'])
+@in_memory
 def get_players():
+    """Roster, highest rating first.
+
+    Query params: limit/cursor for pages, sort (rating, name, tournaments_played;
+    prefix with - for descending), fields (comma-separated, default name,rating).
+    """
+    rs = _rs()
+    try:
+        limit, cursor = parse_page(request.args)
+        sort, descending = parse_sort(request.args, rs.PLAYER_SORT_FIELDS, '-rating')
+        fields = parse_fields(request.args, PLAYER_FIELDS, ('name', 'rating'))
+        names, next_key = rs.player_page(sort, descending, cursor, limit)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e) if isinstance(e, ValueError) else 'Invalid cursor'}), 400
+
+    players = []
+    for name in names:
+        data = rs.players[name]
+        players.append({f: name if f == 'name' else data.get(f) for f in fields})
+    return jsonify(page_response(players, limit, next_key))
+
+
+SEARCH_MAX_RESULTS = 50
+
+
+@players_bp.route('/api/players/search', methods=['GET'])
+@in_memory
+def search_players():
+    """Ranked autocomplete matches: prefix hits first, then fuzzy. Params: q, limit."""
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', 10, type=int), SEARCH_MAX_RESULTS))
+    return jsonify({'query': query, 'results': _rs().search_players(query, limit)})
+
+
+LEADERBOARD_PAGE_SIZE = 50
+MIN_HISTOGRAM_WIDTH = 1
+
+
+@players_bp.route('/api/leaderboard', methods=['GET'])
+@in_memory
+def get_leaderboard():
+    """Ranked players, best first.
+
+    Query params: offset, limit, player (start the page at that player's row)
+    and histogram=<bucket width> to include rating-bucket counts.
+    """
     rs = _rs()
-    players = [{'name': n, 'rating': d['rating']} for n, d in rs.players.items()]
-    players.sort(key=lambda x: x['rating'], reverse=True)
-    return jsonify(players)
+    state = rs.state  # one snapshot, so the board and ratings agree
+    board = state.leaderboard
+    args = request.args
+    try:
+        offset = int(args.get('offset', 0))
+        limit = min(int(args.get('limit', LEADERBOARD_PAGE_SIZE)), MAX_PAGE_SIZE)
+        bucket_width = float(args['histogram']) if args.get('histogram') else None
+    except ValueError:
+        return jsonify({'error': 'offset, limit and histogram must be numbers'}), 400
+    if offset < 0 or limit < 1 or (bucket_width is not None and not bucket_width >= MIN_HISTOGRAM_WIDTH):
+        return jsonify({'error': f'offset must be >= 0, limit positive '
+                                 f'and histogram at least {MIN_HISTOGRAM_WIDTH}'}), 400
+
+    if args.get('player'):
+        try:
+            name = rs.get_player_name(args['player'])
+        except PlayerNotFoundError as e:
+            return jsonify({'error': str(e), 'suggestions': e.suggestions}), 404
+        offset = board.position(name, state.players[name]['rating'])
+
+    result = {'total': len(board), 'offset': offset, 'entries': board.page(offset, limit)}
+    if bucket_width is not None:
+        try:
+            result['histogram'] = board.histogram(bucket_width)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    return jsonify(result)
+
+
+def _player_from_snapshot(name):
+    """Degraded GET /api/players/<name>: ratings and history from memory, no cash totals."""
+    rs = _rs()
+    try:
+        player_name = rs.get_player_name(name)
+    except PlayerNotFoundError as e:
+        return jsonify({'error': f"Player '{name}' not found", 'suggestions': e.suggestions}), 404
+    data = rs.state.players[player_name]
+    history = [{
+        'date': h['tournament_date'], 'position': h['position'],
+        'expected_position': h['expected_position'], 'old_rating': h['old_rating'],
+        'new_rating': h['new_rating'], 'score': h['score'], 'with_ghost': h['with_ghost'],
+        'change': round(h['change'], 2),
+    } for h in reversed(data['history'])]
+    return jsonify({
+        'name': player_name, 'rating': data['rating'],
+        **rs.player_standing(player_name),
+        'tournaments_played': data['tournaments_played'],
+        'seasons': [{'id': None, 'name': 'Current Season'}],
+        'history': history,
+    })
 
 
 @players_bp.route('/api/players/<name>', methods=['GET'])
+@snapshot_fallback(_player_from_snapshot)
+@coalesce
 def get_player(name):
     rs = _rs()
     try:
         player_name = rs.get_player_name(name)
         player_data = rs.get_player(player_name)
         p = Player.query.filter_by(name=player_name).first()
+        if p is None:
+            # New player the read replica hasn't caught up with yet
+            return _player_from_snapshot(player_name)
 
         # Get available seasons
         seasons = [{'id': None, 'name': 'Current Season'}]
@@ -48,23 +154,26 @@ def get_player(name):
                 Tournament, PlayerHistory.tournament_id == Tournament.tournament_id
             ).filter(Tournament.season_id.is_(None)).order_by(Tournament.date.desc()).all()
 
-        history = [{
-            'date': h.tournament.date.isoformat(), 'position': h.position,
-            'expected_position': float(h.expected_position), 'old_rating': float(h.old_rating),
-            'new_rating': float(h.new_rating), 'change': float(h.new_rating - h.old_rating),
-            'with_ghost': h.with_ghost, 'tournament_id': h.tournament_id,
-        } for h in history_entries]
+        history = []
+        for h in history_entries:
+            row = history_encoder(h)
+            row['date'] = to_iso(h.tournament.date)
+            row['change'] = float(h.new_rating - h.old_rating)
+            history.append(row)
 
         lifetime_tournaments = PlayerHistory.query.filter_by(player_id=p.player_id).count() if p else 0
 
         return jsonify({
             'name': player_name, 'rating': player_data['rating'],
+            **rs.player_standing(player_name),
             'tournaments_played': lifetime_tournaments,
             'seasonal_cash': float(p.seasonal_cash) if p else 0,
             'lifetime_cash': float(p.lifetime_cash) + (float(p.seasonal_cash) if p else 0) if p else 0,
             'seasons': seasons,
             'history': history,
         })
+    except PlayerNotFoundError as e:
+        return jsonify({'error': f"Player '{name}' not found", 'suggestions': e.suggestions}), 404
     except ValueError:
         return jsonify({'error': f"Player '{name}' not found"}), 404
 
@@ -0,0 +1,25 @@
+"""Runtime statistics for the API's in-process layers."""
+
+from flask import Blueprint, jsonify, current_app
+
+from tournament_core.models import db
+from backend.circuit import in_memory
+from backend.db_pool import pool_stats
+
+stats_bp = Blueprint('stats_api', __name__)
+
+
+@stats_bp.route('/api/stats', methods=['GET'])
+@in_memory
+def get_stats():
+    flight = getattr(current_app, 'single_flight', None)
+    worker = getattr(current_app, 'recording_worker', None)
+    return jsonify({
+        'startup': current_app.startup.summary() if hasattr(current_app, 'startup') else None,
+        'single_flight': flight.stats() if flight else None,
+        'recording_jobs': worker.stats() if worker else None,
+        'db_pool': pool_stats.snapshot(db.engine.pool),
+        'db_breaker': current_app.db_breaker.stats() if hasattr(current_app, 'db_breaker') else None,
+        'db_replica': current_app.replica_monitor.stats() if hasattr(current_app, 'replica_monitor') else None,
+        'result_journal': current_app.result_journal.stats() if hasattr(current_app, 'result_journal') else None,
+    })
@@ -4,7 +4,14 @@ API endpoints for tournament management.
 
 from flask import Blueprint, jsonify, request, current_app
 import datetime
-from tournament_core.models import db, Tournament, TournamentParticipant, Player, Team
+from tournament_core.models import db, Tournament, TournamentParticipant, RecordingJob
+from backend.events import publish_tournament
+from backend.jobs import job_key, job_to_dict, submit_job
+from backend.circuit import DB_UNAVAILABLE, in_memory, snapshot_fallback, tolerates_outage
+from backend.recording import parse_results, publish_completed
+from tournament_core.serializers import tournament_encoder
+from backend.singleflight import coalesce, read_only
+from backend.pagination import parse_page, parse_sort, parse_fields, project, page_response
 
 tournaments_bp = Blueprint('tournaments_api', __name__)
 
@@ -13,61 +20,107 @@ def _rs():
     return current_app.rating_system
 
 
+TOURNAMENT_FIELDS = ('tournament_id', 'date', 'course', 'teams', 'status', 'results')
+TOURNAMENT_SORTS = {
+    'date': Tournament.date,
+    'course': db.func.coalesce(Tournament.course, ''),
+    'tournament_id': Tournament.tournament_id,
+}
+
+
+def _tournaments_from_snapshot():
+    """Degraded GET /api/tournaments: newest first from memory, first page only."""
+    args = request.args
+    try:
+        limit, _ = parse_page(args)
+        fields = parse_fields(args, TOURNAMENT_FIELDS, TOURNAMENT_FIELDS)
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e) if isinstance(e, ValueError) else 'Invalid cursor'}), 400
+    if args.get('include_results') in ('0', 'false'):
+        fields = tuple(f for f in fields if f != 'results')
+    tournaments = sorted(_rs().tournaments, key=lambda t: (t['date'] or '', t['id']), reverse=True)
+    if limit is not None:
+        tournaments = tournaments[:limit]
+    result = [project({
+        'tournament_id': t['id'], 'date': t['date'], 'course': t['course'], 'teams': t['teams'],
+        'status': t.get('status') or 'Completed', 'results': t['results'],
+    }, fields) for t in tournaments]
+    return jsonify(page_response(result, limit, None))
+
+
+def _tournament_from_snapshot(tid):
+    t = _rs().get_tournament_record(tid)
+    if t is None:
+        return jsonify({'error': 'Tournament not found'}), 404
+    return jsonify({
+        'tournament_id': tid, 'date': t['date'], 'course': t['course'], 'teams': t['teams'],
+        'status': t.get('status') or 'Completed', 'results': t['results'],
+    })
+
+
 @tournaments_bp.route('/api/tournaments', methods=['GET'])
+@snapshot_fallback(_tournaments_from_snapshot)
+@coalesce
 def get_tournaments():
+    """Current-season tournaments, newest first.
+
+    Query params: limit/cursor for pages, sort (date, course, tournament_id;
+    prefix with - for descending), fields (comma-separated), and
+    include_results=false to skip the nested team results.
+    """
     rs = _rs()
+    args = request.args
+    try:
+        limit, cursor = parse_page(args)
+        sort, descending = parse_sort(args, TOURNAMENT_SORTS, '-date')
+        fields = parse_fields(args, TOURNAMENT_FIELDS, TOURNAMENT_FIELDS)
+        if cursor is not None:
+            if len(cursor) != 2:
+                raise ValueError('Invalid cursor')
+            if sort == 'date':
+                cursor[0] = datetime.date.fromisoformat(cursor[0])
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e) if isinstance(e, ValueError) else 'Invalid cursor'}), 400
+    if args.get('include_results') in ('0', 'false'):
+        fields = tuple(f for f in fields if f != 'results')
+
     # Current season = no season_id assigned
-    db_tournaments = Tournament.query.filter_by(season_id=None).order_by(Tournament.date.desc()).all()
-    in_memory = {t['id']: t for t in rs.tournaments if 'id' in t}
+    column, tid_col = TOURNAMENT_SORTS[sort], Tournament.tournament_id
+    q = Tournament.query.filter_by(season_id=None)
+    if cursor is not None:
+        value, last_tid = cursor
+        if descending:
+            q = q.filter(db.or_(column < value, db.and_(column == value, tid_col < last_tid)))
+        else:
+            q = q.filter(db.or_(column > value, db.and_(column == value, tid_col > last_tid)))
+    q = q.order_by(column.desc(), tid_col.desc()) if descending else q.order_by(column, tid_col)
+    db_tournaments = q.limit(limit + 1).all() if limit is not None else q.all()
+
+    next_key = None
+    if limit is not None and len(db_tournaments) > limit:
+        db_tournaments = db_tournaments[:limit]
+        last = db_tournaments[-1]
+        value = {'date': last.date, 'course': last.course or '', 'tournament_id': last.tournament_id}[sort]
+        next_key = (value, last.tournament_id)
 
     result = []
     for t in db_tournaments:
-        tid = t.tournament_id
-        mem = in_memory.get(tid)
-        result.append({
-            'tournament_id': tid,
-            'date': t.date.isoformat() if hasattr(t.date, 'isoformat') else str(t.date),
-            'course': t.course,
-            'teams': t.team_count,
-            'status': t.status or 'Completed',
-            'results': mem['results'] if mem else [],
-        })
-    return jsonify(result)
+        row = tournament_encoder(t)
+        row['status'] = t.status or 'Completed'
+        if 'results' in fields:
+            mem = rs.get_tournament_record(t.tournament_id)
+            row['results'] = mem['results'] if mem else []
+        result.append(project(row, fields))
+    return jsonify(page_response(result, limit, next_key))
 
 
 @tournaments_bp.route('/api/tournaments/<int:tid>', methods=['GET'])
+@snapshot_fallback(_tournament_from_snapshot)
 def get_tournament(tid):
-    t = Tournament.query.get(tid)
-    if not t:
+    detail = _rs().db_manager.get_tournament_detail(tid)
+    if detail is None:
         return jsonify({'error': 'Tournament not found'}), 404
-
-    participants = TournamentParticipant.query.filter_by(tournament_id=tid).all()
-    players = []
-    for p in participants:
-        player = Player.query.get(p.player_id)
-        if player:
-            players.append({
-                'name': player.name,
-                'rating': float(player.rating),
-                'ace_pot_buy_in': p.ace_pot_buy_in,
-            })
-
-    rs = _rs()
-    mem = next((x for x in rs.tournaments if x.get('id') == tid), None)
-
-    ace_pot_recipient = t.ace_pot_paid_to if t.ace_pot_paid else None
-
-    return jsonify({
-        'tournament_id': tid,
-        'date': t.date.isoformat() if hasattr(t.date, 'isoformat') else str(t.date),
-        'course': t.course,
-        'teams': t.team_count,
-        'status': t.status or 'Completed',
-        'participants': players,
-        'results': mem['results'] if mem else [],
-        'ace_pot_paid': t.ace_pot_paid,
-        'ace_pot_recipient': ace_pot_recipient,
-    })
+    return jsonify(detail)
 
 
 @tournaments_bp.route('/api/tournaments/pending', methods=['POST'])
@@ -83,6 +136,7 @@ def create_pending():
     t = Tournament(date=date, course=course, team_count=0, status='Pending')
     db.session.add(t)
     db.session.commit()
+    publish_tournament('tournament.created', t.tournament_id, {'course': course, 'date': date, 'status': 'Pending'})
 
     return jsonify({'tournament_id': t.tournament_id}), 201
 
@@ -98,6 +152,7 @@ def update_tournament(tid):
     if 'date' in data:
         t.date = data['date']
     db.session.commit()
+    publish_tournament('tournament.updated', tid, {'course': t.course, 'date': str(t.date)})
     return jsonify({'message': 'Updated'})
 
 
@@ -114,7 +169,8 @@ def add_participant(tid):
 
     rs = _rs()
     if not rs.player_exists(player_name):
-        return jsonify({'error': f"Player '{player_name}' not found"}), 404
+        return jsonify({'error': f"Player '{player_name}' not found",
+                        'suggestions': rs.player_not_found(player_name).suggestions}), 404
 
     pid = rs.db_manager._get_player_id_safe(player_name)
     if pid is None:
@@ -124,11 +180,13 @@ def add_participant(tid):
     if existing:
         existing.ace_pot_buy_in = ace_pot
         db.session.commit()
+        publish_tournament('tournament.participant_updated', tid, {'name': player_name, 'ace_pot_buy_in': ace_pot})
         return jsonify({'message': 'Updated'}), 200
 
     tp = TournamentParticipant(tournament_id=tid, player_id=pid, ace_pot_buy_in=ace_pot)
     db.session.add(tp)
     db.session.commit()
+    publish_tournament('tournament.participant_added', tid, {'name': player_name, 'ace_pot_buy_in': ace_pot})
     return jsonify({'message': 'Added'}), 201
 
 
@@ -144,6 +202,7 @@ def remove_participant(tid, player_name):
     if tp:
         db.session.delete(tp)
         db.session.commit()
+        publish_tournament('tournament.participant_removed', tid, {'name': player_name})
     return jsonify({'message': 'Removed'})
 
 
@@ -154,17 +213,11 @@ def generate_teams(tid):
     if not t or t.status != 'Pending':
         return jsonify({'error': 'Tournament not found or not pending'}), 400
 
-    participants = TournamentParticipant.query.filter_by(tournament_id=tid).all()
-    player_names = []
-    for p in participants:
-        player = Player.query.get(p.player_id)
-        if player:
-            player_names.append(player.name)
-
+    rs = _rs()
+    player_names = rs.db_manager.get_participant_names(tid)
     if len(player_names) < 2:
         return jsonify({'error': 'Need at least 2 players'}), 400
 
-    rs = _rs()
     try:
         teams = rs.generate_balanced_teams(player_names)
         predictions = rs.predict_tournament_outcome([tuple(team) for team in teams])
@@ -177,140 +230,69 @@ def generate_teams(tid):
             'team_rating': rs.calculate_team_rating(team[0], team[1]),
             'expected_position': predictions[tuple(team)].get('expected_position', 0),
         } for team in teams]
+        publish_tournament('tournament.started', tid, {'status': 'In Progress', 'teams': results})
         return jsonify({'tournament_id': tid, 'teams': results})
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
 
 
 @tournaments_bp.route('/api/tournaments/<int:tid>/record', methods=['POST'])
+@tolerates_outage
 def record_results(tid):
-    """Record scores for an in-progress tournament, completing it."""
-    t = Tournament.query.get(tid)
-    if not t or t.status != 'In Progress':
-        return jsonify({'error': 'Tournament not found or not in progress'}), 400
-
-    data = request.get_json()
-    team_results = data.get('team_results', [])
-    if not team_results:
-        return jsonify({'error': 'No results provided'}), 400
-
-    # Payout config
-    payout_config = data.get('payout_config', {})
-    buy_in = payout_config.get('buy_in_per_player', 0)
-    second_place_fixed = payout_config.get('second_place', 40)
-    third_place_fixed = payout_config.get('third_place', 20)
-
-    formatted = []
-    for tr in team_results:
-        if 'player1' in tr and 'player2' in tr and 'score' in tr:
-            try:
-                formatted.append(((tr['player1'], tr['player2']), int(tr['score'])))
-            except ValueError:
-                return jsonify({'error': f"Invalid score for {tr['player1']} & {tr['player2']}"}), 400
-    if not formatted:
-        return jsonify({'error': 'No valid results'}), 400
-
-    # Calculate payouts
-    total_players = sum(2 if p2 != 'Ghost Player' else 1 for (p1, p2), _ in formatted)
-    pot = buy_in * total_players
-    third_payout = third_place_fixed if pot > 0 and len(formatted) >= 3 else 0
-    second_payout = second_place_fixed if pot > 0 and len(formatted) >= 2 else 0
-    first_payout = pot - second_payout - third_payout if pot > 0 else 0
+    """Queue recording of scores for an in-progress tournament.
+
+    Responds 202 with the job (poll /api/jobs/<job_id>). The request is
+    idempotent per Idempotency-Key header (or idempotency_key field), which
+    defaults to the tournament itself: repeating it returns the same job.
+    If the database is unreachable the submission is journaled locally and
+    acknowledged with status Journaled; it is recorded once the database is back.
+    """
+    data = request.get_json() or {}
+    try:
+        key = job_key(tid, data, request.headers.get('Idempotency-Key'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    # 1st always gets the highest — swap with 2nd if needed
-    if first_payout < second_payout:
-        first_payout, second_payout = second_payout, first_payout
+    if current_app.result_journal.has_pending() or current_app.db_breaker.is_open:
+        # Stay behind submissions still waiting for replay so results apply in order
+        return _journal_submission(tid, key, data)
+    try:
+        existing = RecordingJob.query.filter_by(idempotency_key=key).first()
+        if existing is not None and existing.tournament_id != tid:
+            return jsonify({'error': 'Idempotency key was already used for another tournament'}), 409
+        if existing is None or existing.status == 'Failed':
+            # Reject obviously bad requests now rather than in the worker
+            t = Tournament.query.get(tid)
+            if not t or t.status != 'In Progress':
+                return jsonify({'error': 'Tournament not found or not in progress'}), 400
+            parse_results(data)
+        job, created = submit_job(tid, key, data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except DB_UNAVAILABLE as e:
+        db.session.rollback()
+        print(f"Database unavailable while recording tournament {tid}: {e}")
+        return _journal_submission(tid, key, data)
 
-    # Check for manual payout overrides (from tie resolution modal)
-    manual_payouts = data.get('manual_payouts')  # list of {player1, player2, payout}
+    if created:
+        current_app.recording_worker.submit(job.job_id)
+    finished = job.status in ('Succeeded', 'Failed')
+    response = jsonify(job_to_dict(job))
+    response.headers['Location'] = f'/api/jobs/{job.job_id}'
+    return response, 200 if finished else 202
 
-    rs = _rs()
-    course = t.course
-    date = t.date.isoformat() if hasattr(t.date, 'isoformat') else str(t.date)
 
+def _journal_submission(tid, key, data):
     try:
-        # Delete the pending shell — record_tournament creates its own DB entry
-        TournamentParticipant.query.filter_by(tournament_id=tid).delete()
-        db.session.delete(t)
-        db.session.commit()
-
-        new_tid = rs.record_tournament(formatted, course, date)
-
-        if new_tid:
-            teams = Team.query.filter_by(tournament_id=new_tid).order_by(Team.position).all()
-
-            if manual_payouts:
-                # Apply manually specified payouts
-                for mp in manual_payouts:
-                    for team in teams:
-                        p1 = Player.query.get(team.player1_id)
-                        p2 = Player.query.get(team.player2_id) if team.player2_id else None
-                        p1_name = p1.name if p1 else ''
-                        p2_name = p2.name if p2 else 'Ghost Player'
-                        if p1_name == mp['player1'] and p2_name == mp['player2']:
-                            amt = float(mp['payout'])
-                            team.payout = amt
-                            if amt > 0:
-                                is_ghost = not team.player2_id
-                                per_player = amt if is_ghost else amt / 2
-                                if p1:
-                                    p1.seasonal_cash = float(p1.seasonal_cash) + per_player
-                                if not is_ghost and p2:
-                                    p2.seasonal_cash = float(p2.seasonal_cash) + per_player
-                            break
-            else:
-                # Check for ties in paid positions
-                from collections import Counter
-                position_counts = Counter(team.position for team in teams)
-                paid_positions = [1, 2] if len(formatted) < 3 else [1, 2, 3]
-                has_tie = any(position_counts.get(p, 0) > 1 for p in paid_positions)
-
-                if has_tie:
-                    db.session.commit()
-                    rs.load_data()
-                    payout_teams = []
-                    for team in teams:
-                        if team.position in paid_positions:
-                            p1 = Player.query.get(team.player1_id)
-                            p2 = Player.query.get(team.player2_id) if team.player2_id else None
-                            payout_teams.append({
-                                'player1': p1.name if p1 else 'Unknown',
-                                'player2': p2.name if p2 else 'Ghost Player',
-                                'position': team.position, 'score': team.score,
-                            })
-                    return jsonify({
-                        'message': f'Tournament recorded with {len(formatted)} teams',
-                        'tournament_id': new_tid,
-                        'needs_manual_payout': True,
-                        'pot': pot, 'first_payout': first_payout,
-                        'second_payout': second_payout, 'third_payout': third_payout,
-                        'tied_teams': payout_teams,
-                    }), 201
-
-                # No ties — auto-apply
-                for team in teams:
-                    payout_amount = {1: first_payout, 2: second_payout, 3: third_payout}.get(team.position, 0)
-                    if payout_amount > 0:
-                        team.payout = payout_amount
-                        is_ghost = team.is_ghost_team or not team.player2_id
-                        per_player = payout_amount if is_ghost else payout_amount / 2
-                        p1 = Player.query.get(team.player1_id)
-                        if p1:
-                            p1.seasonal_cash = float(p1.seasonal_cash) + per_player
-                        if not is_ghost and team.player2_id:
-                            p2 = Player.query.get(team.player2_id)
-                            if p2:
-                                p2.seasonal_cash = float(p2.seasonal_cash) + per_player
-
-            db.session.commit()
-            rs.load_data()
-
-        return jsonify({
-            'message': f'Tournament recorded with {len(formatted)} teams',
-            'tournament_id': new_tid,
-        }), 201
+        parse_results(data)
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
+    current_app.result_journal.append(tid, key, data)
+    current_app.journal_replayer.wake()
+    return jsonify({
+        'status': 'Journaled', 'tournament_id': tid, 'idempotency_key': key,
+        'message': 'Database unavailable; results saved and will be recorded when it is back',
+    }), 202
 
 
 @tournaments_bp.route('/api/tournaments/<int:tid>/payouts', methods=['POST'])
@@ -323,29 +305,13 @@ def apply_manual_payouts(tid):
     data = request.get_json()
     payouts = data.get('payouts', [])
 
-    teams = Team.query.filter_by(tournament_id=tid).all()
-    for mp in payouts:
-        amt = float(mp.get('payout', 0))
-        for team in teams:
-            p1 = Player.query.get(team.player1_id)
-            p2 = Player.query.get(team.player2_id) if team.player2_id else None
-            p1_name = p1.name if p1 else ''
-            p2_name = p2.name if p2 else 'Ghost Player'
-            if p1_name == mp['player1'] and p2_name == mp['player2']:
-                team.payout = amt
-                if amt > 0:
-                    is_ghost = not team.player2_id
-                    per_player = amt if is_ghost else amt / 2
-                    if p1:
-                        p1.seasonal_cash = float(p1.seasonal_cash) + per_player
-                    if not is_ghost and p2:
-                        p2.seasonal_cash = float(p2.seasonal_cash) + per_player
-                break
-
-    db.session.commit()
     rs = _rs()
+    engine = rs.payout_engine
+    result = engine.apply_payouts(engine.team_index(tid), engine.payouts_from_request(payouts))
+    db.session.commit()
     rs.load_data()
-    return jsonify({'message': 'Payouts applied'})
+    publish_completed(tid, 'tournament.payouts')
+    return jsonify({'message': 'Payouts applied', 'unmatched': result['unmatched']})
 
 
 @tournaments_bp.route('/api/tournaments/<int:tid>', methods=['DELETE'])
@@ -354,12 +320,16 @@ def delete_tournament(tid):
     if not t:
         return jsonify({'error': 'Not found'}), 404
     TournamentParticipant.query.filter_by(tournament_id=tid).delete()
+    _rs().live_scoring.discard_round(tid)
     db.session.delete(t)
     db.session.commit()
+    publish_tournament('tournament.deleted', tid)
     return jsonify({'message': 'Deleted'})
 
 
 @tournaments_bp.route('/api/predict', methods=['POST'])
+@read_only
+@in_memory
 def predict_tournament():
     data = request.get_json()
     if not data:
@@ -390,6 +360,8 @@ def predict_tournament():
 
 
 @tournaments_bp.route('/api/teams', methods=['POST'])
+@read_only
+@in_memory
 def generate_teams_standalone():
     """Standalone team generation (not tied to a tournament)."""
     data = request.get_json()
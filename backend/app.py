@@ -2,72 +2,158 @@
 """
 Disc Golf League Tournament Rating System - Backend API
 
-Flask API backend backed by MySQL via SQLAlchemy.
+Flask API backend backed by MySQL via SQLAlchemy. ``create_app`` builds the
+app without touching the database; see backend/startup.py for the warm-up.
 """
 
-from flask import Flask, jsonify
-from flask_cors import CORS
-from dotenv import load_dotenv
 import os
 import sys
+import time
+
+_STARTED = time.perf_counter()
 
 # Add project root to Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from tournament_core.models import db, User
-from tournament_core import TournamentRatingSystem
-from backend.auth import AuthManager
-from backend.api import all_blueprints
-
-load_dotenv()
-
-app = Flask(__name__)
-app.secret_key = os.environ.get('SECRET_KEY', 'dev_key_for_testing_change_in_production')
-CORS(app, supports_credentials=True, origins=[
-    'http://localhost:3000', 'http://127.0.0.1:3000',
-    'https://dg-rater.com',
-])
-
-# Database configuration
-DATABASE_URL = os.environ.get('DATABASE_URL') or \
-    f"mysql+pymysql://{os.environ.get('DB_USER', 'root')}:" \
-    f"{os.environ.get('DB_PASSWORD', 'password')}@" \
-    f"{os.environ.get('DB_HOST', '127.0.0.1')}:" \
-    f"{os.environ.get('DB_PORT', '3306')}/" \
-    f"{os.environ.get('DB_NAME', 'dg_dubs')}"
-
-app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-db.init_app(app)
-
-with app.app_context():
-    db.create_all()
-
-    rating_system = TournamentRatingSystem()
-    rating_system.load_data()
-
-    auth_manager = AuthManager()
-    app.auth_manager = auth_manager
-    app.rating_system = rating_system
-
-    # Ensure admin user
-    admin_user = os.environ.get('ADMIN_USERNAME')
-    admin_pass = os.environ.get('ADMIN_PASSWORD')
-    if admin_user and admin_pass:
-        if User.query.filter_by(role='admin').count() == 0:
-            success, msg = auth_manager.create_user(admin_user, admin_pass, 'admin')
-            if success:
-                print(f"Admin user '{admin_user}' created successfully")
-
-for blueprint in all_blueprints:
-    app.register_blueprint(blueprint)
-
 
-@app.route('/')
-def health_check():
-    return jsonify({"status": "DG Dubs API is running"})
+def database_url():
+    return os.environ.get('DATABASE_URL') or \
+        f"mysql+pymysql://{os.environ.get('DB_USER', 'root')}:" \
+        f"{os.environ.get('DB_PASSWORD', 'password')}@" \
+        f"{os.environ.get('DB_HOST', '127.0.0.1')}:" \
+        f"{os.environ.get('DB_PORT', '3306')}/" \
+        f"{os.environ.get('DB_NAME', 'dg_dubs')}"
+
+
+def create_app(background=True):
+    """Build the Flask app. Database work runs in the warm-up (on a thread unless ``background`` is False)."""
+    from backend.startup import StartupReport, run_warmup, wait_for_startup
+
+    report = StartupReport(_STARTED)
+
+    with report.phase('imports'):
+        # Imported here, after the .env is loaded, so module-level settings read from it
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        from flask import Flask, jsonify
+        from flask_cors import CORS
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        from tournament_core.models import db, REPLICA_BIND
+        from tournament_core import TournamentRatingSystem
+        from backend.auth import AuthManager
+        from backend.events import EventBroker, SSE_MAX_STREAMS
+        from backend.singleflight import SingleFlight, invalidate_on_write
+        from backend.serialization import FastJSONProvider, compress_response
+        from backend.jobs import RecordingWorker
+        from backend.journal import ResultJournal, JournalReplayer
+        from backend.circuit import CircuitBreaker, install_breaker
+        from backend.db_pool import engine_options, instrument_engine
+        from backend.replica import ReplicaMonitor, install_replica, replica_binds, replica_pool_stats
+        from backend.api import all_blueprints
+
+    with report.phase('configure'):
+        app = Flask(__name__)
+        app.startup = report
+        # Trust X-Forwarded-For only for the load balancer hops in front of the app
+        proxy_hops = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
+        if proxy_hops:
+            app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops)
+        app.before_request(wait_for_startup)
+        app.json = FastJSONProvider(app)
+        app.secret_key = os.environ.get('SECRET_KEY', 'dev_key_for_testing_change_in_production')
+        CORS(app, supports_credentials=True, origins=[
+            'http://localhost:3000', 'http://127.0.0.1:3000',
+            'https://dg-rater.com',
+        ])
+
+        # Database configuration
+        url = database_url()
+        app.config['SQLALCHEMY_DATABASE_URI'] = url
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+        # Optional read replica for GET endpoints and the startup load
+        app.config['SQLALCHEMY_BINDS'] = replica_binds(os.environ.get('DATABASE_REPLICA_URL'))
+
+        db.init_app(app)
+
+        with app.app_context():
+            # Engines are created here but connect lazily
+            instrument_engine(db.engine)
+            app.rating_system = TournamentRatingSystem()
+            if REPLICA_BIND in db.engines:
+                instrument_engine(db.engines[REPLICA_BIND], replica_pool_stats)
+                install_replica(app, ReplicaMonitor(db.engines[REPLICA_BIND]))
+
+        auth_manager = AuthManager()
+        auth_manager.start_session_sweeper(app)
+        app.auth_manager = auth_manager
+        app.event_broker = EventBroker(max_streams=SSE_MAX_STREAMS)
+        app.single_flight = SingleFlight(grace=float(os.environ.get('SINGLE_FLIGHT_GRACE', '1.0')))
+        app.recording_worker = RecordingWorker(app)
+        app.result_journal = ResultJournal(os.environ.get('RESULT_JOURNAL_PATH')
+                                           or os.path.join(app.instance_path, 'result_journal.jsonl'))
+        app.journal_replayer = JournalReplayer(app, app.result_journal, app.recording_worker)
+
+    with report.phase('blueprints'):
+        for blueprint in all_blueprints:
+            app.register_blueprint(blueprint)
+
+        install_breaker(app, CircuitBreaker())
+
+        app.after_request(invalidate_on_write)
+        app.after_request(compress_response)
+
+        @app.route('/')
+        def health_check():
+            # Answers during warm-up so load balancer health checks pass at once
+            return jsonify({"status": "DG Dubs API is running", "ready": app.startup.ready})
+
+    report.serving()
+    run_warmup(app, _warm_up, background=background)
+    return app
+
+
+def _warm_up(app):
+    """Everything at startup that needs the database, timed phase by phase."""
+    from tournament_core.models import db, User, REPLICA_BIND
+    from backend.db_pool import warm_pool
+    from backend.replica import replica_reads
+
+    report = app.startup
+    with report.phase('create_tables'):
+        db.create_all()
+
+    monitor = getattr(app, 'replica_monitor', None)
+    if monitor is not None:
+        with report.phase('replica_check'):
+            monitor.start()
+
+    with report.phase('load_ratings'):
+        with replica_reads():
+            app.rating_system.load_data()
+
+    with report.phase('admin_user'):
+        admin_user = os.environ.get('ADMIN_USERNAME')
+        admin_pass = os.environ.get('ADMIN_PASSWORD')
+        if admin_user and admin_pass:
+            if User.query.filter_by(role='admin').count() == 0:
+                success, msg = app.auth_manager.create_user(admin_user, admin_pass, 'admin')
+                if success:
+                    print(f"Admin user '{admin_user}' created successfully")
+
+    with report.phase('recover_jobs'):
+        app.recording_worker.start()
+        app.journal_replayer.start()
+
+    with report.phase('warm_pool'):
+        warmed = warm_pool(db.engine)
+        if warmed:
+            print(f"Database pool warmed with {warmed} connections")
+        if REPLICA_BIND in db.engines:
+            warm_pool(db.engines[REPLICA_BIND])
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -5,26 +5,177 @@ Uses SQLAlchemy models backed by MySQL.
 """
 
 import hashlib
+import os
 import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime, timedelta
 
 from tournament_core.models import db, User, UserSession
 
+# Seconds a validated session may be served from the in-process cache.
+# Each worker has its own cache, so a logout handled by another worker
+# is honoured here at most this many seconds later.
+SESSION_CACHE_TTL = int(os.environ.get('SESSION_CACHE_TTL', 60))
+SESSION_CACHE_MAX = 10000
+SESSION_SWEEP_INTERVAL = int(os.environ.get('SESSION_SWEEP_INTERVAL', 3600))
+SESSION_SWEEP_BATCH = 500
+
+# Password hashing. Hashes are stored as pbkdf2_sha256$<iterations>$<hex>;
+# bare hex hashes predate the prefix and used LEGACY_ITERATIONS.
+PASSWORD_ITERATIONS = int(os.environ.get('PASSWORD_ITERATIONS', 100000))
+LEGACY_ITERATIONS = 100000
+HASH_WORKERS = int(os.environ.get('HASH_WORKERS', 2))
+HASH_QUEUE_LIMIT = int(os.environ.get('HASH_QUEUE_LIMIT', 16))
+HASH_TIMEOUT = 10
+
+# Failed-login throttling over a sliding window (seconds)
+LOGIN_WINDOW = int(os.environ.get('LOGIN_WINDOW', 300))
+LOGIN_IP_LIMIT = int(os.environ.get('LOGIN_IP_LIMIT', 20))
+LOGIN_USER_LIMIT = int(os.environ.get('LOGIN_USER_LIMIT', 5))
+
+
+class HashingBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+class LoginThrottled(Exception):
+    """Raised when an IP or username has too many recent failed logins."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many login attempts, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """PBKDF2-SHA256 on a bounded worker pool.
+
+    At most ``workers`` hashes run at once and at most ``queue_limit`` may be
+    in flight; beyond that ``hash`` fails fast with HashingBusy instead of
+    tying up another request thread. A hash that waits longer than
+    ``timeout`` in a saturated pool also raises HashingBusy.
+    """
+
+    PREFIX = 'pbkdf2_sha256'
+
+    def __init__(self, workers=HASH_WORKERS, queue_limit=HASH_QUEUE_LIMIT,
+                 iterations=PASSWORD_ITERATIONS):
+        self.iterations = iterations
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pbkdf2')
+        self._slots = threading.BoundedSemaphore(queue_limit)
+
+    def hash(self, password, salt, iterations=None, timeout=HASH_TIMEOUT):
+        iterations = iterations or self.iterations
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy("Password hashing queue is full")
+        try:
+            future = self._executor.submit(self._pbkdf2, password, salt, iterations)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return self.encode(iterations, future.result(timeout=timeout))
+        except FutureTimeout:
+            raise HashingBusy(f"Password hashing took longer than {timeout}s") from None
+
+    @staticmethod
+    def _pbkdf2(password, salt, iterations):
+        return hashlib.pbkdf2_hmac(
+            'sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations
+        ).hex()
+
+    @classmethod
+    def encode(cls, iterations, digest):
+        return f"{cls.PREFIX}${iterations}${digest}"
+
+    @classmethod
+    def decode(cls, stored_hash):
+        """Return (iterations, hex digest) for new-style and legacy hashes."""
+        if stored_hash.startswith(cls.PREFIX + '$'):
+            _, iterations, digest = stored_hash.split('$', 2)
+            return int(iterations), digest
+        return LEGACY_ITERATIONS, stored_hash
+
+    def needs_rehash(self, stored_hash):
+        return (not stored_hash.startswith(self.PREFIX + '$')
+                or self.decode(stored_hash)[0] != self.iterations)
+
+
+class LoginThrottle:
+    """Sliding-window failed-login counters per IP and per username."""
+
+    MAX_KEYS = 10000
+
+    def __init__(self, window=LOGIN_WINDOW, ip_limit=LOGIN_IP_LIMIT, user_limit=LOGIN_USER_LIMIT):
+        self.window = window
+        self.limits = {'ip': ip_limit, 'user': user_limit}
+        self._failures = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def _keys(self, ip_address, username):
+        keys = [('user', (username or '').lower())]
+        if ip_address:
+            keys.append(('ip', ip_address))
+        return keys
+
+    def check(self, ip_address, username):
+        """Seconds until the caller may retry, or 0 if not throttled."""
+        now = time.monotonic()
+        retry_after = 0
+        with self._lock:
+            for kind, key in self._keys(ip_address, username):
+                attempts = self._failures.get((kind, key))
+                if not attempts:
+                    continue
+                while attempts and attempts[0] <= now - self.window:
+                    attempts.popleft()
+                if len(attempts) >= self.limits[kind]:
+                    retry_after = max(retry_after, int(attempts[0] + self.window - now) + 1)
+                elif not attempts:
+                    del self._failures[(kind, key)]
+        return retry_after
+
+    def record_failure(self, ip_address, username):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failures) >= self.MAX_KEYS:
+                self._prune(now)
+            for kind, key in self._keys(ip_address, username):
+                self._failures[(kind, key)].append(now)
+
+    def _prune(self, now):
+        """Drop keys with no failures inside the window. Caller holds the lock."""
+        for key in [k for k, a in self._failures.items() if not a or a[-1] <= now - self.window]:
+            del self._failures[key]
+
+    def reset(self, username):
+        with self._lock:
+            self._failures.pop(('user', (username or '').lower()), None)
+
 
 class AuthManager:
     """Manages authentication and user sessions."""
 
-    def hash_password(self, password, salt=None):
+    def __init__(self, session_cache_ttl=SESSION_CACHE_TTL, hasher=None, throttle=None):
+        self.session_cache_ttl = session_cache_ttl
+        self._session_cache = {}  # token -> (cached_until, expires_at, info)
+        self._cache_lock = threading.Lock()
+        self._sweeper_stop = threading.Event()
+        self.hasher = hasher or PasswordHasher()
+        self.throttle = throttle or LoginThrottle()
+
+    def hash_password(self, password, salt=None, iterations=None):
         if salt is None:
             salt = secrets.token_hex(32)
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000
-        )
-        return password_hash.hex(), salt
+        return self.hasher.hash(password, salt, iterations), salt
 
     def verify_password(self, password, stored_hash, salt):
-        password_hash, _ = self.hash_password(password, salt)
-        return secrets.compare_digest(password_hash, stored_hash)
+        iterations, digest = self.hasher.decode(stored_hash)
+        candidate, _ = self.hash_password(password, salt, iterations)
+        return secrets.compare_digest(self.hasher.decode(candidate)[1], digest)
 
     def create_user(self, username, password, role='director'):
         existing = User.query.filter_by(username=username).first()
@@ -37,11 +188,24 @@ class AuthManager:
         return True, "User created successfully"
 
     def authenticate_user(self, username, password, ip_address=None):
+        """Check credentials and open a session.
+
+        Raises LoginThrottled when the IP or username has too many recent
+        failures, and HashingBusy when the hashing queue is full.
+        """
+        retry_after = self.throttle.check(ip_address, username)
+        if retry_after:
+            raise LoginThrottled(retry_after)
+
         user = User.query.filter_by(username=username, is_active=True).first()
-        if not user:
-            return False, "Invalid username or password"
-        if not self.verify_password(password, user.password_hash, user.salt):
+        if not user or not self.verify_password(password, user.password_hash, user.salt):
+            self.throttle.record_failure(ip_address, username)
             return False, "Invalid username or password"
+        self.throttle.reset(username)
+
+        # Transparently upgrade hashes made with older parameters
+        if self.hasher.needs_rehash(user.password_hash):
+            user.password_hash, user.salt = self.hash_password(password)
 
         session_token = secrets.token_urlsafe(32)
         expires_at = datetime.now() + timedelta(hours=24)
@@ -60,21 +224,115 @@ class AuthManager:
         }
 
     def validate_session(self, session_token):
-        us = UserSession.query.filter_by(session_token=session_token, is_active=True).first()
-        if not us:
-            return False, None
-        user = User.query.filter_by(id=us.user_id, is_active=True).first()
-        if not user:
+        now = datetime.now()
+        cached = self._session_cache.get(session_token)
+        if cached:
+            cached_until, expires_at, info = cached
+            if time.monotonic() < cached_until and now <= expires_at:
+                return True, dict(info)
+            self._evict_session(session_token)
+
+        row = (
+            db.session.query(UserSession, User)
+            .join(User, UserSession.user_id == User.id)
+            .filter(UserSession.session_token == session_token,
+                    UserSession.is_active.is_(True), User.is_active.is_(True))
+            .first()
+        )
+        if not row:
             return False, None
-        if datetime.now() > us.expires_at:
+        us, user = row
+        if now > us.expires_at:
             us.is_active = False
             db.session.commit()
             return False, None
-        return True, {'user_id': user.id, 'username': user.username, 'role': user.role}
+
+        info = {'user_id': user.id, 'username': user.username, 'role': user.role}
+        self._cache_session(session_token, us.expires_at, info)
+        return True, dict(info)
 
     def logout_user(self, session_token):
+        self._evict_session(session_token)
         us = UserSession.query.filter_by(session_token=session_token).first()
         if us:
             us.is_active = False
             db.session.commit()
         return True
+
+    # ── Session cache ────────────────────────────────────────────────
+
+    def invalidate_user(self, user_id):
+        """Drop every cached session for a user after their record changes."""
+        with self._cache_lock:
+            stale = [t for t, (_, _, info) in self._session_cache.items() if info['user_id'] == user_id]
+            for token in stale:
+                del self._session_cache[token]
+
+    def _cache_session(self, session_token, expires_at, info):
+        if self.session_cache_ttl <= 0:
+            return
+        with self._cache_lock:
+            if len(self._session_cache) >= SESSION_CACHE_MAX:
+                self._prune_cache()
+            self._session_cache[session_token] = (
+                time.monotonic() + self.session_cache_ttl, expires_at, info,
+            )
+
+    def _evict_session(self, session_token):
+        with self._cache_lock:
+            self._session_cache.pop(session_token, None)
+
+    def _prune_cache(self):
+        """Drop expired entries; if still full, drop the oldest. Caller holds the lock."""
+        now = time.monotonic()
+        for token in [t for t, (until, _, _) in self._session_cache.items() if until <= now]:
+            del self._session_cache[token]
+        while len(self._session_cache) >= SESSION_CACHE_MAX:
+            del self._session_cache[next(iter(self._session_cache))]
+
+    # ── Expired session sweeper ──────────────────────────────────────
+
+    def sweep_sessions(self, batch_size=SESSION_SWEEP_BATCH):
+        """Delete expired or inactive sessions in batches. Returns rows deleted."""
+        deleted = 0
+        now = datetime.now()
+        while True:
+            ids = [
+                sid for (sid,) in db.session.query(UserSession.id).filter(
+                    db.or_(UserSession.expires_at < now, UserSession.is_active.is_(False))
+                ).limit(batch_size)
+            ]
+            if not ids:
+                break
+            UserSession.query.filter(UserSession.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(ids)
+            if len(ids) < batch_size:
+                break
+
+        with self._cache_lock:
+            self._prune_cache()
+        return deleted
+
+    def start_session_sweeper(self, app, interval=SESSION_SWEEP_INTERVAL):
+        """Run sweep_sessions every ``interval`` seconds on a daemon thread."""
+        if interval <= 0:
+            return None
+
+        def run():
+            while not self._sweeper_stop.wait(interval):
+                with app.app_context():
+                    try:
+                        deleted = self.sweep_sessions()
+                        if deleted:
+                            print(f"Session sweeper removed {deleted} expired sessions")
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"Session sweep failed: {e}")
+
+        thread = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        thread.start()
+        return thread
+
+    def stop_session_sweeper(self):
+        self._sweeper_stop.set()
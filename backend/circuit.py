@@ -0,0 +1,223 @@
+"""Database circuit breaker and degraded read-only mode.
+
+Consecutive database errors (seen by an engine ``handle_error`` listener, so
+the worker threads count too) open the breaker. While it is open, requests
+do not wait on the database at all:
+
+* views marked ``in_memory`` already run off the rating system and are served as usual;
+* GET views with a ``snapshot_fallback`` answer from the last published in-memory state;
+* views marked ``tolerates_outage`` (result recording, which journals) run as usual;
+* everything else gets 503 with Retry-After.
+
+Degraded responses carry ``X-Degraded: read-only`` and ``X-Snapshot-Age``
+(seconds since the in-memory state was published). After ``reset_timeout``
+one request probes the database with ``SELECT 1`` and, if that answers, runs
+as usual; the breaker closes only if that request finishes without a 5xx and
+opens again otherwise.
+"""
+
+import os
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError, InterfaceError
+
+from tournament_core.models import db
+
+DB_BREAKER_FAILURES = int(os.environ.get('DB_BREAKER_FAILURES', '3'))
+DB_BREAKER_RESET = float(os.environ.get('DB_BREAKER_RESET', '30'))
+
+# Errors meaning "the database is unreachable", as opposed to a bad request
+DB_UNAVAILABLE = (OperationalError, InterfaceError)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=DB_BREAKER_FAILURES, reset_timeout=DB_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+        self.counts = {'opened': 0, 'probes': 0, 'degraded': 0, 'rejected': 0}
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != 'closed'
+
+    def retry_after(self) -> int:
+        if self.opened_at is None:
+            return 0
+        return max(1, int(self.opened_at + self.reset_timeout - time.monotonic()))
+
+    def record_success(self):
+        # A half-open breaker is closed by its probe request's outcome, not by any query
+        if self.state == 'half_open' or (self.failures == 0 and self.state == 'closed'):
+            return
+        self._close()
+
+    def record_probe(self, ok: bool):
+        """Outcome of the half-open probe request: close on success, open again otherwise."""
+        if ok:
+            self._close()
+            return
+        with self._lock:
+            self.failures += 1
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+    def _close(self):
+        with self._lock:
+            if self.state != 'closed':
+                print("Database reachable again; circuit closed")
+            self.state = 'closed'
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                if self.state == 'closed':
+                    self.counts['opened'] += 1
+                    print(f"Database failing ({self.failures} errors); circuit open, serving reads from memory")
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+    def try_probe(self) -> bool:
+        """True for the one caller that should test the database after the reset timeout."""
+        with self._lock:
+            if self.state != 'open' or time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = 'half_open'
+            self.counts['probes'] += 1
+            return True
+
+    def stats(self):
+        return {'state': self.state, 'failures': self.failures, 'retry_after': self.retry_after() if self.is_open else 0,
+                **self.counts}
+
+
+def install_breaker(app, breaker):
+    """Feed the breaker from the engine and register the request hooks."""
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'handle_error')
+    def on_error(context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, DB_UNAVAILABLE):
+            breaker.record_failure()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def on_success(*args):
+        breaker.record_success()
+
+    app.db_breaker = breaker
+    app.before_request(breaker_guard)
+    app.after_request(degraded_headers)
+    app.after_request(note_probe_status)
+    app.teardown_request(finish_probe)
+    for exc in DB_UNAVAILABLE:
+        app.register_error_handler(exc, handle_db_unavailable)
+
+
+# ── View markers ─────────────────────────────────────────────────────
+
+def in_memory(view):
+    """Mark a view that never touches the database; it keeps working during an outage."""
+    view.in_memory = True
+    return view
+
+
+def tolerates_outage(view):
+    """Mark a write view that handles an unreachable database itself."""
+    view.tolerates_outage = True
+    return view
+
+
+def snapshot_fallback(fallback):
+    """Serve GETs of the decorated view from ``fallback(**view_args)`` while the database is down."""
+    def decorate(view):
+        view.snapshot_fallback = fallback
+        return view
+    return decorate
+
+
+# ── Request hooks ────────────────────────────────────────────────────
+
+def _unavailable(breaker):
+    breaker.counts['rejected'] += 1
+    response = jsonify({'error': 'Database unavailable; the API is read-only for now'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(breaker.retry_after())
+    return response
+
+
+def _serve_degraded(view):
+    fallback = getattr(view, 'snapshot_fallback', None)
+    if fallback is None or request.method != 'GET':
+        return None
+    current_app.db_breaker.counts['degraded'] += 1
+    g.degraded = True
+    return fallback(**(request.view_args or {}))
+
+
+def breaker_guard():
+    """before_request hook: short-circuit database-backed views while the breaker is open."""
+    breaker = getattr(current_app, 'db_breaker', None)
+    if breaker is None or not breaker.is_open or not request.path.startswith('/api/'):
+        return None
+    if breaker.try_probe():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception:
+            db.session.rollback()
+            breaker.record_probe(False)
+        else:
+            # This request is the probe; finish_probe records how it went. Keyed on the
+            # request object because batched sub-requests share this app context's ``g``.
+            g.breaker_probe = request._get_current_object()
+            return None
+
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'in_memory', False):
+        g.degraded = True
+        return None
+    if getattr(view, 'tolerates_outage', False):
+        return None
+    degraded = _serve_degraded(view)
+    return degraded if degraded is not None else _unavailable(breaker)
+
+
+def handle_db_unavailable(e):
+    """A database call failed mid-request: degrade if the view can, else 503."""
+    db.session.rollback()
+    print(f"Database unavailable during {request.method} {request.path}: {e}")
+    degraded = _serve_degraded(current_app.view_functions.get(request.endpoint))
+    return degraded if degraded is not None else _unavailable(current_app.db_breaker)
+
+
+def note_probe_status(response):
+    """after_request hook: remember the probe request's status for ``finish_probe``."""
+    if g.get('breaker_probe') is request._get_current_object():
+        g.probe_status = response.status_code
+    return response
+
+
+def finish_probe(exc=None):
+    """teardown hook: always settle the half-open breaker, even if the probe request crashed."""
+    if g.get('breaker_probe') is request._get_current_object():
+        g.pop('breaker_probe')
+        status = g.pop('probe_status', 500)
+        current_app.db_breaker.record_probe(exc is None and status < 500)
+
+
+def degraded_headers(response):
+    """after_request hook: label responses built from the in-memory snapshot."""
+    if g.get('degraded'):
+        state = current_app.rating_system.state
+        response.headers['X-Degraded'] = 'read-only'
+        response.headers['X-Snapshot-Age'] = str(int(time.time() - state.published_at))
+    return response
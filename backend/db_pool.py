@@ -0,0 +1,161 @@
+"""Database engine pool configuration, telemetry and warm-up.
+
+Pool sizing, recycling and pre-ping come from the environment, so the RDS
+deployment can be tuned without code changes. ``InstrumentedQueuePool``
+times each checkout, which exposes queueing behind a busy pool. Pool events
+count new connections and invalidations. ``warm_pool`` opens connections at
+startup so the first requests of a tournament morning don't pay for TCP/TLS
+setup and authentication.
+"""
+
+import os
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# A checkout slower than this means requests are queueing for a connection
+SLOW_CHECKOUT = 0.1
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.slow_checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_overflow = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+
+    def record_checkout(self, wait, overflow):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+            if wait >= SLOW_CHECKOUT:
+                self.slow_checkouts += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool=None):
+        with self._lock:
+            out = {
+                'checkouts': self.checkouts,
+                'slow_checkouts': self.slow_checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.wait_max * 1000, 3),
+                'peak_overflow': self.peak_overflow,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'soft_invalidations': self.soft_invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            out.update({'size': pool.size(), 'checked_out': pool.checkedout(),
+                        'overflow': max(0, pool.overflow()), 'idle': pool.checkedin()})
+        return out
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+    stats = pool_stats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(time.perf_counter() - start, self.overflow())
+        return conn
+
+
+def _pool_class(stats):
+    if stats is pool_stats:
+        return InstrumentedQueuePool
+    return type('InstrumentedQueuePool', (InstrumentedQueuePool,), {'stats': stats})
+
+
+def engine_options(database_url, stats=pool_stats):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``database_url``, tuned from the environment.
+
+    ``stats`` collects the checkout timings; engines other than the primary
+    (the read replica) pass their own.
+    """
+    if database_url.startswith('sqlite'):
+        # SQLite has no server to keep alive; only file databases can use a queue pool
+        return {} if ':memory:' in database_url else {'poolclass': _pool_class(stats)}
+    options = {
+        'poolclass': _pool_class(stats),
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        # Below RDS/MySQL wait_timeout so idle connections are replaced before the server drops them
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),
+    }
+    if database_url.startswith('mysql'):
+        # Fail fast when the database is unreachable so the circuit breaker can take over
+        options['connect_args'] = {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', '3'))}
+    return options
+
+
+def instrument_engine(engine, stats=pool_stats):
+    """Count new connections and invalidations on ``engine``'s pool."""
+    def on_connect(dbapi_connection, connection_record):
+        with stats._lock:
+            stats.connects += 1
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with stats._lock:
+            stats.invalidations += 1
+
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        with stats._lock:
+            stats.soft_invalidations += 1
+
+    event.listen(engine, 'connect', on_connect)
+    event.listen(engine, 'invalidate', on_invalidate)
+    event.listen(engine, 'soft_invalidate', on_soft_invalidate)
+
+
+def warm_pool(engine, count=None):
+    """Open up to ``count`` pooled connections (default: the pool size) and return them idle.
+
+    Returns how many connections were opened and verified.
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+    if count is None:
+        count = int(os.environ.get('DB_POOL_WARM', pool.size()))
+    count = min(count, pool.size())
+    held = []
+    try:
+        for _ in range(count):
+            conn = engine.connect()
+            held.append(conn)
+            conn.execute(text('SELECT 1'))
+    except Exception as e:
+        print(f"Pool warm-up stopped after {len(held)} connections: {e}")
+    finally:
+        for conn in held:
+            conn.close()
+    return len(held)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+In-process publish/subscribe for Server-Sent Events.
+
+Endpoints publish tournament lifecycle, team, result and ace pot events to
+named channels; each SSE connection holds a bounded queue subscribed to the
+channels it asked for. Events only reach spectators connected to the same
+worker process, and event ids (and so Last-Event-ID replay) are per process
+too, which is why the deployment runs a single worker. Each open stream holds
+a server thread, so the broker caps how many may be open at once.
+"""
+
+import itertools
+import json
+import os
+import queue
+import threading
+from collections import defaultdict, deque
+
+from flask import current_app
+
+TOURNAMENTS_CHANNEL = 'tournaments'
+ACE_POT_CHANNEL = 'ace-pot'
+
+# Keep below the server's thread count so streams can't starve ordinary requests
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', '24'))
+
+
+def tournament_channel(tid):
+    return f'tournament:{tid}'
+
+
+class StreamLimitReached(Exception):
+    """Raised by EventBroker.subscribe when max_streams streams are already open."""
+
+
+class Subscription:
+    def __init__(self, channels, queue_size):
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(maxsize=queue_size)
+
+    def deliver(self, event):
+        """Enqueue without blocking; a slow client loses its oldest events."""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class EventBroker:
+    def __init__(self, queue_size=100, replay_size=200, max_streams=None):
+        self.queue_size = queue_size
+        self.max_streams = max_streams
+        self._open = set()  # every live Subscription, for the stream cap
+        self._subscribers = defaultdict(set)  # channel -> {Subscription}
+        self._recent = deque(maxlen=replay_size)  # (id, type, channels, data), one entry per event
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def subscribe(self, channels, last_event_id=None):
+        sub = Subscription(channels, self.queue_size)
+        with self._lock:
+            if self.max_streams is not None and len(self._open) >= self.max_streams:
+                raise StreamLimitReached()
+            self._open.add(sub)
+            for channel in sub.channels:
+                self._subscribers[channel].add(sub)
+            if last_event_id is not None:
+                for event_id, event_type, channels, data in self._recent:
+                    if event_id <= last_event_id:
+                        continue
+                    # An event sent to several of this client's channels is replayed once
+                    channel = next((ch for ch in channels if ch in sub.channels), None)
+                    if channel is not None:
+                        sub.deliver({'id': event_id, 'event': event_type, 'channel': channel, 'data': data})
+        return sub
+
+    def unsubscribe(self, sub):
+        """Idempotent, so both the stream and its response may call it."""
+        with self._lock:
+            self._open.discard(sub)
+            for channel in sub.channels:
+                subs = self._subscribers.get(channel)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._subscribers[channel]
+
+    def publish(self, event_type, data, *channels):
+        channels = channels or (TOURNAMENTS_CHANNEL,)
+        with self._lock:
+            event_id = next(self._ids)
+            self._recent.append((event_id, event_type, channels, data))
+            delivered = set()
+            for channel in channels:
+                event = {'id': event_id, 'event': event_type, 'channel': channel, 'data': data}
+                for sub in self._subscribers.get(channel, ()):
+                    if sub not in delivered:
+                        sub.deliver(event)
+                        delivered.add(sub)
+            self.published += 1
+        return event_id
+
+    def stream(self, sub, heartbeat=15):
+        """Generator of SSE-formatted frames for ``sub``; unsubscribes when the client goes away."""
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = sub.queue.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield format_sse(event)
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'published': self.published,
+                'streams': len(self._open),
+                'max_streams': self.max_streams,
+                'subscribers': {ch: len(subs) for ch, subs in self._subscribers.items()},
+            }
+
+
+def format_sse(event):
+    payload = json.dumps({'channel': event['channel'], **event['data']}, default=str)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+
+def publish(event_type, data, *channels):
+    """Publish through the current app's broker, if one is configured."""
+    broker = getattr(current_app, 'event_broker', None)
+    if broker is not None:
+        broker.publish(event_type, data, *channels)
+
+
+def publish_tournament(event_type, tid, data=None):
+    publish(event_type, {'tournament_id': tid, **(data or {})},
+            TOURNAMENTS_CHANNEL, tournament_channel(tid))
@@ -0,0 +1,197 @@
+"""Idempotent background recording jobs.
+
+Recording a tournament rewrites ratings, history and payouts for every
+player in it, which is too slow to hold a request open for. The record
+endpoint stores a RecordingJob keyed by an idempotency key and returns at
+once; a worker thread runs the write in one transaction, refreshes the
+in-memory caches and stores the outcome on the job row for clients to poll.
+Resubmitting the same key returns the existing job instead of a second
+recording.
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from tournament_core.models import db, RecordingJob
+from tournament_core.serializers import recording_job_encoder
+from backend.recording import record_results
+
+# A Running job older than this is assumed orphaned by a crashed worker and retried
+JOB_STALE_AFTER = 600
+# How often the worker requeues orphaned jobs (e.g. ones it could not mark finished during an outage)
+JOB_RECOVER_INTERVAL = 60
+MAX_KEY_LENGTH = 100
+
+
+def job_key(tid, data, header=None):
+    """Idempotency key for a record request.
+
+    Clients may send their own (Idempotency-Key header or idempotency_key
+    field); otherwise the tournament id is the key, since a pending
+    tournament can only be recorded once.
+    """
+    key = header or data.get('idempotency_key') or f'tournament-{tid}-record'
+    key = str(key).strip()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValueError(f'Idempotency key must be 1-{MAX_KEY_LENGTH} characters')
+    return key
+
+
+def job_to_dict(job):
+    out = recording_job_encoder(job)
+    out['result'] = json.loads(job.result) if job.result else None
+    out['status_url'] = f'/api/jobs/{job.job_id}'
+    return out
+
+
+def submit_job(tid, key, data):
+    """Create (or find) the job for ``key``. Returns (job, created).
+
+    A failed job is reset with the new payload so the client can retry
+    under the same key; any other existing job is returned unchanged.
+    """
+    job = RecordingJob.query.filter_by(idempotency_key=key).first()
+    if job is None:
+        job = RecordingJob(idempotency_key=key, tournament_id=tid, status='Queued', payload=json.dumps(data))
+        db.session.add(job)
+        try:
+            db.session.commit()
+            return job, True
+        except IntegrityError:
+            # Lost a race with an identical request; use the winner's job
+            db.session.rollback()
+            job = RecordingJob.query.filter_by(idempotency_key=key).first()
+    if job.tournament_id != tid:
+        raise ValueError('Idempotency key was already used for another tournament')
+    if job.status == 'Failed':
+        job.status = 'Queued'
+        job.payload = json.dumps(data)
+        job.result = job.error = job.started_at = job.finished_at = None
+        db.session.commit()
+        return job, True
+    return job, False
+
+
+class RecordingWorker:
+    """Single background thread that runs recording jobs in submission order.
+
+    One thread per process keeps rating updates serialized; the row claim
+    in ``process`` keeps a job from running twice across processes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._recovered = False
+        self._recovered_at = time.monotonic()
+        self.counts = {'processed': 0, 'succeeded': 0, 'failed': 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='recording-worker', daemon=True)
+                self._thread.start()
+        if not self._recovered:
+            self.recover()
+            self._recovered = True
+        return self._thread
+
+    def submit(self, job_id):
+        self.start()
+        self._queue.put(job_id)
+
+    def recover(self):
+        """Requeue jobs left Queued, or stuck Running, by a crashed worker or a previous process."""
+        self._recovered_at = time.monotonic()
+        with self.app.app_context():
+            stale = datetime.utcnow() - timedelta(seconds=JOB_STALE_AFTER)
+            RecordingJob.query.filter(
+                RecordingJob.status == 'Running', RecordingJob.started_at < stale,
+            ).update({'status': 'Queued'}, synchronize_session=False)
+            db.session.commit()
+            pending = [job_id for job_id, in db.session.query(RecordingJob.job_id)
+                       .filter_by(status='Queued').order_by(RecordingJob.job_id)]
+        for job_id in pending:
+            self._queue.put(job_id)
+        if pending:
+            print(f"Recording worker requeued {len(pending)} jobs")
+
+    def stats(self):
+        return {**self.counts, 'queued': self._queue.qsize()}
+
+    def _run(self):
+        # Nothing may end this loop: start() never replaces a dead thread
+        while True:
+            try:
+                job_id = self._queue.get(timeout=JOB_RECOVER_INTERVAL)
+            except queue.Empty:
+                job_id = None
+            try:
+                if job_id is not None:
+                    self._run_job(job_id)
+                if time.monotonic() - self._recovered_at >= JOB_RECOVER_INTERVAL:
+                    self.recover()
+            except Exception as e:
+                print(f"Recording worker error: {e!r}")
+
+    def _run_job(self, job_id):
+        with self.app.app_context():
+            try:
+                self.process(job_id)
+            except Exception as e:
+                # The detail stays in the log; clients polling the job only see a generic error
+                print(f"Recording job {job_id} crashed: {e!r}")
+                try:
+                    db.session.rollback()
+                    self._finish(job_id, 'Failed', {'error': 'Internal error'}, 'Internal error')
+                except Exception as finish_error:
+                    # Database still down: the job stays Running and recover() retries it once stale
+                    db.session.rollback()
+                    print(f"Could not mark recording job {job_id} failed: {finish_error!r}")
+            finally:
+                db.session.remove()
+
+    def process(self, job_id):
+        claimed = RecordingJob.query.filter_by(job_id=job_id, status='Queued').update({
+            'status': 'Running', 'started_at': datetime.utcnow(),
+            'attempts': RecordingJob.attempts + 1,
+        }, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return  # already taken by another worker, or finished
+        job = RecordingJob.query.get(job_id)
+        self.counts['processed'] += 1
+
+        def succeed(body):
+            job.status = 'Succeeded'
+            job.result = json.dumps(body)
+            job.finished_at = datetime.utcnow()
+
+        body, status = record_results(job.tournament_id, json.loads(job.payload), on_commit=succeed)
+        if status >= 400:
+            self._finish(job_id, 'Failed', body, body.get('error'))
+            return
+        self.counts['succeeded'] += 1
+        # The request that queued this job has long since returned; drop reads coalesced before the write
+        flight = getattr(self.app, 'single_flight', None)
+        if flight is not None:
+            flight.invalidate()
+
+    def _finish(self, job_id, status, body, error):
+        job = RecordingJob.query.get(job_id)
+        if job is None or job.status == 'Succeeded':
+            return
+        job.status = status
+        job.result = json.dumps(body)
+        job.error = (error or '')[:500]
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        if status == 'Failed':
+            self.counts['failed'] += 1
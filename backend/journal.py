@@ -0,0 +1,248 @@
+"""Local write-ahead journal for result submissions made while the database is down.
+
+Events are often run from parks with poor connectivity to the database. When
+a record request cannot reach the database, the submission is appended to a
+local JSON-lines file and fsynced before the request is acknowledged. A
+replay thread feeds journaled submissions, in order, through the normal
+recording jobs once the database answers again. Each entry keeps its
+idempotency key, so anything already recorded is deduplicated by the job
+table (and by the tournament no longer being in progress).
+
+A checkpoint file holds the byte offset of the first entry not yet handed
+to the database. It is replaced atomically, and the journal is truncated
+once everything has been replayed. Every gunicorn worker shares the same
+files, so changes are serialized with an ``flock`` on a sibling lock file as
+well as a thread lock.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines run a single process
+    fcntl = None
+
+from tournament_core.models import db
+from backend.jobs import submit_job
+from backend.circuit import DB_UNAVAILABLE
+
+JOURNAL_REPLAY_INTERVAL = int(os.environ.get('JOURNAL_REPLAY_INTERVAL', '15'))
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _drop_torn_tail(f):
+    """Truncate an append-mode file back to its last newline.
+
+    A crash mid-append leaves a partial final line; the next entry must not be
+    written onto the end of it, or both become unreadable.
+    """
+    end = f.seek(0, os.SEEK_END)
+    if end == 0:
+        return
+    f.seek(end - 1)
+    if f.read(1) == b'\n':
+        return
+    pos = end
+    while pos > 0:
+        step = min(4096, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step)
+        newline = chunk.rfind(b'\n')
+        if newline != -1:
+            pos += newline + 1
+            break
+    f.truncate(pos)
+    print(f"Dropped {end - pos} bytes of a torn journal entry")
+
+
+class ResultJournal:
+    def __init__(self, path):
+        self.path = path
+        self.checkpoint_path = path + '.checkpoint'
+        self.lock_path = path + '.lock'
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive access across this process's threads and other worker processes."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def append(self, tournament_id, key, data):
+        """Durably record one submission. Returns once it is on disk."""
+        line = json.dumps({
+            'tournament_id': tournament_id, 'idempotency_key': key,
+            'data': data, 'received_at': time.time(),
+        }, separators=(',', ':')) + '\n'
+        with self._locked():
+            created = not os.path.exists(self.path)
+            with open(self.path, 'a+b') as f:
+                _drop_torn_tail(f)
+                f.write(line.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            if created:
+                _fsync_dir(self.path)
+
+    def pending(self):
+        """Entries after the checkpoint as [(end offset, entry)], oldest first.
+
+        A final line without a newline is a torn write from a crash mid-append
+        and is ignored; the request that wrote it was never acknowledged.
+        """
+        with self._locked():
+            start = self._checkpoint()
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(start)
+                    raw = f.read()
+            except FileNotFoundError:
+                return []
+        entries, offset = [], start
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            offset += len(line)
+            try:
+                entries.append((offset, json.loads(line)))
+            except ValueError:
+                print(f"Skipping unreadable journal entry ending at byte {offset}")
+                entries.append((offset, None))
+        return entries
+
+    def advance(self, offset):
+        """Move the checkpoint past an entry that is now safely in the database."""
+        with self._locked():
+            if offset <= self._checkpoint():
+                return  # another worker has already replayed past it
+            tmp = self.checkpoint_path + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(str(offset))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.checkpoint_path)
+            _fsync_dir(self.checkpoint_path)
+
+    def compact(self):
+        """Truncate the journal once every entry has been replayed."""
+        with self._locked():
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                return
+            if size and self._checkpoint() >= size:
+                os.remove(self.path)
+                os.remove(self.checkpoint_path)
+                _fsync_dir(self.path)
+
+    def has_pending(self) -> bool:
+        """Cheap check: the file only exists until everything has been replayed."""
+        return os.path.exists(self.path)
+
+    def stats(self):
+        entries = self.pending()
+        return {'pending': len(entries), 'oldest': entries[0][1].get('received_at') if entries and entries[0][1] else None}
+
+    def _checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+
+class JournalReplayer:
+    """Hands journaled submissions to the recording worker once the database is back."""
+
+    def __init__(self, app, journal, worker):
+        self.app = app
+        self.journal = journal
+        self.worker = worker
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+
+    def wake(self):
+        """Replay now rather than at the next interval."""
+        self._wake.set()
+
+    def replay(self):
+        """Submit pending entries in order. Returns how many were handed off.
+
+        Stops at the first database error and leaves the rest for the next run.
+        """
+        replayed = 0
+        with self._lock, self.app.app_context():
+            try:
+                for offset, entry in self.journal.pending():
+                    if entry is not None:
+                        try:
+                            job, created = submit_job(entry['tournament_id'], entry['idempotency_key'], entry['data'])
+                        except DB_UNAVAILABLE:
+                            db.session.rollback()
+                            break
+                        except ValueError as e:
+                            db.session.rollback()
+                            print(f"Dropping journaled result for tournament {entry['tournament_id']}: {e}")
+                        else:
+                            if created:
+                                self.worker.submit(job.job_id)
+                            replayed += 1
+                    self.journal.advance(offset)
+                else:
+                    self.journal.compact()
+            finally:
+                db.session.remove()
+        if replayed:
+            print(f"Replayed {replayed} journaled tournament results")
+        return replayed
+
+    def start(self, interval=JOURNAL_REPLAY_INTERVAL):
+        """Replay every ``interval`` seconds (or when woken) on a daemon thread."""
+        if interval <= 0:
+            return None
+
+        def run():
+            while True:
+                self._wake.wait(interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    return
+                try:
+                    self.replay()
+                except Exception as e:
+                    print(f"Journal replay failed: {e}")
+
+        thread = threading.Thread(target=run, name='journal-replay', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Shared query-string handling for paginated list endpoints.
+
+Cursors are opaque URL-safe tokens wrapping the last row's sort key, so a
+page is found by seeking past that key rather than by counting an offset.
+"""
+
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(key) -> str:
+    raw = json.dumps(list(key), separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> list:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, list):
+        raise ValueError('Invalid cursor')
+    return key
+
+
+def parse_page(args):
+    """(limit, cursor key) from ``limit``/``cursor``; limit is None for an unpaginated list."""
+    cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+    if args.get('limit'):
+        try:
+            limit = int(args['limit'])
+        except ValueError:
+            raise ValueError('limit must be an integer')
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        limit = min(limit, MAX_PAGE_SIZE)
+    else:
+        limit = DEFAULT_PAGE_SIZE if cursor is not None else None
+    return limit, cursor
+
+
+def parse_sort(args, allowed, default):
+    """``sort=field`` or ``sort=-field`` -> (field, descending)."""
+    sort = args.get('sort') or default
+    descending = sort.startswith('-')
+    field = sort.lstrip('-')
+    if field not in allowed:
+        raise ValueError(f"sort must be one of: {', '.join(allowed)}")
+    return field, descending
+
+
+def parse_fields(args, allowed, default):
+    """``fields=a,b`` -> ordered tuple of requested fields, validated against ``allowed``."""
+    if not args.get('fields'):
+        return tuple(default)
+    fields = tuple(f.strip() for f in args['fields'].split(',') if f.strip())
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def project(row, fields):
+    return {f: row[f] for f in fields if f in row}
+
+
+def page_response(entries, limit, next_key):
+    """Plain list when unpaginated (the original shape), else {entries, next_cursor}."""
+    if limit is None:
+        return entries
+    return {'entries': entries, 'next_cursor': encode_cursor(next_key) if next_key is not None else None}
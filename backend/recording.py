@@ -0,0 +1,147 @@
+"""Recording final results for a pending tournament.
+
+Shared by the background recording worker and by closing a live-scoring
+round. The whole write (team rows, ratings, history, payouts and any ace pot
+buy-ins and payout sent with the results) is one transaction against the
+tournament's own row, so a failed attempt leaves nothing behind and can
+simply be retried. A journaled submission therefore carries its ace pot too.
+"""
+
+from flask import current_app
+
+from tournament_core.models import Tournament, TournamentParticipant
+from tournament_core.payout_engine import PayoutEngine
+from tournament_core.serializers import to_iso
+from backend.events import ACE_POT_CHANNEL, publish, publish_tournament
+
+
+def parse_results(data):
+    """Validate a record request body into [((player1, player2), score)]. Raises ValueError."""
+    team_results = data.get('team_results', [])
+    if not team_results:
+        raise ValueError('No results provided')
+    formatted = []
+    for tr in team_results:
+        if 'player1' in tr and 'player2' in tr and 'score' in tr:
+            try:
+                formatted.append(((tr['player1'], tr['player2']), int(tr['score'])))
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid score for {tr['player1']} & {tr['player2']}")
+    if not formatted:
+        raise ValueError('No valid results')
+    parse_ace_pot(data)
+    return formatted
+
+
+def parse_ace_pot(data):
+    """The optional ``ace_pot`` request as (buy-in players, payout recipients). Raises ValueError."""
+    ace_pot = data.get('ace_pot') or {}
+    if not isinstance(ace_pot, dict):
+        raise ValueError('ace_pot must be an object')
+    lists = []
+    for field in ('buy_in_players', 'payout_recipients'):
+        names = ace_pot.get(field) or []
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            raise ValueError(f'ace_pot.{field} must be a list of player names')
+        lists.append(names)
+    return tuple(lists)
+
+
+def record_results(tid, data, on_commit=None):
+    """Record final team scores for in-progress tournament ``tid`` and apply payouts.
+
+    The shell row is locked and completed in place, so a concurrent or
+    repeated attempt finds it no longer in progress. ``on_commit(body)``
+    runs inside the same transaction, letting callers persist their own
+    bookkeeping atomically with the results. Returns (body, status).
+    """
+    try:
+        formatted = parse_results(data)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    # Payout config
+    payout_config = data.get('payout_config', {})
+    buy_in = payout_config.get('buy_in_per_player', 0)
+    second_place_fixed = payout_config.get('second_place', 40)
+    third_place_fixed = payout_config.get('third_place', 20)
+    split_ties = payout_config.get('split_ties', False)
+
+    total_players = sum(2 if p2 != 'Ghost Player' else 1 for (p1, p2), _ in formatted)
+    pot = buy_in * total_players
+    purse = PayoutEngine.standard_purse(pot, second_place_fixed, third_place_fixed, len(formatted))
+
+    # Manual payout overrides (from tie resolution modal): [{player1, player2, payout}]
+    manual_payouts = data.get('manual_payouts')
+
+    rs = current_app.rating_system
+    engine = rs.payout_engine
+    try:
+        # One draft across the transaction: new ratings are published only after the commit
+        with rs.batch():
+            t = (Tournament.query.filter_by(tournament_id=tid)
+                 .populate_existing().with_for_update().first())
+            if not t or t.status != 'In Progress':
+                raise ValueError('Tournament not found or not in progress')
+
+            TournamentParticipant.query.filter_by(tournament_id=tid).delete()
+            rs.record_tournament(formatted, t.course, to_iso(t.date), tournament_id=tid)
+
+            body = {'message': f'Tournament recorded with {len(formatted)} teams', 'tournament_id': tid}
+            index = engine.team_index(tid)
+            if manual_payouts:
+                engine.apply_payouts(index, engine.payouts_from_request(manual_payouts))
+            else:
+                payouts = engine.split_payouts(index, purse)
+                paid_positions = engine.paid_places(len(formatted))
+                if engine.has_paid_tie(index, paid_positions) and not split_ties:
+                    # Leave payouts for the director to settle
+                    body.update({
+                        'needs_manual_payout': True,
+                        'pot': pot, 'first_payout': purse[1],
+                        'second_payout': purse[2], 'third_payout': purse[3],
+                        'tied_teams': [{
+                            'player1': p1, 'player2': p2,
+                            'position': team['position'], 'score': team['score'],
+                            'suggested_payout': payouts[(p1, p2)],
+                        } for (p1, p2), team in index.items() if team['position'] in paid_positions],
+                    })
+                else:
+                    engine.apply_payouts(index, payouts)
+
+            buy_ins, recipients = parse_ace_pot(data)
+            if buy_ins or recipients:
+                ace_pot = rs.ace_pot_manager
+                body['ace_pot'] = {}
+                if buy_ins:
+                    body['ace_pot']['buy_ins'] = ace_pot.process_batch_buy_ins(tid, buy_ins, commit=False)
+                if recipients:
+                    body['ace_pot']['payout'] = ace_pot.process_batch_payout(tid, recipients, commit=False)
+
+            if on_commit:
+                on_commit(body)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    rs.load_data()
+    publish_completed(tid)
+    if 'ace_pot' in body:
+        publish_ace_pot(tid, body['ace_pot'])
+    return body, 201
+
+
+def publish_ace_pot(tid, result):
+    """Announce the new ace pot balance, and the payout if there was one."""
+    publish('ace_pot.balance', {'balance': current_app.rating_system.ace_pot_manager.get_balance()},
+            ACE_POT_CHANNEL)
+    if 'payout' in result:
+        publish_tournament('tournament.ace_pot_paid', tid, {
+            'recipients': [n for n, r in result['payout']['results'].items() if r == 'paid'],
+            'amount': result['payout']['amount'],
+        })
+
+
+def publish_completed(tid, event_type='tournament.completed'):
+    """Announce recorded results on the tournament's channel."""
+    mem = next((x for x in current_app.rating_system.tournaments if x.get('id') == tid), None)
+    publish_tournament(event_type, tid, {'status': 'Completed', 'results': mem['results'] if mem else []})
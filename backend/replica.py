@@ -0,0 +1,191 @@
+"""Read-replica routing.
+
+When DATABASE_REPLICA_URL is set, the replica is registered as a second bind
+and ``RoutingSession`` sends a request's reads to it while ``g.read_replica``
+is set. ``route_reads`` sets the flag for GET/HEAD requests, so spectators
+browsing standings don't compete with a director's writes on the primary.
+It stays on the primary when:
+
+* the view is marked ``primary_only`` (e.g. job status, polled right after a write);
+* the client wrote recently: a successful write sets a short-lived cookie
+  pinning that browser to the primary until the replica has caught up;
+* the replica is lagging by more than DB_REPLICA_MAX_LAG seconds, or the
+  last lag check failed.
+
+``ReplicaMonitor`` measures lag on a daemon thread (``SHOW REPLICA STATUS``
+on MySQL; SQLite replicas in development report no lag).
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+
+from tournament_core.models import REPLICA_BIND
+from backend.db_pool import PoolStats, engine_options
+
+DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', '5'))
+DB_REPLICA_LAG_CHECK = float(os.environ.get('DB_REPLICA_LAG_CHECK', '5'))
+# How long a client that wrote keeps reading from the primary
+DB_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', '30'))
+PIN_COOKIE = 'db_primary_until'
+
+replica_pool_stats = PoolStats()
+
+
+def replica_binds(replica_url):
+    """SQLALCHEMY_BINDS entry for the replica, or {} when none is configured."""
+    if not replica_url:
+        return {}
+    return {REPLICA_BIND: {'url': replica_url, **engine_options(replica_url, replica_pool_stats)}}
+
+
+def measure_lag(engine):
+    """Seconds the replica is behind the primary, or None if replication is stopped or unknown."""
+    if engine.dialect.name != 'mysql':
+        return 0.0
+    with engine.connect() as conn:
+        # MySQL 8.0.22+ renamed the statement and its columns; fall back for older servers
+        for statement, column in (('SHOW REPLICA STATUS', 'Seconds_Behind_Source'),
+                                  ('SHOW SLAVE STATUS', 'Seconds_Behind_Master')):
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except DBAPIError:
+                continue
+            if row is None:
+                return None  # not replicating
+            lag = row.get(column)
+            return None if lag is None else float(lag)
+    return None
+
+
+class ReplicaMonitor:
+    def __init__(self, engine, max_lag=DB_REPLICA_MAX_LAG):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.lag = None
+        self.checked_at = None
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.counts = {'replica_requests': 0, 'primary_requests': 0, 'pinned': 0, 'lagging': 0}
+
+        @event.listens_for(engine, 'handle_error')
+        def on_error(context):
+            if context.is_disconnect:
+                self.lag = None
+                self.error = str(context.original_exception)
+
+    @property
+    def healthy(self) -> bool:
+        return self.lag is not None and self.lag <= self.max_lag
+
+    def check(self):
+        was_healthy = self.healthy
+        try:
+            self.lag = measure_lag(self.engine)
+            self.error = None if self.lag is not None else 'Replication is not running'
+        except DBAPIError as e:
+            self.lag = None
+            self.error = str(e.orig)
+        self.checked_at = time.time()
+        if was_healthy != self.healthy:
+            print(f"Read replica {'in use' if self.healthy else 'bypassed'}: "
+                  f"{'lag ' + str(self.lag) + 's' if self.lag is not None else self.error}")
+        return self.lag
+
+    def start(self, interval=DB_REPLICA_LAG_CHECK):
+        self.check()
+        if interval <= 0 or self._thread is not None:
+            return self._thread
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"Replica lag check failed: {e}")
+
+        self._thread = threading.Thread(target=run, name='replica-monitor', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {'healthy': self.healthy, 'lag': self.lag, 'max_lag': self.max_lag,
+                'checked_at': self.checked_at, 'error': self.error, **self.counts,
+                'pool': replica_pool_stats.snapshot(self.engine.pool)}
+
+
+def install_replica(app, monitor):
+    """Register the routing hooks. The monitor is started by the startup warm-up."""
+    app.replica_monitor = monitor
+    app.before_request(route_reads)
+    app.after_request(pin_after_write)
+
+
+@contextmanager
+def replica_reads():
+    """Route this app context's reads to the replica, if it is usable (e.g. ``load_data`` at startup)."""
+    monitor = getattr(current_app, 'replica_monitor', None)
+    previous = g.get('read_replica', False)
+    g.read_replica = monitor is not None and monitor.healthy
+    try:
+        yield
+    finally:
+        g.read_replica = previous
+
+
+# ── View markers ─────────────────────────────────────────────────────
+
+def primary_only(view):
+    """Mark a GET view that must see the latest writes; it never reads from the replica."""
+    view.primary_only = True
+    return view
+
+
+# ── Request hooks ────────────────────────────────────────────────────
+
+def _pinned():
+    try:
+        return float(request.cookies.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def route_reads():
+    """before_request hook: send safe requests to the replica when nothing requires the primary."""
+    monitor = current_app.replica_monitor
+    g.read_replica = False
+    if request.method not in ('GET', 'HEAD') or not request.path.startswith('/api/'):
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'primary_only', False) or getattr(view, 'in_memory', False):
+        return None
+    if _pinned():
+        monitor.counts['pinned'] += 1
+    elif not monitor.healthy:
+        monitor.counts['lagging'] += 1
+    else:
+        monitor.counts['replica_requests'] += 1
+        g.read_replica = True
+        return None
+    monitor.counts['primary_requests'] += 1
+    return None
+
+
+def pin_after_write(response):
+    """after_request hook: keep a client that just wrote on the primary for a while."""
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'read_only', False):
+        return response
+    if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+        response.set_cookie(PIN_COOKIE, str(int(time.time()) + DB_REPLICA_PIN_SECONDS),
+                            max_age=DB_REPLICA_PIN_SECONDS, httponly=True, samesite='Lax')
+    return response
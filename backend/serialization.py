@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+JSON encoding and response compression for the API.
+
+FastJSONProvider replaces Flask's default provider so every jsonify() call
+goes through orjson when it is installed (falling back to the stdlib json
+module). Decimal values encode as floats and dates as ISO strings, matching
+what the endpoints used to do by hand. compress_response negotiates gzip or
+deflate for large JSON bodies.
+"""
+
+import datetime
+import decimal
+import gzip
+import json
+import os
+import zlib
+
+from flask import request
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', '1024'))
+COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', '6'))
+COMPRESSIBLE_TYPES = ('application/json',)
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return json.dumps(obj, default=_default, **kwargs)
+        return dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype='application/json')
+
+
+SUPPORTED_ENCODINGS = ('gzip', 'deflate')  # preference order when the client weighs them equally
+
+
+def _choose_encoding(accept_encodings):
+    """Best encoding the client accepts by q-value; q=0 (including ``*;q=0``) rules one out."""
+    return accept_encodings.best_match(SUPPORTED_ENCODINGS)
+
+
+def compress_response(response):
+    """after_request hook: gzip/deflate large JSON bodies for clients that accept it."""
+    if (response.status_code < 200 or response.status_code >= 300
+            or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    if encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+    else:
+        body = zlib.compress(body, COMPRESS_LEVEL)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
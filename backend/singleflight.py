@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Single-flight request coalescing for expensive read endpoints.
+
+Concurrent identical GETs in one worker wait on a single in-flight
+computation and share its serialized body and headers. A finished result is kept for a
+short grace window so the burst of refreshes that follows a write collapses
+into one computation. Every successful write bumps a generation counter, and
+the generation is part of the key, so nothing computed before a write is
+served after it.
+"""
+
+import threading
+import time
+from functools import wraps
+
+from flask import Response, current_app, g, make_response, request
+
+WAIT_TIMEOUT = 30
+MAX_RETAINED = 256
+# Not copied from the leader's response: per-connection, recomputed, or per-client
+_UNSHARED_HEADERS = frozenset((
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'te', 'trailer',
+    'transfer-encoding', 'upgrade', 'content-length', 'set-cookie',
+))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+class SingleFlight:
+    def __init__(self, grace=1.0):
+        self.grace = grace
+        self._calls = {}  # key -> _Call
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'computed': 0, 'collapsed': 0, 'grace_hits': 0, 'invalidations': 0}
+
+    def invalidate(self):
+        """Called after a successful write; results from earlier generations are never reused."""
+        with self._lock:
+            self._generation += 1
+            self._calls.clear()
+            self.counts['invalidations'] += 1
+
+    def do(self, key, fn):
+        """Run ``fn`` once per key among concurrent callers and return its result to all of them."""
+        now = time.monotonic()
+        with self._lock:
+            self.counts['requests'] += 1
+            key = (self._generation, key)
+            call = self._calls.get(key)
+            if call is not None and call.finished_at is not None and now - call.finished_at > self.grace:
+                del self._calls[key]
+                call = None
+            if call is None:
+                if len(self._calls) >= MAX_RETAINED:
+                    self._prune(now)
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+                self.counts['grace_hits' if call.finished_at is not None else 'collapsed'] += 1
+
+        if not leader:
+            if call.done.wait(WAIT_TIMEOUT):
+                if call.error is not None:
+                    raise call.error
+                return call.result
+            return fn()
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._calls.pop(key, None)
+            raise
+        finally:
+            with self._lock:
+                self.counts['computed'] += 1
+                call.finished_at = time.monotonic()
+            call.done.set()
+        return call.result
+
+    def _prune(self, now):
+        for key in [k for k, c in self._calls.items()
+                    if c.finished_at is not None and now - c.finished_at > self.grace]:
+            del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+            counts['in_flight'] = sum(1 for c in self._calls.values() if c.finished_at is None)
+            counts['generation'] = self._generation
+        return counts
+
+
+def coalesce(view):
+    """Decorate a GET view so concurrent identical requests share one response body."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        flight = getattr(current_app, 'single_flight', None)
+        if flight is None or request.method != 'GET':
+            return view(*args, **kwargs)
+
+        def compute():
+            resp = make_response(view(*args, **kwargs))
+            headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in _UNSHARED_HEADERS]
+            return resp.get_data(), resp.status_code, headers
+
+        # Replica reads may lag, so they are never shared with clients pinned to the primary
+        key = (request.endpoint, tuple(sorted(kwargs.items())), request.query_string, g.get('read_replica', False))
+        body, status, headers = flight.do(key, compute)
+        return Response(body, status=status, headers=headers)
+    return wrapper
+
+
+def read_only(view):
+    """Mark a non-GET view that never writes (e.g. POST /api/batch) so it doesn't invalidate."""
+    view.read_only = True
+    return view
+
+
+def invalidate_on_write(response):
+    """after_request hook: bump the generation after any successful write."""
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'read_only', False):
+        return response
+    if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+        flight = getattr(current_app, 'single_flight', None)
+        if flight is not None:
+            flight.invalidate()
+    return response
@@ -0,0 +1,115 @@
+"""Startup phases, timing and the warm-up gate.
+
+``create_app`` returns as soon as the app is configured; the phases that
+talk to the database (schema check, loading ratings, admin bootstrap, job
+recovery, pool warm-up) run on a background thread so the health check
+answers at once and a scale-out instance is registered quickly. API requests
+that arrive before warm-up finishes wait for it, up to STARTUP_WAIT seconds,
+and then get 503 with Retry-After.
+
+Each phase is timed; the breakdown is printed once the app is ready and
+reported under ``startup`` in /api/stats.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, jsonify, request
+
+STARTUP_WAIT = float(os.environ.get('STARTUP_WAIT', '20'))
+# Seconds between warm-up attempts when the database is unreachable at boot
+STARTUP_RETRY = float(os.environ.get('STARTUP_RETRY', '5'))
+
+
+class StartupReport:
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases = []
+        self.serving_after = None
+        self.ready_after = None
+        self.attempts = 0
+        self.error = None
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def serving(self):
+        """The app object is built and can take requests (warm-up may still be running)."""
+        self.serving_after = time.perf_counter() - self.started
+
+    def mark_ready(self):
+        self.ready_after = time.perf_counter() - self.started
+        self.error = None
+        self._ready.set()
+        print(f"Started in {self.ready_after:.2f}s (serving after {self.serving_after or 0:.2f}s): "
+              + ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.phases))
+
+    def wait(self, timeout=None) -> bool:
+        return self._ready.wait(timeout)
+
+    def summary(self):
+        return {
+            'ready': self.ready,
+            'serving_after': round(self.serving_after, 3) if self.serving_after is not None else None,
+            'ready_after': round(self.ready_after, 3) if self.ready_after is not None else None,
+            'phases': {name: round(seconds, 3) for name, seconds in self.phases},
+            'attempts': self.attempts,
+            'error': self.error,
+        }
+
+
+def run_warmup(app, warm_up, background=True):
+    """Run ``warm_up(app)`` (retrying while it fails), then mark the app ready."""
+    report = app.startup
+    first_phase = len(report.phases)
+
+    def attempt():
+        del report.phases[first_phase:]  # keep only the timings of the attempt that succeeds
+        report.attempts += 1
+        try:
+            with app.app_context():
+                warm_up(app)
+        except Exception as e:
+            report.error = str(e)
+            print(f"Startup warm-up failed (attempt {report.attempts}): {e}")
+            return False
+        report.mark_ready()
+        return True
+
+    if not background:
+        if not attempt():
+            raise RuntimeError(f'Startup warm-up failed: {report.error}')
+        return None
+
+    def run():
+        while not attempt():
+            time.sleep(STARTUP_RETRY)
+
+    thread = threading.Thread(target=run, name='startup-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def wait_for_startup():
+    """before_request hook: hold API requests until warm-up has finished."""
+    report = current_app.startup
+    if report.ready or not request.path.startswith('/api/'):
+        return None
+    if report.wait(STARTUP_WAIT):
+        return None
+    response = jsonify({'error': 'Server is starting up'})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(int(STARTUP_RETRY))
+    return response
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the large list endpoints.
+
+Seeds a throwaway SQLite database with a season's worth of players,
+tournaments, history and ace pot ledger rows, then measures response bytes
+(identity vs gzip) and CPU time per request for each endpoint, once with
+orjson and once with the stdlib json fallback.
+
+    python benchmarks/bench_serialization.py --players 300 --tournaments 150
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ENDPOINTS = ['/api/tournaments', '/api/players', '/api/ace-pot/ledger?limit=500']
+
+
+def build_app(n_players, n_tournaments, teams_per_event):
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ.setdefault('SESSION_SWEEP_INTERVAL', '0')
+    os.environ['SINGLE_FLIGHT_GRACE'] = '0'  # measure every request, not grace-window reuse
+    from backend.app import create_app
+    app = create_app(background=False)
+    from tournament_core.models import db, Player, Tournament, Team, PlayerHistory, AcePotTracker
+
+    rng = random.Random(7)
+    with app.app_context():
+        players = [Player(name=f'Player {i:04d}', rating=round(rng.uniform(850, 1250), 2))
+                   for i in range(n_players)]
+        db.session.add_all(players)
+        db.session.flush()
+
+        start = datetime.date(2026, 1, 1)
+        balance = 0.0
+        for t_index in range(n_tournaments):
+            date = start + datetime.timedelta(days=t_index)
+            t = Tournament(date=date, course='Bench Park', team_count=teams_per_event, status='Completed')
+            db.session.add(t)
+            db.session.flush()
+            field = rng.sample(players, teams_per_event * 2)
+            for pos in range(teams_per_event):
+                p1, p2 = field[2 * pos], field[2 * pos + 1]
+                db.session.add(Team(tournament_id=t.tournament_id, player1_id=p1.player_id,
+                                    player2_id=p2.player_id, position=pos + 1,
+                                    expected_position=round(rng.uniform(1, teams_per_event), 2),
+                                    score=50 + pos, team_rating=float(p1.rating + p2.rating) / 2,
+                                    payout=0))
+                for p in (p1, p2):
+                    db.session.add(PlayerHistory(player_id=p.player_id, tournament_id=t.tournament_id,
+                                                 old_rating=p.rating, new_rating=p.rating + 1,
+                                                 position=pos + 1, expected_position=pos + 1,
+                                                 score=50 + pos))
+            for p in field[:6]:
+                balance += 1
+                db.session.add(AcePotTracker(date=date, description='Ace pot buy-in', amount=1,
+                                             balance=balance, tournament_id=t.tournament_id,
+                                             player_id=p.player_id))
+        db.session.commit()
+        app.rating_system.load_data()
+    return app
+
+
+def measure(app, path, iterations):
+    client = app.test_client()
+    raw = client.get(path)
+    gz = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert raw.status_code == 200, (path, raw.status_code)
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(iterations):
+        client.get(path, headers={'Accept-Encoding': 'gzip'})
+    return {
+        'bytes': len(raw.get_data()),
+        'gzip_bytes': len(gz.get_data()),
+        'cpu_ms': round((time.process_time() - cpu) / iterations * 1000, 2),
+        'wall_ms': round((time.perf_counter() - wall) / iterations * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON bytes and CPU on list endpoints')
+    parser.add_argument('--players', type=int, default=300)
+    parser.add_argument('--tournaments', type=int, default=150)
+    parser.add_argument('--teams', type=int, default=12)
+    parser.add_argument('--iterations', type=int, default=30)
+    args = parser.parse_args()
+
+    app = build_app(args.players, args.tournaments, args.teams)
+    from backend import serialization
+
+    encoders = [('orjson', serialization.orjson), ('json', None)] if serialization.orjson else [('json', None)]
+    for label, module in encoders:
+        serialization.orjson = module
+        print(f"encoder={label}")
+        for path in ENDPOINTS:
+            print(f"  {path}: {measure(app, path, args.iterations)}")
+
+
+if __name__ == '__main__':
+    main()
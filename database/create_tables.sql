@@ -88,6 +88,18 @@ CREATE TABLE ace_pot_config (
 
 INSERT INTO ace_pot_config (id, cap_amount) VALUES (1, 100.00);
 
+-- Materialized running total of ace_pot_tracker; locked FOR UPDATE on every ledger insert
+CREATE TABLE ace_pot_balance (
+    id INT PRIMARY KEY DEFAULT 1,
+    balance DECIMAL(10,2) NOT NULL DEFAULT 0.00,
+    last_entry_id INT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT single_balance_row CHECK (id = 1)
+);
+
+INSERT INTO ace_pot_balance (id, balance, last_entry_id)
+SELECT 1, COALESCE(SUM(amount), 0), MAX(entry_id) FROM ace_pot_tracker;
+
 -- Seasons table for archiving (same pattern as dgputt)
 CREATE TABLE seasons (
     season_id INT AUTO_INCREMENT PRIMARY KEY,
@@ -106,3 +118,79 @@ CREATE INDEX idx_player_history_player ON player_history(player_id);
 CREATE INDEX idx_player_history_tournament ON player_history(tournament_id);
 CREATE INDEX idx_team_tournament ON teams(tournament_id);
 CREATE INDEX idx_tournament_season ON tournaments(season_id);
+CREATE INDEX ix_ace_pot_tracker_date ON ace_pot_tracker(date);
+CREATE INDEX ix_ace_pot_tracker_tournament_id ON ace_pot_tracker(tournament_id);
+CREATE INDEX ix_ace_pot_tracker_player_id ON ace_pot_tracker(player_id);
+
+-- Director/admin accounts and their login sessions
+CREATE TABLE users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(100) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    salt VARCHAR(255) NOT NULL,
+    role VARCHAR(50) DEFAULT 'director',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP NULL,
+    is_active BOOLEAN DEFAULT TRUE
+);
+
+CREATE TABLE user_sessions (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    session_token VARCHAR(255) NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    ip_address VARCHAR(50) NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- Session validation and the expired-session sweeper
+CREATE INDEX idx_session_token_active ON user_sessions(session_token, is_active);
+CREATE INDEX idx_session_expires ON user_sessions(expires_at);
+
+-- Live hole-by-hole scoring; kept apart from the rating tables until the round is closed.
+-- No foreign keys: closing a round re-points rows at the recorded tournament.
+CREATE TABLE live_rounds (
+    tournament_id INT PRIMARY KEY,
+    pars VARCHAR(255) NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    closed_at TIMESTAMP NULL
+);
+
+CREATE TABLE live_cards (
+    card_id INT AUTO_INCREMENT PRIMARY KEY,
+    tournament_id INT NOT NULL,
+    card_number INT NOT NULL,
+    player1_name VARCHAR(100) NOT NULL,
+    player2_name VARCHAR(100) NOT NULL,
+    UNIQUE KEY uq_live_card (tournament_id, card_number)
+);
+
+CREATE TABLE live_scores (
+    score_id INT AUTO_INCREMENT PRIMARY KEY,
+    tournament_id INT NOT NULL,
+    card_number INT NOT NULL,
+    hole INT NOT NULL,
+    strokes INT NOT NULL,
+    submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_live_scores_tournament ON live_scores(tournament_id, score_id);
+
+-- Asynchronous result recording; idempotency_key makes a resubmitted request reuse its job
+CREATE TABLE recording_jobs (
+    job_id INT AUTO_INCREMENT PRIMARY KEY,
+    idempotency_key VARCHAR(100) NOT NULL UNIQUE,
+    tournament_id INT NOT NULL,
+    status ENUM('Queued', 'Running', 'Succeeded', 'Failed') NOT NULL DEFAULT 'Queued',
+    payload TEXT NOT NULL,
+    result TEXT NULL,
+    error VARCHAR(500) NULL,
+    attempts INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
+
+CREATE INDEX ix_recording_jobs_tournament_id ON recording_jobs(tournament_id);
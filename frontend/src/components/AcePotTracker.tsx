@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
-import { API_BASE_URL } from '../config/api';
-import { AcePotBalance, AcePotConfig, AcePotEntry } from '../types';
+import { API_BASE_URL, batchGet } from '../config/api';
+import { AcePotBalance, AcePotConfig, AcePotEntry, AcePotLedgerPage } from '../types';
 
 interface AcePotTrackerProps {
   userRole: string;
@@ -10,6 +10,7 @@ const AcePotTracker: React.FC<AcePotTrackerProps> = ({ userRole }) => {
   const [balance, setBalance] = useState<AcePotBalance | null>(null);
   const [config, setConfig] = useState<AcePotConfig | null>(null);
   const [ledger, setLedger] = useState<AcePotEntry[]>([]);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
   const [loading, setLoading] = useState(true);
   const [newCap, setNewCap] = useState('');
   const [newBalance, setNewBalance] = useState('');
@@ -20,21 +21,34 @@ const AcePotTracker: React.FC<AcePotTrackerProps> = ({ userRole }) => {
 
   const fetchData = async () => {
     try {
-      const [balRes, cfgRes, ledRes] = await Promise.all([
-        fetch(`${API_BASE_URL}/api/ace-pot/balance`, { credentials: 'include' }),
-        fetch(`${API_BASE_URL}/api/ace-pot/config`, { credentials: 'include' }),
-        fetch(`${API_BASE_URL}/api/ace-pot/ledger`, { credentials: 'include' }),
+      const [balRes, cfgRes, ledRes] = await batchGet([
+        '/api/ace-pot/balance',
+        '/api/ace-pot/config',
+        '/api/ace-pot/ledger',
       ]);
-      if (balRes.ok) setBalance(await balRes.json());
-      if (cfgRes.ok) {
-        const c = await cfgRes.json();
-        setConfig(c);
-        setNewCap(c.cap_amount.toString());
+      if (balRes.status === 200) setBalance(balRes.body);
+      if (cfgRes.status === 200) {
+        setConfig(cfgRes.body);
+        setNewCap(cfgRes.body.cap_amount.toString());
+      }
+      if (ledRes.status === 200) {
+        const page: AcePotLedgerPage = ledRes.body;
+        setLedger(page.entries);
+        setNextCursor(page.next_cursor);
       }
-      if (ledRes.ok) setLedger(await ledRes.json());
     } catch {} finally { setLoading(false); }
   };
 
+  const loadMore = async () => {
+    if (nextCursor === null) return;
+    const res = await fetch(`${API_BASE_URL}/api/ace-pot/ledger?before=${nextCursor}`, { credentials: 'include' });
+    if (res.ok) {
+      const page: AcePotLedgerPage = await res.json();
+      setLedger(prev => [...prev, ...page.entries]);
+      setNextCursor(page.next_cursor);
+    }
+  };
+
   useEffect(() => { fetchData(); }, []);
 
   const updateCap = async (e: React.FormEvent) => {
@@ -138,6 +152,9 @@ const AcePotTracker: React.FC<AcePotTrackerProps> = ({ userRole }) => {
               ))}
             </tbody>
           </table>
+          {nextCursor !== null && (
+            <button type="button" className="action-button" onClick={loadMore}>Load more</button>
+          )}
         </>
       )}
     </div>
@@ -4,6 +4,9 @@ import { API_BASE_URL } from '../config/api';
 interface PlayerDetailData {
   name: string;
   rating: number;
+  rank: number;
+  percentile: number;
+  ranked_players: number;
   tournaments_played: number;
   seasonal_cash: number;
   lifetime_cash: number;
@@ -66,7 +69,7 @@ const PlayerDetails: React.FC<PlayerDetailsProps> = ({ playerName, onBack }) =>
         url = `${API_BASE_URL}/api/tournaments/${tournamentId}`;
       } else {
         // For current season entries without tournament_id, find by date
-        const listRes = await fetch(`${API_BASE_URL}/api/tournaments`, { credentials: 'include' });
+        const listRes = await fetch(`${API_BASE_URL}/api/tournaments?fields=tournament_id,date`, { credentials: 'include' });
         if (!listRes.ok) return;
         const tournaments = await listRes.json();
         const match = tournaments.find((t: any) => t.date === date);
@@ -93,6 +96,7 @@ const PlayerDetails: React.FC<PlayerDetailsProps> = ({ playerName, onBack }) =>
         <h2>{player.name}</h2>
         <div className="player-stats">
           <span className="stat">Rating: <strong>{Math.round(player.rating)}</strong></span>
+          <span className="stat">Rank: <strong>{player.rank} of {player.ranked_players}</strong></span>
           <span className="stat">Tournaments: <strong>{player.tournaments_played}</strong></span>
           {avgPlace && <span className="stat">Avg Place: <strong>{avgPlace}</strong></span>}
           <span className="stat">Season $: <strong>${player.seasonal_cash.toFixed(2)}</strong></span>
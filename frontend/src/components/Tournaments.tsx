@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { API_BASE_URL } from '../config/api';
+import { API_BASE_URL, batchGet, waitForJob } from '../config/api';
 import { Player } from '../types';
 
 interface TournamentSummary {
@@ -45,6 +45,7 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
   const [availablePlayers, setAvailablePlayers] = useState<Player[]>([]);
   const [selectedPlayers, setSelectedPlayers] = useState<{ name: string; rating: number; ace_pot: boolean }[]>([]);
   const [searchTerm, setSearchTerm] = useState('');
+  const [searchResults, setSearchResults] = useState<Player[] | null>(null);
   const [showNewPlayer, setShowNewPlayer] = useState(false);
   const [newPlayer, setNewPlayer] = useState({ name: '', rating: '1000' });
 
@@ -58,11 +59,12 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
   // Tie resolution
   const [tieModal, setTieModal] = useState<{
     tournament_id: number; pot: number; first_payout: number; second_payout: number; third_payout: number;
-    tied_teams: { player1: string; player2: string; position: number; score: number }[];
+    tied_teams: { player1: string; player2: string; position: number; score: number; suggested_payout?: number }[];
     manual_payouts: { player1: string; player2: string; payout: string }[];
   } | null>(null);
 
   const [error, setError] = useState('');
+  const [info, setInfo] = useState('');
   const [submitting, setSubmitting] = useState(false);
 
   const canEdit = userRole === 'admin' || userRole === 'director';
@@ -76,6 +78,17 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
 
   useEffect(() => { fetchTournaments(); }, []);
 
+  useEffect(() => {
+    const q = searchTerm.trim();
+    if (!q) { setSearchResults(null); return; }
+    let cancelled = false;
+    fetch(`${API_BASE_URL}/api/players/search?q=${encodeURIComponent(q)}&limit=25`, { credentials: 'include' })
+      .then(res => res.ok ? res.json() : null)
+      .then(data => { if (!cancelled && data) setSearchResults(data.results); })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [searchTerm]);
+
   const visibleTournaments = canEdit
     ? tournaments
     : tournaments.filter(t => t.status !== 'Pending');
@@ -243,17 +256,16 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
   const editPending = async (tid: number) => {
     setError('');
     try {
-      const res = await fetch(`${API_BASE_URL}/api/tournaments/${tid}`, { credentials: 'include' });
-      if (res.ok) {
-        const data: TournamentDetail = await res.json();
+      // Tournament and roster in one round trip
+      const [res, pRes] = await batchGet([`/api/tournaments/${tid}`, '/api/players']);
+      if (res.status === 200) {
+        const data: TournamentDetail = res.body;
         setPendingId(tid);
         pendingIdRef.current = tid;
         setCourse(data.course);
         setDate(data.date);
         setSelectedPlayers(data.participants.map(p => ({ name: p.name, rating: p.rating, ace_pot: p.ace_pot_buy_in })));
-        // Fetch all players
-        const pRes = await fetch(`${API_BASE_URL}/api/players`, { credentials: 'include' });
-        if (pRes.ok) setAvailablePlayers(await pRes.json());
+        if (pRes.status === 200) setAvailablePlayers(pRes.body);
         setGeneratedTeams(null);
         setView('create');
       }
@@ -286,6 +298,7 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
     }
 
     if (!detail) return;
+    setInfo('');
     const incomplete = teamScores.filter(t => !t.score);
     if (incomplete.length > 0) { setError('All teams must have a score'); return; }
 
@@ -299,6 +312,11 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
         body: JSON.stringify({
           team_results: sorted.map(t => ({ player1: t.player1, player2: t.player2, score: parseInt(t.score) })),
           payout_config: loadPayoutConfig(),
+          // Applied in the same transaction as the results, including when the server journals them
+          ace_pot: {
+            buy_in_players: detail.participants.filter(p => p.ace_pot_buy_in).map(p => p.name),
+            payout_recipients: acePotPaid ? Array.from(acePotRecipients) : [],
+          },
         })
       });
 
@@ -308,7 +326,19 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
         return;
       }
 
-      const result = await res.json();
+      // Recording runs in the background; resubmitting returns the same job
+      const queued = await res.json();
+      if (queued.status === 'Journaled') {
+        // Server couldn't reach the database; it saved the results and will record them itself
+        setInfo(`${queued.message}, along with the ace pot buy-ins and payout.`);
+        return;
+      }
+      const job = await waitForJob(queued.job_id);
+      if (job.status === 'Failed') {
+        setError(job.error || 'Failed to record');
+        return;
+      }
+      const result = job.result;
 
       // Handle tie — show modal for manual payout entry
       if (result.needs_manual_payout) {
@@ -319,13 +349,12 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
           second_payout: result.second_payout,
           third_payout: result.third_payout,
           tied_teams: result.tied_teams,
-          manual_payouts: result.tied_teams.map((t: any) => ({ player1: t.player1, player2: t.player2, payout: '' })),
+          manual_payouts: result.tied_teams.map((t: any) => ({ player1: t.player1, player2: t.player2, payout: t.suggested_payout?.toString() ?? '' })),
         });
         setSubmitting(false);
         return;
       }
 
-      await processAcePot(result.tournament_id);
       finishRecord(result.tournament_id);
     } catch { setError('Network error'); }
     finally { setSubmitting(false); }
@@ -358,7 +387,6 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
         setError(data.error || 'Failed to apply payouts');
         return;
       }
-      await processAcePot(tieModal.tournament_id);
       const tid = tieModal.tournament_id;
       setTieModal(null);
       finishRecord(tid);
@@ -366,23 +394,6 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
     finally { setSubmitting(false); }
   };
 
-  const processAcePot = async (tournamentId: number) => {
-    if (!detail) return;
-    const buyIns = detail.participants.filter(p => p.ace_pot_buy_in).map(p => p.name);
-    if (buyIns.length > 0 || (acePotPaid && acePotRecipients.size > 0)) {
-      await fetch(`${API_BASE_URL}/api/ace-pot/tournament`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        credentials: 'include',
-        body: JSON.stringify({
-          tournament_id: tournamentId,
-          buy_in_players: buyIns,
-          payout_recipients: acePotPaid ? Array.from(acePotRecipients) : []
-        })
-      }).catch(() => {});
-    }
-  };
-
   const finishRecord = (newTid?: number) => {
     const tid = newTid || detail?.tournament_id;
     setGeneratedTeams(null);
@@ -405,13 +416,16 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
   const backToList = () => {
     setView('list');
     setDetail(null);
+    setInfo('');
     setGeneratedTeams(null);
     fetchTournaments();
   };
 
-  const filteredPlayers = availablePlayers
-    .filter(p => !selectedPlayers.find(s => s.name === p.name) && p.name.toLowerCase().includes(searchTerm.toLowerCase()))
-    .sort((a, b) => a.name.localeCompare(b.name));
+  // Server-ranked matches while typing, otherwise the full roster by name
+  const notSelected = (p: Player) => !selectedPlayers.find(s => s.name === p.name);
+  const filteredPlayers = searchResults
+    ? searchResults.filter(notSelected)
+    : availablePlayers.filter(notSelected).sort((a, b) => a.name.localeCompare(b.name));
 
   const acePotCount = selectedPlayers.filter(p => p.ace_pot).length;
 
@@ -570,6 +584,7 @@ const Tournaments: React.FC<TournamentsProps> = ({ userRole }) => {
           <span className={`status-badge status-${detail.status.toLowerCase().replace(' ', '-')}`}>{detail.status}</span>
         </div>
         {error && <div className="error-message" role="alert">{error}</div>}
+        {info && <div className="success-message" role="status">{info}</div>}
 
         {/* In Progress: show generated teams with score entry for admins */}
         {detail.status === 'In Progress' && generatedTeams && (
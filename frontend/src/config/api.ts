@@ -1,3 +1,43 @@
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:5000';
 
-export { API_BASE_URL };
+export interface BatchResponse {
+  id: string | number;
+  path: string;
+  status: number;
+  body: any;
+}
+
+// Several GETs in one round trip; results come back in request order
+const batchGet = async (paths: string[]): Promise<BatchResponse[]> => {
+  const res = await fetch(`${API_BASE_URL}/api/batch`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    credentials: 'include',
+    body: JSON.stringify({ requests: paths })
+  });
+  if (!res.ok) throw new Error(`Batch request failed: ${res.status}`);
+  return (await res.json()).responses;
+};
+
+export interface RecordingJob {
+  job_id: number;
+  tournament_id: number;
+  status: 'Queued' | 'Running' | 'Succeeded' | 'Failed';
+  result: any;
+  error: string | null;
+}
+
+// Poll a background recording job until it succeeds or fails
+const waitForJob = async (jobId: number, intervalMs = 500, timeoutMs = 60000): Promise<RecordingJob> => {
+  const deadline = Date.now() + timeoutMs;
+  for (;;) {
+    const res = await fetch(`${API_BASE_URL}/api/jobs/${jobId}`, { credentials: 'include' });
+    if (!res.ok) throw new Error(`Job lookup failed: ${res.status}`);
+    const job: RecordingJob = await res.json();
+    if (job.status === 'Succeeded' || job.status === 'Failed') return job;
+    if (Date.now() > deadline) throw new Error('Timed out waiting for job');
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+};
+
+export { API_BASE_URL, batchGet, waitForJob };
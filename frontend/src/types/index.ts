@@ -63,6 +63,11 @@ export interface AcePotEntry {
   player_name?: string;
 }
 
+export interface AcePotLedgerPage {
+  entries: AcePotEntry[];
+  next_cursor: number | null;
+}
+
 export interface User {
   user_id: number;
   username: string;
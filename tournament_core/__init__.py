@@ -5,8 +5,30 @@ A rating system for doubles disc golf leagues that tracks individual player cont
 and predicts team performance in tournament-style play.
 """
 
-from .tournament_ratings import TournamentRatingSystem
-from .tournament_db_manager import TournamentDBManager
-from .models import db
+import importlib
 
 __version__ = '1.0.0'
+
+# Exports are imported on first use, so standalone users (the CLI with an
+# SQLStore) never import Flask through TournamentDBManager or the models.
+_EXPORTS = {
+    'TournamentRatingSystem': '.tournament_ratings',
+    'TournamentDBManager': '.tournament_db_manager',
+    'SQLStore': '.sql_store',
+    'BulkImporter': '.bulk_import',
+    'BulkImportError': '.bulk_import',
+    'read_roster': '.roster_import',
+    'PlayerSearchIndex': '.player_search',
+    'PlayerNotFoundError': '.player_search',
+    'db': '.models',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -6,9 +6,12 @@ This module provides functionality for managing the ace pot tracker.
 """
 
 import datetime
+from decimal import Decimal, ROUND_DOWN
 from typing import Dict, List, Any
 from .tournament_db_manager import TournamentDBManager
-from .models import Tournament
+from .models import db, Tournament
+
+CENT = Decimal('0.01')
 
 
 class AcePotManager:
@@ -25,8 +28,24 @@ class AcePotManager:
     def update_config(self, cap_amount: float) -> bool:
         return self.db_manager.update_ace_pot_config(cap_amount)
 
-    def get_ledger(self) -> List[Dict[str, Any]]:
-        return self.db_manager.get_ace_pot_ledger()
+    def get_ledger(self, **filters) -> List[Dict[str, Any]]:
+        return self.db_manager.get_ace_pot_ledger(**filters)
+
+    def get_ledger_page(self, limit: int = 50, before_id: int = None,
+                        summary: bool = False, **filters) -> Dict[str, Any]:
+        """One keyset page of the ledger (or per-tournament summary) plus the next cursor."""
+        if summary:
+            rows = self.db_manager.get_ace_pot_ledger_summary(limit=limit + 1, before_id=before_id, **filters)
+            cursor_key = 'last_entry_id'
+        else:
+            rows = self.db_manager.get_ace_pot_ledger(limit=limit + 1, before_id=before_id, **filters)
+            cursor_key = 'id'
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'entries': rows,
+            'next_cursor': rows[-1][cursor_key] if has_more and rows else None,
+        }
 
     def add_entry(self, description: str, amount: float, date: str = None,
                   tournament_id: int = None, player_name: str = None) -> int:
@@ -34,7 +53,9 @@ class AcePotManager:
             date = datetime.datetime.now().strftime("%Y-%m-%d")
         player_id = None
         if player_name:
-            player_id = self.db_manager._get_player_id_safe(player_name)
+            player_id = self.db_manager.resolve_player_ids([player_name])[player_name]
+            if player_id == -1:
+                player_id = None  # the ghost has no player row
         return self.db_manager.add_ace_pot_entry(
             date=date, description=description, amount=amount,
             tournament_id=tournament_id, player_id=player_id,
@@ -45,6 +66,13 @@ class AcePotManager:
             description = "Manual balance adjustment"
         return self.db_manager.set_ace_pot_balance(amount, description=description)
 
+    def verify_balance(self, repair: bool = False) -> Dict[str, Any]:
+        result = self.db_manager.verify_ace_pot_balance(repair=repair)
+        if not result['ok']:
+            print(f"Ace pot balance drift detected: materialized={result['materialized']} "
+                  f"ledger_sum={result['ledger_sum']} drift={result['drift']}")
+        return result
+
     def process_payout(self, tournament_id: int, player_name: str) -> bool:
         return self.db_manager.process_ace_pot_payout(tournament_id, player_name)
 
@@ -54,33 +82,103 @@ class AcePotManager:
         )
         return pid is not None
 
-    def process_batch_buy_ins(self, tournament_id: int, player_names: List[str]) -> Dict[str, Any]:
+    def process_batch_buy_ins(self, tournament_id: int, player_names: List[str],
+                              commit: bool = True) -> Dict[str, Any]:
+        """Buy in many players at once.
+
+        Names are resolved with one query, participants are upserted with one
+        multi-row statement and a single ledger entry covers every resolved
+        player. Returns per-name outcomes: added, updated or not_found.
+        """
         if not player_names:
-            return {'success': 0, 'failure': 0, 'amount': 0.0}
+            return {'success': 0, 'failure': 0, 'amount': 0.0, 'results': {}}
 
-        t = Tournament.query.get(tournament_id)
-        tournament_date = t.date.isoformat() if t and hasattr(t.date, 'isoformat') else datetime.datetime.now().strftime("%Y-%m-%d")
+        tournament_date = self._tournament_date(tournament_id)
+        ids = self.db_manager.resolve_player_ids(player_names)
+        resolved = {name: pid for name, pid in ids.items() if pid is not None and pid != -1}
 
-        amount = len(player_names) * 1.0
-        entry_id = self.add_entry(
-            description=f"Ace pot buy-ins: {len(player_names)} players",
-            amount=amount, date=tournament_date, tournament_id=tournament_id,
+        upserted = self.db_manager.bulk_upsert_tournament_participants(
+            tournament_id, list(resolved.values()), ace_pot_buy_in=True,
         )
+        results = {
+            name: upserted[resolved[name]] if name in resolved else 'not_found'
+            for name in player_names
+        }
+
+        paid_ids = set(resolved.values())
+        amount = len(paid_ids) * 1.0
+        entry_id = None
+        if paid_ids:
+            entry = self.db_manager.append_ace_pot_entry(
+                date=tournament_date,
+                description=f"Ace pot buy-ins: {len(paid_ids)} players",
+                amount=amount, tournament_id=tournament_id,
+            )
+            entry_id = entry.entry_id
+        if commit:
+            db.session.commit()
+
+        failure_count = sum(1 for r in results.values() if r == 'not_found')
+        return {
+            'success': len(results) - failure_count, 'failure': failure_count,
+            'amount': amount, 'entry_id': entry_id, 'results': results,
+        }
+
+    def process_batch_payout(self, tournament_id: int, recipients: List[str],
+                             commit: bool = True) -> Dict[str, Any]:
+        """Pay the current pot out evenly to several recipients.
+
+        Posts one ledger entry and credits every recipient's seasonal_cash in
+        the same transaction. Shares are rounded down to the cent and the
+        ledger records their sum, so it always matches the credits; any
+        leftover cents stay in the pot. Returns per-name outcomes: paid or not_found.
+        """
+        ids = self.db_manager.resolve_player_ids(recipients)
+        paid = {name: pid for name, pid in ids.items() if pid is not None and pid != -1}
+        results = {name: 'paid' if name in paid else 'not_found' for name in recipients}
+        if not paid:
+            return {'amount': 0.0, 'per_person': 0.0, 'entry_id': None, 'results': results}
+
+        row = self.db_manager.lock_ace_pot_balance()
+        cap = self.get_config()['cap_amount']
+        available = Decimal(str(max(0.0, min(float(row.balance), cap))))
+        share = (available / len(paid)).quantize(CENT, rounding=ROUND_DOWN)
+        per_person = float(share)
+        total_payout = float(share * len(paid))
+
+        names = ', '.join(paid)
+        entry = self.db_manager.append_ace_pot_entry(
+            date=self._tournament_date(tournament_id),
+            description=f"Ace pot payout to {names}",
+            amount=-total_payout, tournament_id=tournament_id, balance_row=row,
+        )
+        self.db_manager.credit_seasonal_cash({pid: per_person for pid in paid.values()})
 
-        success_count = 0
-        failure_count = 0
-        for name in player_names:
-            try:
-                pid = self.db_manager.add_tournament_participant(
-                    tournament_id=tournament_id, player_name=name,
-                    ace_pot_buy_in=True, skip_ace_pot_entry=True,
-                )
-                if pid is not None:
-                    success_count += 1
-                else:
-                    failure_count += 1
-            except Exception as e:
-                print(f"Error adding participant {name}: {e}")
-                failure_count += 1
-
-        return {'success': success_count, 'failure': failure_count, 'amount': amount, 'entry_id': entry_id}
+        t = Tournament.query.get(tournament_id)
+        if t:
+            t.ace_pot_paid = True
+            t.ace_pot_paid_to = names
+        if commit:
+            db.session.commit()
+        return {'amount': total_payout, 'per_person': per_person, 'entry_id': entry.entry_id, 'results': results}
+
+    def process_tournament(self, tournament_id: int, buy_in_players: List[str],
+                           payout_recipients: List[str]) -> Dict[str, Any]:
+        """Post a tournament's buy-ins and optional payout in one transaction."""
+        result = {}
+        try:
+            if buy_in_players:
+                result['buy_ins'] = self.process_batch_buy_ins(tournament_id, buy_in_players, commit=False)
+            if payout_recipients:
+                result['payout'] = self.process_batch_payout(tournament_id, payout_recipients, commit=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return result
+
+    def _tournament_date(self, tournament_id: int) -> str:
+        t = Tournament.query.get(tournament_id)
+        if t and hasattr(t.date, 'isoformat'):
+            return t.date.isoformat()
+        return datetime.datetime.now().strftime("%Y-%m-%d")
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Bulk Import
+
+Backfills historical tournaments into a rating system from either a
+directory of results files or a single JSON-lines file.
+
+Results files (``*.csv`` / ``*.txt``) hold one team per line as
+``Player1,Player2,Score`` (an empty partner or "Ghost Player" plays with the
+ghost). The date and course come from ``# date: YYYY-MM-DD`` and
+``# course: Name`` lines, or else from a ``YYYY-MM-DD_Course_Name.csv`` file
+name. Each JSONL line is one event::
+
+    {"date": "2024-05-04", "course": "Oak Grove", "teams": [["Ann", "Bo", 52], ...]}
+
+where a team may also be ``{"player1": ..., "player2": ..., "score": ...}``.
+
+Files are read line by line. Every name is resolved against the in-memory
+player index in one pass before anything is written, and problems are
+reported as ``file:line: message``. Events are then sorted by date, so ratings
+replay in the order the rounds were played, and recorded in batches (one
+transaction and one published state per batch).
+"""
+
+import csv
+import datetime
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+GHOST = "Ghost Player"
+RESULT_SUFFIXES = ('.csv', '.txt')
+DEFAULT_BATCH_SIZE = 50
+_FILENAME = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:[_ ]+(.+))?$')
+_DIRECTIVE = re.compile(r'^#\s*(date|course)\s*:\s*(.*)$', re.IGNORECASE)
+
+
+class BulkImportError(ValueError):
+    """Raised with every problem found; ``errors`` holds (location, message) pairs."""
+
+    def __init__(self, errors: List[Tuple[str, str]], imported: int = 0):
+        self.errors = errors
+        self.imported = imported
+        super().__init__(f"{len(errors)} problem(s) found; first: {errors[0][0]}: {errors[0][1]}"
+                         if errors else "Import failed")
+
+
+class ImportEvent:
+    """One tournament to import, with the source line of each team for error reports."""
+    __slots__ = ('source', 'line', 'date', 'course', 'teams', 'team_lines', 'order')
+
+    def __init__(self, source: str, line: int, order: int):
+        self.source = source
+        self.line = line
+        self.order = order
+        self.date = None
+        self.course = None
+        self.teams: List[Tuple[Tuple[str, str], int]] = []
+        self.team_lines: List[str] = []
+
+    @property
+    def location(self) -> str:
+        return f"{self.source}:{self.line}"
+
+
+class BulkImporter:
+    def __init__(self, rating_system, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.rs = rating_system
+        self.batch_size = max(1, batch_size)
+        self.errors: List[Tuple[str, str]] = []
+
+    def error(self, location: str, message: str):
+        self.errors.append((location, message))
+
+    # ── Reading ──────────────────────────────────────────────────────
+
+    def read(self, path: str) -> List[ImportEvent]:
+        """Parse a directory of results files or a JSONL file; problems go to ``errors``."""
+        if os.path.isdir(path):
+            names = sorted(n for n in os.listdir(path) if n.lower().endswith(RESULT_SUFFIXES))
+            events = [self._read_results_file(os.path.join(path, n), i) for i, n in enumerate(names)]
+            if not names:
+                self.error(path, f"No {' or '.join(RESULT_SUFFIXES)} results files found")
+            return [e for e in events if e is not None]
+        if not os.path.exists(path):
+            self.error(path, "No such file or directory")
+            return []
+        return list(self._read_jsonl(path))
+
+    def _read_results_file(self, path: str, order: int) -> Optional[ImportEvent]:
+        event = ImportEvent(path, 1, order)
+        match = _FILENAME.match(os.path.splitext(os.path.basename(path))[0])
+        if match:
+            event.date = match.group(1)
+            event.course = match.group(2).replace('_', ' ').strip() if match.group(2) else None
+
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for lineno, line in enumerate(f, 1):
+                location = f"{path}:{lineno}"
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith('#'):
+                    directive = _DIRECTIVE.match(line)
+                    if directive:
+                        setattr(event, directive.group(1).lower(), directive.group(2).strip() or None)
+                    continue
+                cells = [c.strip() for c in next(csv.reader([line]))]
+                if not event.teams and len(cells) >= 3 and cells[2].lower() == 'score':
+                    continue  # header row
+                self._add_team(event, location, cells)
+        return event
+
+    def _read_jsonl(self, path: str):
+        with open(path, encoding='utf-8-sig') as f:
+            for lineno, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                location = f"{path}:{lineno}"
+                event = ImportEvent(path, lineno, lineno)
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    self.error(location, f"Invalid JSON: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    self.error(location, "Expected a JSON object per line")
+                    continue
+                event.date = record.get('date')
+                event.course = record.get('course')
+                teams = record.get('teams', record.get('team_results'))
+                if not isinstance(teams, list):
+                    self.error(location, "Missing 'teams' list")
+                    continue
+                for i, team in enumerate(teams, 1):
+                    if isinstance(team, dict):
+                        cells = [team.get('player1'), team.get('player2'), team.get('score')]
+                    elif isinstance(team, list):
+                        cells = team
+                    else:
+                        cells = []
+                    self._add_team(event, f"{location} (team {i})", cells)
+                yield event
+
+    def _add_team(self, event: ImportEvent, location: str, cells: List[Any]):
+        if len(cells) < 3:
+            self.error(location, "Expected Player1,Player2,Score")
+            return
+        player1, player2 = (str(c).strip() if c is not None else '' for c in cells[:2])
+        try:
+            score = int(str(cells[2]).strip())
+        except ValueError:
+            self.error(location, f"Invalid score: {cells[2]!r}")
+            return
+        if not player1:
+            self.error(location, "Missing player name")
+            return
+        event.teams.append(((player1, player2 or GHOST), score))
+        event.team_lines.append(location)
+
+    # ── Validation ───────────────────────────────────────────────────
+
+    def validate(self, events: List[ImportEvent]) -> List[ImportEvent]:
+        """Resolve names and check dates; returns the events in chronological order."""
+        resolve = self.rs.search_index.resolve
+        recorded = {(t['date'], (t.get('course') or '').lower()) for t in self.rs.tournaments}
+        latest = max((t['date'] for t in self.rs.tournaments if t.get('date')), default=None)
+        seen = set()
+
+        for event in events:
+            try:
+                event.date = datetime.date.fromisoformat(str(event.date)).isoformat()
+            except ValueError:
+                self.error(event.location, f"Missing or invalid date: {event.date!r} (use YYYY-MM-DD)")
+                event.date = None
+            if len(event.teams) < 2:
+                self.error(event.location, f"Needs at least 2 teams, found {len(event.teams)}")
+
+            if event.date:
+                key = (event.date, (event.course or '').lower())
+                if key in recorded:
+                    self.error(event.location, f"A tournament at {event.course or 'this course'} on {event.date} "
+                                               f"is already recorded")
+                elif key in seen:
+                    self.error(event.location, f"Duplicate event: {event.course or 'no course'} on {event.date}")
+                seen.add(key)
+                if latest and event.date < latest:
+                    self.error(event.location, f"Dated {event.date}, before the latest recorded tournament "
+                                               f"({latest}); ratings can only be replayed forward")
+
+            playing = set()
+            resolved = []
+            for ((player1, player2), score), location in zip(event.teams, event.team_lines):
+                names = []
+                for name in (player1, player2):
+                    canonical = GHOST if name == GHOST else resolve(name)
+                    if canonical is None:
+                        suggestions = self.rs.search_index.suggest(name)
+                        hint = f" (did you mean {', '.join(suggestions[:3])}?)" if suggestions else ""
+                        self.error(location, f"Unknown player {name!r}{hint}")
+                    elif canonical != GHOST and canonical in playing:
+                        self.error(location, f"{canonical} is on more than one team")
+                    else:
+                        playing.add(canonical)
+                    names.append(canonical or name)
+                if names[0] == GHOST:
+                    names.reverse()
+                resolved.append(((names[0], names[1]), score))
+            event.teams = resolved
+
+        return sorted(events, key=lambda e: (e.date or '', e.order))
+
+    # ── Writing ──────────────────────────────────────────────────────
+
+    def run(self, path: str, progress: Callable[[int, int], None] = None) -> Dict[str, Any]:
+        """Read, validate and record everything under ``path``.
+
+        Raises BulkImportError listing every problem before anything is
+        written; a failure while writing keeps the batches already committed
+        (``imported`` on the error says how many events).
+        """
+        started = time.perf_counter()
+        events = self.read(path)
+        events = self.validate(events)
+        if self.errors:
+            raise BulkImportError(self.errors)
+
+        rows = imported = 0
+        verbose, self.rs.verbose = self.rs.verbose, False
+        try:
+            for start in range(0, len(events), self.batch_size):
+                batch = events[start:start + self.batch_size]
+                event = None
+                try:
+                    with self.rs.batch():
+                        for event in batch:
+                            self.rs.record_tournament(event.teams, event.course, event.date)
+                except Exception as e:
+                    raise BulkImportError([(event.location if event else path, str(e))], imported) from e
+                imported += len(batch)
+                rows += sum(len(e.teams) for e in batch)
+                if progress:
+                    progress(imported, len(events))
+        finally:
+            self.rs.verbose = verbose
+
+        seconds = time.perf_counter() - started
+        return {
+            'events': imported,
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(rows / seconds, 1) if seconds else None,
+        }
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Leaderboard
+
+Order-statistic index over player ratings. Keys are (-rating, name) in an
+OrderedIndex, so the best player is position 0 and rank, percentile, page
+and histogram queries are O(log n) each (plus the page size) instead of a
+full sort of the roster per request.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple, Any
+
+from .ordered_index import OrderedIndex
+
+MAX_HISTOGRAM_BUCKETS = 500
+
+
+class Leaderboard:
+    def __init__(self, players: Dict[str, Dict[str, Any]] = None):
+        self.rebuild(players or {})
+
+    def rebuild(self, players: Dict[str, Dict[str, Any]]) -> None:
+        self._index = OrderedIndex((-data['rating'], name) for name, data in players.items())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def copy(self) -> 'Leaderboard':
+        """O(1): the underlying index is persistent, so copies share its nodes."""
+        board = Leaderboard.__new__(Leaderboard)
+        board._index = self._index.copy()
+        return board
+
+    def add(self, name: str, rating: float) -> None:
+        self._index.add((-rating, name))
+
+    def remove(self, name: str, rating: float) -> None:
+        self._index.discard((-rating, name))
+
+    def update(self, name: str, old_rating: float, new_rating: float) -> None:
+        self._index.discard((-old_rating, name))
+        self._index.add((-new_rating, name))
+
+    def count_above(self, rating: float) -> int:
+        """Players rated strictly higher than ``rating``."""
+        return self._index.rank((-rating,))
+
+    def count_at_or_above(self, rating: float) -> int:
+        return self._index.rank((math.nextafter(-rating, math.inf),))
+
+    def rank(self, rating: float) -> int:
+        """1-based competition rank: tied ratings share the best position."""
+        return self.count_above(rating) + 1
+
+    def percentile(self, rating: float) -> float:
+        """Percentile rank: share of the league rated below, counting ties as half."""
+        n = len(self._index)
+        if n == 0:
+            return 0.0
+        above = self.count_above(rating)
+        tied = self.count_at_or_above(rating) - above
+        below = n - above - tied
+        return round(100.0 * (below + 0.5 * tied) / n, 1)
+
+    def position(self, name: str, rating: float) -> int:
+        """0-based position of a player's row in leaderboard order."""
+        return self._index.rank((-rating, name))
+
+    def page(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """Leaderboard rows [offset, offset + limit) with competition ranks."""
+        rows = []
+        for neg_rating, name in self._index.slice(offset, offset + limit):
+            rating = -neg_rating
+            rows.append({'rank': self.rank(rating), 'name': name, 'rating': rating})
+        return rows
+
+    def after(self, cursor: Optional[Tuple[float, str]], limit: Optional[int]) -> Tuple[List[str], Optional[Tuple]]:
+        """Names in descending rating order after a (rating, name) cursor."""
+        start = 0
+        if cursor is not None:
+            key = (-cursor[0], cursor[1])
+            start = self._index.rank(key) + (1 if key in self._index else 0)
+        stop = len(self._index) if limit is None else start + limit
+        keys = self._index.slice(start, stop)
+        names = [name for _, name in keys]
+        more = stop < len(self._index)
+        return names, ((-keys[-1][0], keys[-1][1]) if keys and more else None)
+
+    def histogram(self, bucket_width: float = 50,
+                  max_buckets: int = MAX_HISTOGRAM_BUCKETS) -> List[Dict[str, Any]]:
+        """Counts per rating bucket, from the lowest bucket to the highest.
+
+        Raises ValueError if the width is not a positive number or would need
+        more than ``max_buckets`` buckets to cover the ratings.
+        """
+        if not (math.isfinite(bucket_width) and bucket_width > 0):
+            raise ValueError("Bucket width must be a positive number")
+        if not len(self._index):
+            return []
+        top = -self._index.select(0)[0]
+        bottom = -self._index.select(-1)[0]
+        low = math.floor(bottom / bucket_width) * bucket_width
+        if math.floor((top - low) / bucket_width) + 1 > max_buckets:
+            raise ValueError(f"Bucket width {bucket_width:g} would need more than {max_buckets} buckets; "
+                             f"use at least {(top - low) / (max_buckets - 1):.2f}")
+        buckets = []
+        while low <= top:
+            high = low + bucket_width
+            count = self.count_at_or_above(low) - self.count_at_or_above(high)
+            buckets.append({'min': low, 'max': high, 'count': count})
+            low = high
+        return buckets
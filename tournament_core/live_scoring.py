@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Live Scoring Manager
+
+Hole-by-hole scoring for in-progress tournaments. Cards submit per-hole
+strokes to the live_* tables; standings (total, thru, to-par) are kept in an
+OrderedIndex and updated in O(log n) per submission. Nothing here touches
+the rating tables — closing a round hands final totals to record_tournament.
+"""
+
+import datetime
+import threading
+from typing import Dict, List, Tuple, Optional, Any
+
+from .models import db, LiveRound, LiveCard, LiveScore
+from .ordered_index import OrderedIndex
+from .tournament_db_manager import TournamentDBManager
+
+
+class LiveRoundState:
+    """In-memory scorecards and ordered standings for one round."""
+
+    def __init__(self, tournament_id: int, pars: List[int], cards: Dict[int, Tuple[str, str]]):
+        self.tournament_id = tournament_id
+        self.pars = pars
+        self.cards = {
+            number: {'team': team, 'holes': {}, 'strokes': 0, 'par_played': 0}
+            for number, team in cards.items()
+        }
+        self.standings = OrderedIndex(self._key(n) for n in self.cards)
+        self.last_score_id = 0
+        self.lock = threading.Lock()
+
+    def _key(self, card_number: int) -> Tuple[int, int, int]:
+        card = self.cards[card_number]
+        return (card['strokes'] - card['par_played'], -len(card['holes']), card_number)
+
+    def apply(self, card_number: int, hole: int, strokes: int, score_id: int = None) -> None:
+        """Move one card in the standings after a hole score (or correction)."""
+        card = self.cards[card_number]
+        self.standings.discard(self._key(card_number))
+        previous = card['holes'].get(hole)
+        if previous is not None:
+            card['strokes'] -= previous
+            card['par_played'] -= self.pars[hole - 1]
+        card['holes'][hole] = strokes
+        card['strokes'] += strokes
+        card['par_played'] += self.pars[hole - 1]
+        self.standings.add(self._key(card_number))
+        if score_id is not None:
+            self.last_score_id = max(self.last_score_id, score_id)
+
+    def find_card(self, player1: str, player2: str) -> Optional[int]:
+        wanted = (player1.lower(), player2.lower())
+        for number, card in self.cards.items():
+            if tuple(p.lower() for p in card['team']) == wanted:
+                return number
+        return None
+
+    def standing(self, card_number: int) -> Dict[str, Any]:
+        card = self.cards[card_number]
+        to_par = card['strokes'] - card['par_played']
+        return {
+            'card': card_number,
+            'player1': card['team'][0],
+            'player2': card['team'][1],
+            # Tied teams share a position: count the cards strictly ahead
+            'position': self.standings.rank((to_par,)) + 1,
+            'total': card['strokes'],
+            'to_par': to_par,
+            'thru': len(card['holes']),
+        }
+
+    def standings_page(self, start: int = 0, limit: int = None) -> List[Dict[str, Any]]:
+        stop = len(self.standings) if limit is None else start + limit
+        return [self.standing(key[2]) for key in self.standings.slice(start, stop)]
+
+    def is_complete(self) -> bool:
+        return all(len(card['holes']) == len(self.pars) for card in self.cards.values())
+
+    def final_results(self) -> List[Tuple[Tuple[str, str], int]]:
+        return [(card['team'], card['strokes']) for card in self.cards.values()]
+
+
+class LiveScoringManager:
+    def __init__(self, db_manager: TournamentDBManager):
+        self.db_manager = db_manager
+        self._rounds = {}
+        self._lock = threading.Lock()
+
+    def start_round(self, tournament_id: int, teams: List[Tuple[str, str]],
+                    pars: List[int]) -> LiveRoundState:
+        if not teams:
+            raise ValueError("At least one team is required")
+        if not pars or any(int(p) < 1 for p in pars):
+            raise ValueError("Par is required for every hole")
+        if LiveRound.query.get(tournament_id):
+            raise ValueError(f"Live scoring already started for tournament {tournament_id}")
+
+        pars = [int(p) for p in pars]
+        cards = {number: (p1, p2) for number, (p1, p2) in enumerate(teams, start=1)}
+        db.session.add(LiveRound(tournament_id=tournament_id, pars=','.join(map(str, pars))))
+        db.session.add_all([
+            LiveCard(tournament_id=tournament_id, card_number=n, player1_name=p1, player2_name=p2)
+            for n, (p1, p2) in cards.items()
+        ])
+        db.session.commit()
+
+        state = LiveRoundState(tournament_id, pars, cards)
+        with self._lock:
+            self._rounds[tournament_id] = state
+        return state
+
+    def get_round(self, tournament_id: int) -> Optional[LiveRoundState]:
+        """The round's standings, caught up with scores submitted through any worker."""
+        with self._lock:
+            state = self._rounds.get(tournament_id)
+        if state is None:
+            state = self._load_round(tournament_id)
+            if state is None:
+                return None
+        self._sync(state)
+        return state
+
+    def submit_score(self, tournament_id: int, card_number: int, hole: int, strokes: int) -> Dict[str, Any]:
+        state = self.get_round(tournament_id)
+        if state is None:
+            raise ValueError(f"No live round for tournament {tournament_id}")
+        if card_number not in state.cards:
+            raise ValueError(f"Card {card_number} not found")
+        if not 1 <= hole <= len(state.pars):
+            raise ValueError(f"Hole must be between 1 and {len(state.pars)}")
+        if strokes < 1:
+            raise ValueError("Strokes must be positive")
+
+        db.session.add(LiveScore(tournament_id=tournament_id, card_number=card_number,
+                                 hole=hole, strokes=strokes))
+        db.session.commit()
+        self._sync(state)
+        return state.standing(card_number)
+
+    def close_round(self, tournament_id: int, recorded_id: int) -> None:
+        """Mark the round closed and re-point its rows at the recorded tournament.
+
+        The caller is responsible for committing.
+        """
+        for model in (LiveRound, LiveCard, LiveScore):
+            model.query.filter_by(tournament_id=tournament_id).update(
+                {'tournament_id': recorded_id}, synchronize_session=False,
+            )
+        LiveRound.query.filter_by(tournament_id=recorded_id).update(
+            {'closed_at': datetime.datetime.utcnow()}, synchronize_session=False,
+        )
+        with self._lock:
+            self._rounds.pop(tournament_id, None)
+
+    def discard_round(self, tournament_id: int) -> None:
+        """Delete a round's live rows. The caller is responsible for committing."""
+        for model in (LiveScore, LiveCard, LiveRound):
+            model.query.filter_by(tournament_id=tournament_id).delete(synchronize_session=False)
+        with self._lock:
+            self._rounds.pop(tournament_id, None)
+
+    def _load_round(self, tournament_id: int) -> Optional[LiveRoundState]:
+        live = LiveRound.query.get(tournament_id)
+        if live is None or live.closed_at is not None:
+            return None
+        cards = {
+            c.card_number: (c.player1_name, c.player2_name)
+            for c in LiveCard.query.filter_by(tournament_id=tournament_id)
+        }
+        state = LiveRoundState(tournament_id, [int(p) for p in live.pars.split(',')], cards)
+        with self._lock:
+            state = self._rounds.setdefault(tournament_id, state)
+        return state
+
+    def _sync(self, state: LiveRoundState) -> None:
+        """Apply score rows newer than the last one this worker has seen."""
+        with state.lock:
+            rows = (
+                db.session.query(LiveScore.score_id, LiveScore.card_number, LiveScore.hole, LiveScore.strokes)
+                .filter(LiveScore.tournament_id == state.tournament_id,
+                        LiveScore.score_id > state.last_score_id)
+                .order_by(LiveScore.score_id)
+                .all()
+            )
+            for score_id, card_number, hole, strokes in rows:
+                if card_number in state.cards:
+                    state.apply(card_number, hole, strokes, score_id)
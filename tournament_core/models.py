@@ -1,9 +1,41 @@
 """SQLAlchemy models for the DG-Dubs tournament rating system."""
 
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from datetime import datetime
 
-db = SQLAlchemy()
+# Bind key of the optional read replica (SQLALCHEMY_BINDS)
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the read replica while ``g.read_replica`` is set.
+
+    Flushes, INSERT/UPDATE/DELETE statements and SELECT ... FOR UPDATE always
+    go to the primary, and once a session has written, the rest of its reads
+    follow so it sees its own changes.
+    """
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if self.wrote:
+            return False
+        if self._flushing or getattr(clause, 'is_dml', False) or getattr(clause, '_for_update_arg', None) is not None:
+            self.wrote = True
+            return False
+        return has_app_context() and g.get('read_replica', False) and REPLICA_BIND in self._db.engines
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class Player(db.Model):
@@ -91,12 +123,12 @@ class AcePotTracker(db.Model):
     __tablename__ = 'ace_pot_tracker'
 
     entry_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     description = db.Column(db.String(255), nullable=False)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
     balance = db.Column(db.Numeric(10, 2), nullable=False)
-    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.tournament_id'), nullable=True)
-    player_id = db.Column(db.Integer, db.ForeignKey('players.player_id'), nullable=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournaments.tournament_id'), nullable=True, index=True)
+    player_id = db.Column(db.Integer, db.ForeignKey('players.player_id'), nullable=True, index=True)
 
     player = db.relationship('Player', backref='ace_pot_entries')
 
@@ -108,6 +140,82 @@ class AcePotConfig(db.Model):
     cap_amount = db.Column(db.Numeric(10, 2), nullable=False, default=100.00)
 
 
+class AcePotBalance(db.Model):
+    """Single-row running total of the ace pot ledger."""
+    __tablename__ = 'ace_pot_balance'
+
+    id = db.Column(db.Integer, primary_key=True, default=1)
+    balance = db.Column(db.Numeric(10, 2), nullable=False, default=0.00)
+    last_entry_id = db.Column(db.Integer, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class LiveRound(db.Model):
+    """Hole-by-hole scoring session for an in-progress tournament.
+
+    Live tables carry no foreign keys, so a round's rows live and die
+    independently of the rating tables; closing the round points them at
+    the recorded tournament.
+    """
+    __tablename__ = 'live_rounds'
+
+    tournament_id = db.Column(db.Integer, primary_key=True)
+    pars = db.Column(db.String(255), nullable=False)  # comma-separated par per hole
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    closed_at = db.Column(db.DateTime, nullable=True)
+
+
+class LiveCard(db.Model):
+    __tablename__ = 'live_cards'
+
+    card_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    tournament_id = db.Column(db.Integer, nullable=False)
+    card_number = db.Column(db.Integer, nullable=False)
+    player1_name = db.Column(db.String(100), nullable=False)
+    player2_name = db.Column(db.String(100), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'card_number', name='uq_live_card'),
+    )
+
+
+class LiveScore(db.Model):
+    """Append-only hole scores; a later row for the same card and hole is a correction."""
+    __tablename__ = 'live_scores'
+
+    score_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    tournament_id = db.Column(db.Integer, nullable=False)
+    card_number = db.Column(db.Integer, nullable=False)
+    hole = db.Column(db.Integer, nullable=False)
+    strokes = db.Column(db.Integer, nullable=False)
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('idx_live_scores_tournament', 'tournament_id', 'score_id'),
+    )
+
+
+class RecordingJob(db.Model):
+    """Queued request to record a tournament's results.
+
+    ``idempotency_key`` makes resubmitting the same request return this job
+    instead of recording twice; ``payload`` and ``result`` hold JSON text.
+    """
+    __tablename__ = 'recording_jobs'
+
+    job_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    idempotency_key = db.Column(db.String(100), unique=True, nullable=False)
+    tournament_id = db.Column(db.Integer, nullable=False, index=True)
+    status = db.Column(db.Enum('Queued', 'Running', 'Succeeded', 'Failed'), nullable=False, default='Queued')
+    payload = db.Column(db.Text, nullable=False)
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+
 class Season(db.Model):
     __tablename__ = 'seasons'
 
@@ -145,3 +253,8 @@ class UserSession(db.Model):
     expires_at = db.Column(db.DateTime, nullable=False)
     ip_address = db.Column(db.String(50), nullable=True)
     is_active = db.Column(db.Boolean, default=True)
+
+    __table_args__ = (
+        db.Index('idx_session_token_active', 'session_token', 'is_active'),
+        db.Index('idx_session_expires', 'expires_at'),
+    )
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Ordered Index
+
+A persistent (path-copying) treap with subtree sizes. Inserts, removals,
+rank and select are O(log n) expected, and copies are O(1) because nodes are
+never mutated once built — a copy simply shares the current root.
+"""
+
+import random
+from typing import Any, Iterator, List, Optional
+
+
+class _Node:
+    __slots__ = ('key', 'priority', 'left', 'right', 'size')
+
+    def __init__(self, key, priority, left, right):
+        self.key = key
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = 1 + _size(left) + _size(right)
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node else 0
+
+
+def _split(node: Optional[_Node], key, inclusive: bool):
+    """Split into (keys < key, keys >= key), or (<=, >) when inclusive."""
+    if node is None:
+        return None, None
+    goes_left = node.key <= key if inclusive else node.key < key
+    if goes_left:
+        left, right = _split(node.right, key, inclusive)
+        return _Node(node.key, node.priority, node.left, left), right
+    left, right = _split(node.left, key, inclusive)
+    return left, _Node(node.key, node.priority, right, node.right)
+
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Merge two treaps where every key in ``a`` is below every key in ``b``."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        return _Node(a.key, a.priority, a.left, _merge(a.right, b))
+    return _Node(b.key, b.priority, _merge(a, b.left), b.right)
+
+
+class OrderedIndex:
+    """Sorted set of comparable keys with order-statistic queries."""
+
+    def __init__(self, keys=None):
+        self._root = None
+        if keys is not None:
+            for key in sorted(keys):
+                self._root = _merge(self._root, _Node(key, random.random(), None, None))
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def __contains__(self, key) -> bool:
+        node = self._root
+        while node is not None:
+            if key == node.key:
+                return True
+            node = node.left if key < node.key else node.right
+        return False
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.slice(0, len(self)))
+
+    def copy(self) -> 'OrderedIndex':
+        clone = OrderedIndex()
+        clone._root = self._root
+        return clone
+
+    def add(self, key) -> None:
+        left, right = _split(self._root, key, inclusive=False)
+        _, right = _split(right, key, inclusive=True)
+        self._root = _merge(_merge(left, _Node(key, random.random(), None, None)), right)
+
+    def discard(self, key) -> None:
+        left, right = _split(self._root, key, inclusive=False)
+        _, right = _split(right, key, inclusive=True)
+        self._root = _merge(left, right)
+
+    def rank(self, key) -> int:
+        """Number of keys strictly less than ``key``."""
+        node, count = self._root, 0
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, index: int):
+        """The key at 0-based position ``index`` in sorted order."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('OrderedIndex index out of range')
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node.key
+            else:
+                index -= left + 1
+                node = node.right
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """Keys at positions [start, stop) in O(log n + k)."""
+        start, stop = max(0, start), min(len(self), stop)
+        out = []
+        self._collect(self._root, start, stop, out)
+        return out
+
+    def _collect(self, node, start, stop, out):
+        if node is None or start >= stop:
+            return
+        left = _size(node.left)
+        if start < left:
+            self._collect(node.left, start, min(stop, left), out)
+        if start <= left < stop:
+            out.append(node.key)
+        if stop > left + 1:
+            self._collect(node.right, max(0, start - left - 1), stop - left - 1, out)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Payout Engine
+
+This module computes and applies tournament cash payouts in bulk: one joined
+query to index a tournament's teams, in-memory purse and tie-split math, and
+batched writes for team payouts and seasonal_cash credits.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Tuple, Any, Iterable
+
+from sqlalchemy.orm import aliased
+
+from .models import db, Player, Team
+from .tournament_db_manager import TournamentDBManager
+
+TeamKey = Tuple[str, str]
+
+
+class PayoutEngine:
+    def __init__(self, db_manager: TournamentDBManager):
+        self.db_manager = db_manager
+
+    # ── Team index ───────────────────────────────────────────────────
+
+    def team_index(self, tournament_id: int) -> Dict[TeamKey, Dict[str, Any]]:
+        """Map (player1, player2) names to team rows with a single joined query."""
+        p1 = aliased(Player)
+        p2 = aliased(Player)
+        rows = (
+            db.session.query(
+                Team.team_id, Team.position, Team.score, Team.is_ghost_team,
+                Team.player1_id, Team.player2_id, p1.name, p2.name,
+            )
+            .outerjoin(p1, Team.player1_id == p1.player_id)
+            .outerjoin(p2, Team.player2_id == p2.player_id)
+            .filter(Team.tournament_id == tournament_id)
+            .order_by(Team.position)
+            .all()
+        )
+        index = {}
+        for team_id, position, score, is_ghost, p1_id, p2_id, p1_name, p2_name in rows:
+            key = (p1_name or '', p2_name or 'Ghost Player')
+            index[key] = {
+                'team_id': team_id, 'position': position, 'score': score,
+                'player1_id': p1_id, 'player2_id': p2_id,
+                'is_ghost': bool(is_ghost) or not p2_id,
+            }
+        return index
+
+    # ── Purse math ───────────────────────────────────────────────────
+
+    @staticmethod
+    def standard_purse(pot: float, second_place: float, third_place: float,
+                       team_count: int) -> Dict[int, float]:
+        """Money per finishing place: fixed 2nd/3rd, remainder of the pot to 1st."""
+        third = third_place if pot > 0 and team_count >= 3 else 0
+        second = second_place if pot > 0 and team_count >= 2 else 0
+        first = pot - second - third if pot > 0 else 0
+
+        # 1st always gets the highest — swap with 2nd if needed
+        if first < second:
+            first, second = second, first
+        return {1: max(0, first), 2: max(0, second), 3: max(0, third)}
+
+    @staticmethod
+    def paid_places(team_count: int) -> List[int]:
+        return [1, 2] if team_count < 3 else [1, 2, 3]
+
+    @staticmethod
+    def has_paid_tie(index: Dict[TeamKey, Dict[str, Any]], paid_places: Iterable[int]) -> bool:
+        counts = defaultdict(int)
+        for team in index.values():
+            counts[team['position']] += 1
+        return any(counts.get(p, 0) > 1 for p in paid_places)
+
+    @staticmethod
+    def split_payouts(index: Dict[TeamKey, Dict[str, Any]],
+                      purse: Dict[int, float]) -> Dict[TeamKey, float]:
+        """Payout per team, with tied teams sharing the money of every place they occupy.
+
+        Two teams tied at position 1 occupy places 1 and 2, so each gets half
+        of the 1st + 2nd place money.
+        """
+        by_position = defaultdict(list)
+        for key, team in index.items():
+            by_position[team['position']].append(key)
+
+        payouts = {}
+        for position, keys in by_position.items():
+            places = range(position, position + len(keys))
+            share = round(sum(purse.get(p, 0) for p in places) / len(keys), 2)
+            for key in keys:
+                payouts[key] = share
+        return payouts
+
+    # ── Application ──────────────────────────────────────────────────
+
+    def apply_payouts(self, index: Dict[TeamKey, Dict[str, Any]],
+                      payouts: Dict[TeamKey, float]) -> Dict[str, Any]:
+        """Write team payouts and seasonal_cash credits in batched statements.
+
+        The caller is responsible for committing.
+        """
+        team_updates = []
+        credits = defaultdict(float)
+        unmatched = []
+        for key, amount in payouts.items():
+            team = index.get(tuple(key))
+            if team is None:
+                unmatched.append(list(key))
+                continue
+            amount = float(amount)
+            team_updates.append({'team_id': team['team_id'], 'payout': amount})
+            if amount > 0:
+                per_player = amount if team['is_ghost'] else amount / 2
+                credits[team['player1_id']] += per_player
+                if not team['is_ghost']:
+                    credits[team['player2_id']] += per_player
+
+        if team_updates:
+            db.session.bulk_update_mappings(Team, team_updates)
+        self.db_manager.credit_seasonal_cash(credits)
+        return {'applied': len(team_updates), 'unmatched': unmatched}
+
+    @staticmethod
+    def payouts_from_request(manual_payouts: List[Dict[str, Any]]) -> Dict[TeamKey, float]:
+        """Turn a list of {player1, player2, payout} dicts into a payout map."""
+        return {
+            (mp['player1'], mp['player2']): float(mp.get('payout', 0) or 0)
+            for mp in manual_payouts
+            if 'player1' in mp and 'player2' in mp
+        }
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Player Search Index
+
+In-memory name index for autocomplete and typo recovery. A prefix trie over
+every word of each name answers "starts with" queries by walking only the
+query's characters, and an inverted character-bigram index ranks near-misses
+for "did you mean" suggestions. Similarity is scored against the whole name
+and against each word, so a typo in a first name still finds the player.
+"""
+
+import heapq
+from operator import itemgetter
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+
+# Shorter queries only get prefix matches; two characters say too little for fuzzy ranking
+FUZZY_MIN_LENGTH = 3
+
+
+class PlayerNotFoundError(ValueError):
+    """Raised when a name does not resolve; carries close matches for the caller."""
+
+    def __init__(self, name: str, suggestions: List[str] = None):
+        self.name = name
+        self.suggestions = suggestions or []
+        message = f"Player {name} not found"
+        if self.suggestions:
+            message += f" (did you mean: {', '.join(self.suggestions)}?)"
+        super().__init__(message)
+
+
+def _ngrams(text: str) -> Set[str]:
+    padded = f' {text} '
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'names')
+
+    def __init__(self):
+        self.children = {}
+        self.names = set()
+
+
+class PlayerSearchIndex:
+    def __init__(self, names: Iterable[str] = ()):
+        self.rebuild(names)
+
+    def rebuild(self, names: Iterable[str]) -> None:
+        self._root = _TrieNode()
+        self._by_lower = {}  # lowercase name -> canonical name
+        self._grams = defaultdict(set)  # bigram -> {(lowercase name, term index)}
+        self._term_sizes = {}  # (lowercase name, term index) -> bigram count
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._by_lower)
+
+    def add(self, name: str) -> None:
+        lower = name.lower()
+        if lower in self._by_lower:
+            return
+        self._by_lower[lower] = name
+        for word in self._words(lower):
+            node = self._root
+            for ch in word:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.names.add(lower)
+        for i, term in enumerate(self._terms(lower)):
+            grams = _ngrams(term)
+            self._term_sizes[(lower, i)] = len(grams)
+            for gram in grams:
+                self._grams[gram].add((lower, i))
+
+    def with_names(self, names: Iterable[str]) -> 'PlayerSearchIndex':
+        """A new index with ``names`` added, leaving this one untouched for its readers.
+
+        Only the lookup dicts, the trie nodes on each new word's path and the
+        bigram sets it touches are copied; the rest is shared with this index.
+        """
+        index = PlayerSearchIndex.__new__(PlayerSearchIndex)
+        index._by_lower = dict(self._by_lower)
+        index._grams = defaultdict(set, self._grams)
+        index._term_sizes = dict(self._term_sizes)
+        owned = set()  # ids of nodes and sets that belong to the new index alone
+
+        def own_node(node):
+            if node is not None and id(node) in owned:
+                return node
+            copy = _TrieNode()
+            if node is not None:
+                copy.children = dict(node.children)
+                copy.names = set(node.names)
+            owned.add(id(copy))
+            return copy
+
+        index._root = own_node(self._root)
+        for name in names:
+            lower = name.lower()
+            if lower in index._by_lower:
+                continue
+            index._by_lower[lower] = name
+            for word in self._words(lower):
+                node = index._root
+                for ch in word:
+                    child = own_node(node.children.get(ch))
+                    node.children[ch] = child
+                    child.names.add(lower)
+                    node = child
+            for i, term in enumerate(self._terms(lower)):
+                grams = _ngrams(term)
+                index._term_sizes[(lower, i)] = len(grams)
+                for gram in grams:
+                    members = index._grams.get(gram)
+                    if members is None or id(members) not in owned:
+                        members = set(members or ())
+                        owned.add(id(members))
+                        index._grams[gram] = members
+                    members.add((lower, i))
+        return index
+
+    def remove(self, name: str) -> None:
+        lower = name.lower()
+        if self._by_lower.pop(lower, None) is None:
+            return
+        for word in self._words(lower):
+            node = self._root
+            for ch in word:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+                node.names.discard(lower)
+        for i, term in enumerate(self._terms(lower)):
+            self._term_sizes.pop((lower, i), None)
+            for gram in _ngrams(term):
+                self._grams[gram].discard((lower, i))
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical spelling of ``name`` (case-insensitive), or None."""
+        return self._by_lower.get(name.lower())
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Ranked matches: full-name prefixes, then word prefixes, then fuzzy matches."""
+        q = query.strip().lower()
+        if not q:
+            return []
+        results, seen = [], set()
+
+        node = self._root
+        for ch in q:
+            node = node.children.get(ch)
+            if node is None:
+                break
+        if node is not None:
+            # Whole-name prefixes before matches on a later word; shorter names first
+            hits = heapq.nsmallest(limit, node.names, key=lambda n: (not n.startswith(q), len(n), n))
+            for lower in hits:
+                results.append({'name': self._by_lower[lower], 'match': 'prefix', 'score': 1.0})
+                seen.add(lower)
+
+        if len(results) < limit and len(q) >= FUZZY_MIN_LENGTH:
+            for lower, score in self._similar(q, limit - len(results), exclude=seen):
+                results.append({'name': self._by_lower[lower], 'match': 'fuzzy', 'score': round(score, 3)})
+        return results
+
+    def suggest(self, name: str, limit: int = 3, threshold: float = 0.3) -> List[str]:
+        """Close spellings of a name that failed to resolve."""
+        return [self._by_lower[lower] for lower, _ in self._similar(name.lower(), limit, threshold=threshold)]
+
+    def _similar(self, text: str, limit: int, threshold: float = 0.2, exclude=()):
+        grams = _ngrams(text)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        # Only the terms sharing the most bigrams can rank; score a bounded pool of them
+        pool = heapq.nlargest(limit * 4 + len(exclude), shared.items(), key=itemgetter(1))
+        best = {}
+        for term, count in pool:
+            lower = term[0]
+            if lower in exclude:
+                continue
+            # Dice coefficient over bigram sets; a name scores its best-matching term
+            score = 2 * count / (len(grams) + self._term_sizes[term])
+            if score >= threshold and score > best.get(lower, 0):
+                best[lower] = score
+        return heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], item[0]))
+
+    @staticmethod
+    def _terms(lower: str) -> List[str]:
+        """The full name plus its individual words, when there is more than one."""
+        parts = lower.split()
+        return [lower] + (parts if len(parts) > 1 else [])
+
+    @staticmethod
+    def _words(lower: str) -> List[str]:
+        """The full name plus each later word, so "smi" finds "John Smith"."""
+        parts = lower.split()
+        return [lower] + [' '.join(parts[i:]) for i in range(1, len(parts))]
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rating State
+
+One published version of the rating system's in-memory data: the player
+table, tournament results and the indexes built over them. A published state
+is never modified. Writers work on a copy (new containers sharing the
+unchanged entries, plus O(1) copies of the persistent leaderboard index) and
+publish it by swapping a single reference, so readers on other threads always
+see a complete state without taking a lock.
+"""
+
+import time
+from typing import Any, Dict, List
+
+from .player_search import PlayerSearchIndex
+from .leaderboard import Leaderboard
+
+
+class RatingState:
+    __slots__ = ('players', 'tournaments', 'search_index', 'leaderboard', 'revision', 'views', 'published_at')
+
+    def __init__(self, players: Dict[str, Dict[str, Any]] = None, tournaments: List[Dict[str, Any]] = None,
+                 search_index: PlayerSearchIndex = None, leaderboard: Leaderboard = None, revision: int = 0):
+        self.players = players if players is not None else {}
+        self.tournaments = tournaments if tournaments is not None else []
+        self.search_index = search_index if search_index is not None else PlayerSearchIndex(self.players)
+        self.leaderboard = leaderboard if leaderboard is not None else Leaderboard(self.players)
+        self.revision = revision
+        self.views = {}  # derived views built lazily from this state
+        self.published_at = time.time()
+
+    def draft(self) -> 'RatingState':
+        """A writable successor that shares every entry until it is replaced.
+
+        Player entries must be copied before they are changed (see
+        ``own_player``); the search index is shared because names only
+        change through ``add_player``, which rebuilds it.
+        """
+        return RatingState(dict(self.players), list(self.tournaments), self.search_index,
+                           self.leaderboard.copy(), self.revision + 1)
+
+    def own_player(self, name: str) -> Dict[str, Any]:
+        """Copy a player's entry into this draft so it can be changed in place."""
+        entry = dict(self.players[name])
+        entry['history'] = list(entry['history'])
+        self.players[name] = entry
+        return entry
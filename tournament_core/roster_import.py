@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Roster Import
+
+Reads a club roster such as registered_players.csv into entries for
+``TournamentRatingSystem.add_players``, which adds them in one transaction.
+
+Each line is ``Name,SkillClass[,ClubMember]``. The skill class sets a new
+player's starting rating (SKILL_RATINGS, DEFAULT_RATING for any other class);
+existing players keep their rating. The optional third column (yes/no) sets
+club membership, which otherwise defaults to the ``club_members`` argument
+(None leaves existing players' membership alone). A ``Name,Class`` header line is skipped and
+problems are reported as ``file:line: message``.
+"""
+
+import csv
+from typing import List, Optional, Tuple
+
+SKILL_RATINGS = {'A': 1300, 'B': 1000}
+DEFAULT_RATING = 1000
+_YES = {'y', 'yes', 'true', '1', 'member'}
+_NO = {'n', 'no', 'false', '0'}
+
+
+def read_roster(path: str, club_members: Optional[bool] = True
+                ) -> Tuple[List[Tuple[str, float, Optional[bool]]], List[Tuple[str, str]]]:
+    """Parse a roster file into (name, rating, is_club_member) entries and (location, message) errors."""
+    entries, errors = [], []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for lineno, cells in enumerate(csv.reader(f), 1):
+            location = f"{path}:{lineno}"
+            cells = [c.strip() for c in cells]
+            if not any(cells) or cells[0].startswith('#'):
+                continue
+            if len(cells) < 2 or not cells[0]:
+                errors.append((location, "Expected Name,SkillClass"))
+                continue
+            name, skill = cells[0], cells[1].upper()
+            if lineno == 1 and name.lower() == 'name':
+                continue  # header row
+            is_club_member = club_members
+            if len(cells) > 2 and cells[2]:
+                flag = cells[2].lower()
+                if flag in _YES:
+                    is_club_member = True
+                elif flag in _NO:
+                    is_club_member = False
+                else:
+                    errors.append((location, f"Invalid club member flag {cells[2]!r} (use yes or no)"))
+                    continue
+            entries.append((name, SKILL_RATINGS.get(skill, DEFAULT_RATING), is_club_member))
+    return entries, errors
+
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Model Serializers
+
+Precompiled per-model encoders that turn ORM rows into JSON-ready dicts.
+Each encoder resolves its columns' types once at import time (Numeric to
+float, Date/DateTime to ISO strings), so encoding a row is a single pass over
+a fixed plan instead of per-field isinstance checks and hand-written
+float()/isoformat() calls in every endpoint.
+"""
+
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Date, DateTime, Numeric
+
+from .models import Player, Tournament, Team, PlayerHistory, AcePotTracker, RecordingJob
+
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+
+def to_iso(value):
+    if value is None:
+        return None
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _converter(column_type):
+    if isinstance(column_type, Numeric):
+        return _to_float
+    if isinstance(column_type, (Date, DateTime)):
+        return to_iso
+    return None
+
+
+class ModelEncoder:
+    """Encode instances of one model using a plan built from its column types.
+
+    ``fields`` are column names; ``renames`` maps a column to its output key.
+    """
+
+    def __init__(self, model, fields: Iterable[str], **renames: str):
+        columns = model.__table__.columns
+        plain, converted = [], []
+        for field in fields:
+            key = renames.get(field, field)
+            conv = _converter(columns[field].type)
+            if conv is None:
+                plain.append((key, attrgetter(field)))
+            else:
+                converted.append((key, attrgetter(field), conv))
+        self.model = model
+        self._plain = tuple(plain)
+        self._converted = tuple(converted)
+
+    def __call__(self, obj) -> Dict[str, Any]:
+        out = {key: get(obj) for key, get in self._plain}
+        for key, get, conv in self._converted:
+            out[key] = conv(get(obj))
+        return out
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        return [self(obj) for obj in objs]
+
+
+player_encoder = ModelEncoder(
+    Player, ('player_id', 'name', 'rating', 'tournaments_played', 'is_club_member'),
+    player_id='id',
+)
+
+# Shape of GET /api/tournaments rows
+tournament_encoder = ModelEncoder(
+    Tournament, ('tournament_id', 'date', 'course', 'team_count', 'status'),
+    team_count='teams',
+)
+
+# Shape used by the in-memory rating system (TournamentDBManager.get_tournaments)
+tournament_record_encoder = ModelEncoder(
+    Tournament, ('tournament_id', 'date', 'course', 'team_count', 'status', 'ace_pot_paid'),
+    tournament_id='id',
+)
+
+team_encoder = ModelEncoder(
+    Team, ('position', 'expected_position', 'score', 'team_rating', 'payout'),
+)
+
+# Shape of GET /api/players/<name> history rows (the caller adds date and change)
+history_encoder = ModelEncoder(
+    PlayerHistory, ('tournament_id', 'position', 'expected_position', 'old_rating',
+                    'new_rating', 'with_ghost'),
+)
+
+# Shape used by the in-memory rating system (TournamentDBManager.get_player_history)
+history_record_encoder = ModelEncoder(
+    PlayerHistory, ('position', 'expected_position', 'old_rating', 'new_rating',
+                    'score', 'with_ghost'),
+)
+
+ace_pot_entry_encoder = ModelEncoder(
+    AcePotTracker, ('entry_id', 'date', 'description', 'amount', 'balance',
+                    'tournament_id', 'player_id'),
+    entry_id='id',
+)
+
+# Job status without the stored payload; the result JSON is decoded by the caller
+recording_job_encoder = ModelEncoder(
+    RecordingJob, ('job_id', 'idempotency_key', 'tournament_id', 'status', 'error',
+                   'attempts', 'created_at', 'started_at', 'finished_at'),
+)
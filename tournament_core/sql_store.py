@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+SQL Store
+
+Storage for the rating system on a plain SQLAlchemy engine, for use without
+a Flask app context: the command-line tool, scripts and offline scratch
+databases. It implements the subset of TournamentDBManager that
+TournamentRatingSystem uses (players, tournaments, team results and rating
+history) with SQLAlchemy Core, so importing it does not import Flask.
+
+The tables mirror database/create_tables.sql, so a store can also be
+pointed at a copy of the production schema. A store is meant for one
+thread, like the CLI that uses it.
+
+Outside ``transaction()`` every call commits on its own. Inside it, rating
+updates, team results and history rows are buffered and written with one
+executemany per table when the transaction commits (reads flush first), so
+recording a batch of tournaments costs a handful of statements per batch
+rather than several per player.
+"""
+
+import datetime
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Enum, ForeignKey, Integer, MetaData, Numeric,
+    String, Table, bindparam, create_engine, func, select, update,
+)
+from sqlalchemy.pool import StaticPool
+
+metadata = MetaData()
+
+players = Table(
+    'players', metadata,
+    Column('player_id', Integer, primary_key=True, autoincrement=True),
+    Column('name', String(100), unique=True, nullable=False),
+    Column('rating', Numeric(8, 2, asdecimal=False), nullable=False, default=1000.00),
+    Column('tournaments_played', Integer, nullable=False, default=0),
+    Column('is_club_member', Boolean, default=False),
+    Column('seasonal_cash', Numeric(8, 2, asdecimal=False), nullable=False, default=0.00),
+    Column('lifetime_cash', Numeric(8, 2, asdecimal=False), nullable=False, default=0.00),
+    Column('created_at', DateTime, default=datetime.datetime.utcnow),
+)
+
+tournaments = Table(
+    'tournaments', metadata,
+    Column('tournament_id', Integer, primary_key=True, autoincrement=True),
+    Column('date', Date, nullable=False),
+    Column('course', String(100)),
+    Column('team_count', Integer, nullable=False),
+    Column('status', Enum('Pending', 'In Progress', 'Completed'), default='Completed'),
+    Column('ace_pot_paid', Boolean, default=False),
+    Column('ace_pot_paid_to', String(500), nullable=True),
+    Column('created_at', DateTime, default=datetime.datetime.utcnow),
+)
+
+teams = Table(
+    'teams', metadata,
+    Column('team_id', Integer, primary_key=True, autoincrement=True),
+    Column('tournament_id', Integer, ForeignKey('tournaments.tournament_id'), nullable=False),
+    Column('player1_id', Integer, ForeignKey('players.player_id'), nullable=False),
+    Column('player2_id', Integer, ForeignKey('players.player_id'), nullable=True),
+    Column('is_ghost_team', Boolean, default=False),
+    Column('position', Integer, nullable=False),
+    Column('expected_position', Numeric(6, 2, asdecimal=False), nullable=False),
+    Column('score', Integer, nullable=False),
+    Column('team_rating', Numeric(8, 2, asdecimal=False), nullable=False),
+    Column('payout', Numeric(8, 2, asdecimal=False), nullable=False, default=0.00),
+)
+
+player_history = Table(
+    'player_history', metadata,
+    Column('history_id', Integer, primary_key=True, autoincrement=True),
+    Column('player_id', Integer, ForeignKey('players.player_id'), nullable=False, index=True),
+    Column('tournament_id', Integer, ForeignKey('tournaments.tournament_id'), nullable=False),
+    Column('old_rating', Numeric(8, 2, asdecimal=False), nullable=False),
+    Column('new_rating', Numeric(8, 2, asdecimal=False), nullable=False),
+    Column('position', Integer, nullable=False),
+    Column('expected_position', Numeric(6, 2, asdecimal=False), nullable=False),
+    Column('score', Integer, nullable=False),
+    Column('with_ghost', Boolean, nullable=False, default=False),
+)
+
+
+# Prebuilt for executemany when a transaction's buffered writes are flushed
+_UPDATE_PLAYER = (
+    update(players).where(players.c.player_id == bindparam('pid'))
+    .values(rating=func.coalesce(bindparam('new_rating'), players.c.rating),
+            tournaments_played=players.c.tournaments_played + bindparam('played'))
+)
+INSERT_CHUNK = 500  # rows per multi-row INSERT in add_players
+
+
+def _to_date(value):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class SQLStore:
+    """Rating-system storage on a SQLAlchemy engine, no Flask app context required."""
+
+    def __init__(self, engine, create_tables: bool = True):
+        self.engine = engine
+        if create_tables:
+            metadata.create_all(engine)
+        self._conn = None
+        self._ids = {}  # lower-cased name -> player_id
+        self._reset_buffers()
+
+    @classmethod
+    def sqlite(cls, path: str) -> 'SQLStore':
+        """Store backed by a local SQLite file (created if missing)."""
+        return cls(create_engine(f'sqlite:///{path}'))
+
+    @classmethod
+    def memory(cls) -> 'SQLStore':
+        """Throwaway store in an in-memory SQLite database."""
+        return cls(create_engine('sqlite://', poolclass=StaticPool,
+                                 connect_args={'check_same_thread': False}))
+
+    # ── Connections ──────────────────────────────────────────────────
+
+    @contextmanager
+    def _connection(self):
+        """The open transaction's connection, or a new one that commits on exit."""
+        if self._conn is not None:
+            yield self._conn
+            return
+        with self.engine.begin() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """Group many store calls into one commit; nested blocks join the outer one."""
+        if self._conn is not None:
+            yield
+            return
+        ids = dict(self._ids)
+        with self.engine.begin() as conn:
+            self._conn = conn
+            try:
+                yield
+                self._flush()
+            except Exception:
+                self._ids = ids  # ids handed out by the rolled-back inserts are gone
+                raise
+            finally:
+                self._conn = None
+                self._reset_buffers()
+
+    def commit_transaction(self):
+        """Calls commit as they go (or with the enclosing ``transaction``)."""
+
+    def _reset_buffers(self):
+        self._player_updates = {}  # player_id -> [new rating or None, tournaments played delta]
+        self._team_rows = []
+        self._history_rows = []
+
+    def _flush(self):
+        """Write the open transaction's buffered rows."""
+        if self._conn is None:
+            return
+        if self._player_updates:
+            self._conn.execute(_UPDATE_PLAYER, [
+                {'pid': pid, 'new_rating': rating, 'played': played}
+                for pid, (rating, played) in self._player_updates.items()
+            ])
+        if self._team_rows:
+            self._conn.execute(teams.insert(), self._team_rows)
+        if self._history_rows:
+            self._conn.execute(player_history.insert(), self._history_rows)
+        self._reset_buffers()
+
+    def _write(self, table, row):
+        """Insert ``row`` now, or buffer it while a transaction is open (returns None then)."""
+        if self._conn is not None:
+            (self._team_rows if table is teams else self._history_rows).append(row)
+            return None
+        with self._connection() as conn:
+            return conn.execute(table.insert(), row).inserted_primary_key[0]
+
+    # ── Players ──────────────────────────────────────────────────────
+
+    def add_player(self, name: str, rating: float, is_club_member: bool = False) -> int:
+        with self._connection() as conn:
+            player_id = conn.execute(players.insert().values(
+                name=name, rating=rating, tournaments_played=0, is_club_member=is_club_member,
+            )).inserted_primary_key[0]
+        self._ids[name.lower()] = player_id
+        return player_id
+
+    def get_player_id(self, name: str) -> int:
+        player_id = self._get_player_id_safe(name)
+        if player_id is None:
+            raise ValueError(f"Player not found: {name}")
+        return player_id
+
+    def get_all_players(self) -> List[Dict[str, Any]]:
+        self._flush()
+        query = select(players.c.player_id, players.c.name, players.c.rating,
+                       players.c.tournaments_played, players.c.is_club_member).order_by(players.c.rating.desc())
+        with self._connection() as conn:
+            rows = conn.execute(query).all()
+        self._ids = {row.name.lower(): row.player_id for row in rows}
+        return [{
+            'id': row.player_id, 'name': row.name, 'rating': row.rating,
+            'tournaments_played': row.tournaments_played, 'is_club_member': bool(row.is_club_member),
+        } for row in rows]
+
+    def find_players(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Existing players among ``names`` with one query, keyed by lower-cased name."""
+        lowered = {n.lower() for n in names}
+        if not lowered:
+            return {}
+        self._flush()
+        query = (select(players.c.player_id, players.c.name, players.c.is_club_member)
+                 .where(func.lower(players.c.name).in_(lowered)))
+        with self._connection() as conn:
+            rows = conn.execute(query).all()
+        found = {}
+        for row in rows:
+            self._ids[row.name.lower()] = row.player_id
+            found[row.name.lower()] = {'id': row.player_id, 'name': row.name,
+                                       'is_club_member': bool(row.is_club_member)}
+        return found
+
+    def add_players(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many players (name, rating, is_club_member) with multi-row INSERTs."""
+        with self._connection() as conn:
+            for start in range(0, len(rows), INSERT_CHUNK):
+                conn.execute(players.insert().values([
+                    {'name': r['name'], 'rating': r['rating'], 'tournaments_played': 0,
+                     'is_club_member': r.get('is_club_member', False)}
+                    for r in rows[start:start + INSERT_CHUNK]
+                ]))
+        return len(rows)
+
+    def set_club_membership(self, player_ids: List[int], is_club_member: bool) -> int:
+        """Set club membership for many players with one UPDATE."""
+        if not player_ids:
+            return 0
+        with self._connection() as conn:
+            conn.execute(update(players).where(players.c.player_id.in_(player_ids))
+                         .values(is_club_member=is_club_member))
+        return len(player_ids)
+
+    def update_player_rating(self, name: str, rating: float) -> bool:
+        return self._buffer_player(name, rating=rating)
+
+    def increment_player_tournaments(self, name: str) -> bool:
+        return self._buffer_player(name, played=1)
+
+    def update_player_club_membership(self, player_name: str, is_club_member: bool) -> bool:
+        return self._update_player(player_name, is_club_member=is_club_member)
+
+    def _buffer_player(self, name, rating=None, played=0):
+        player_id = self._get_player_id_safe(name)
+        if player_id is None:
+            return False
+        if self._conn is None:
+            with self._connection() as conn:
+                conn.execute(_UPDATE_PLAYER, {'pid': player_id, 'new_rating': rating, 'played': played})
+            return True
+        pending = self._player_updates.setdefault(player_id, [None, 0])
+        if rating is not None:
+            pending[0] = rating
+        pending[1] += played
+        return True
+
+    def _update_player(self, name, **values):
+        player_id = self._get_player_id_safe(name)
+        if player_id is None:
+            return False
+        with self._connection() as conn:
+            conn.execute(update(players).where(players.c.player_id == player_id).values(**values))
+        return True
+
+    def _get_player_id_safe(self, name: str) -> Optional[int]:
+        key = name.lower()
+        if key not in self._ids:
+            with self._connection() as conn:
+                player_id = conn.execute(
+                    select(players.c.player_id).where(func.lower(players.c.name) == key)
+                ).scalar()
+            if player_id is None:
+                return None
+            self._ids[key] = player_id
+        return self._ids[key]
+
+    # ── Tournaments ──────────────────────────────────────────────────
+
+    def add_tournament(self, date: str, course: str, team_count: int, ace_pot_paid: bool = False) -> Optional[int]:
+        with self._connection() as conn:
+            return conn.execute(tournaments.insert().values(
+                date=_to_date(date), course=course, team_count=team_count,
+                ace_pot_paid=ace_pot_paid, status='Completed',
+            )).inserted_primary_key[0]
+
+    def complete_tournament(self, tournament_id: int, date: str, course: str, team_count: int,
+                            ace_pot_paid: bool = False) -> Optional[int]:
+        values = {'course': course, 'team_count': team_count, 'ace_pot_paid': ace_pot_paid, 'status': 'Completed'}
+        if date:
+            values['date'] = _to_date(date)
+        with self._connection() as conn:
+            result = conn.execute(update(tournaments).where(tournaments.c.tournament_id == tournament_id).values(**values))
+        return tournament_id if result.rowcount else None
+
+    def get_tournaments(self) -> List[Dict[str, Any]]:
+        """Every tournament, newest first, with its team results (two queries in total)."""
+        p1, p2 = players.alias('p1'), players.alias('p2')
+        team_query = (
+            select(teams.c.tournament_id, teams.c.position, teams.c.expected_position, teams.c.score,
+                   teams.c.team_rating, teams.c.payout,
+                   p1.c.name.label('player1_name'), p2.c.name.label('player2_name'))
+            .outerjoin(p1, teams.c.player1_id == p1.c.player_id)
+            .outerjoin(p2, teams.c.player2_id == p2.c.player_id)
+            .order_by(teams.c.tournament_id, teams.c.position)
+        )
+        self._flush()
+        with self._connection() as conn:
+            rows = conn.execute(select(tournaments).order_by(tournaments.c.date.desc())).all()
+            team_rows = conn.execute(team_query).all()
+
+        results = {}
+        for row in team_rows:
+            results.setdefault(row.tournament_id, []).append({
+                'position': row.position, 'expected_position': row.expected_position,
+                'score': row.score, 'team_rating': row.team_rating, 'payout': row.payout or 0,
+                'player1_name': row.player1_name or 'Unknown',
+                'player2_name': row.player2_name or 'Ghost Player',
+            })
+        return [{
+            'id': row.tournament_id, 'date': _iso(row.date), 'course': row.course,
+            'team_count': row.team_count, 'status': row.status or 'Completed',
+            'ace_pot_paid': bool(row.ace_pot_paid), 'results': results.get(row.tournament_id, []),
+        } for row in rows]
+
+    # ── Teams ────────────────────────────────────────────────────────
+
+    def add_team_result(self, tournament_id: int, player1: str, player2: str,
+                        position: int, expected_position: float,
+                        score: int, team_rating: float) -> Optional[int]:
+        p1_id = self._get_player_id_safe(player1)
+        p2_id = self._get_player_id_safe(player2) if player2 != "Ghost Player" else None
+        if p1_id is None:
+            print(f"Error: Player {player1} not found")
+            return None
+        return self._write(teams, {
+            'tournament_id': tournament_id, 'player1_id': p1_id, 'player2_id': p2_id,
+            'is_ghost_team': p2_id is None, 'position': position,
+            'expected_position': expected_position, 'score': score, 'team_rating': team_rating,
+            'payout': 0,
+        })
+
+    # ── Player History ───────────────────────────────────────────────
+
+    def add_player_history(self, player_name: str, tournament_id: int,
+                           old_rating: float, new_rating: float,
+                           position: int, expected_position: float,
+                           score: int, with_ghost: bool) -> Optional[int]:
+        player_id = self._get_player_id_safe(player_name)
+        if player_id is None:
+            print(f"Error: Player {player_name} not found")
+            return None
+        return self._write(player_history, {
+            'player_id': player_id, 'tournament_id': tournament_id, 'old_rating': old_rating,
+            'new_rating': new_rating, 'position': position, 'expected_position': expected_position,
+            'score': score, 'with_ghost': with_ghost,
+        })
+
+    def get_player_history(self, player_name: str) -> List[Dict[str, Any]]:
+        player_id = self._get_player_id_safe(player_name)
+        if player_id is None:
+            return []
+        self._flush()
+        query = (
+            select(player_history, tournaments.c.date)
+            .join(tournaments, player_history.c.tournament_id == tournaments.c.tournament_id)
+            .where(player_history.c.player_id == player_id)
+            .order_by(tournaments.c.date.desc())
+        )
+        with self._connection() as conn:
+            rows = conn.execute(query).all()
+        return [{
+            'tournament_id': row.tournament_id, 'position': row.position,
+            'expected_position': row.expected_position, 'old_rating': row.old_rating,
+            'new_rating': row.new_rating, 'score': row.score, 'with_ghost': bool(row.with_ghost),
+            'tournament_date': _iso(row.date),
+        } for row in rows]
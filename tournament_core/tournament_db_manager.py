@@ -7,27 +7,39 @@ It handles all CRUD operations using the shared Flask-SQLAlchemy models.
 """
 
 import datetime
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 
+from sqlalchemy.orm import aliased
+
+from .serializers import (
+    player_encoder, tournament_record_encoder, team_encoder, history_record_encoder,
+    ace_pot_entry_encoder, to_iso,
+)
 from .models import (
     db, Player, Tournament, Team, PlayerHistory,
-    TournamentParticipant, AcePotTracker, AcePotConfig
+    TournamentParticipant, AcePotTracker, AcePotConfig, AcePotBalance
 )
 
+# Rows per multi-row INSERT, well inside every backend's bound-parameter limit
+INSERT_CHUNK = 500
+
 
 class TournamentDBManager:
     """Database manager using Flask-SQLAlchemy for MySQL."""
 
     def __init__(self):
         """Initialize the database manager. Requires Flask app context."""
-        pass
+        self._local = threading.local()
 
     # ── Players ──────────────────────────────────────────────────────
 
     def add_player(self, name: str, rating: float, is_club_member: bool = False) -> int:
         player = Player(name=name, rating=rating, tournaments_played=0, is_club_member=is_club_member)
         db.session.add(player)
-        db.session.commit()
+        self._commit()
         return player.player_id
 
     def update_player_rating(self, name: str, rating: float) -> bool:
@@ -35,7 +47,7 @@ class TournamentDBManager:
         if not player:
             return False
         player.rating = rating
-        db.session.commit()
+        self._commit()
         return True
 
     def increment_player_tournaments(self, name: str) -> bool:
@@ -43,7 +55,7 @@ class TournamentDBManager:
         if not player:
             return False
         player.tournaments_played += 1
-        db.session.commit()
+        self._commit()
         return True
 
     def get_player_id(self, name: str) -> int:
@@ -53,24 +65,79 @@ class TournamentDBManager:
         return player.player_id
 
     def get_all_players(self) -> List[Dict[str, Any]]:
-        players = Player.query.order_by(Player.rating.desc()).all()
-        return [
-            {
-                'id': p.player_id,
-                'name': p.name,
-                'rating': float(p.rating),
-                'tournaments_played': p.tournaments_played,
-                'is_club_member': p.is_club_member,
-            }
-            for p in players
-        ]
+        return player_encoder.many(Player.query.order_by(Player.rating.desc()))
+
+    def resolve_player_ids(self, names: List[str]) -> Dict[str, Optional[int]]:
+        """Map each name (case-insensitively) to its player_id with one query.
+
+        Unknown names map to None; "Ghost Player" maps to -1 like _get_player_id_safe.
+        """
+        lowered = {n.lower() for n in names if n and n != "Ghost Player"}
+        rows = []
+        if lowered:
+            rows = (
+                db.session.query(Player.player_id, Player.name)
+                .filter(db.func.lower(Player.name).in_(lowered))
+                .all()
+            )
+        by_lower = {name.lower(): pid for pid, name in rows}
+        return {n: -1 if n == "Ghost Player" else by_lower.get(n.lower()) for n in names}
+
+    def find_players(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Existing players among ``names`` with one query, keyed by lower-cased name."""
+        lowered = {n.lower() for n in names}
+        rows = []
+        if lowered:
+            rows = (
+                db.session.query(Player.player_id, Player.name, Player.is_club_member)
+                .filter(db.func.lower(Player.name).in_(lowered))
+                .all()
+            )
+        return {name.lower(): {'id': pid, 'name': name, 'is_club_member': bool(member)}
+                for pid, name, member in rows}
+
+    def add_players(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many players (name, rating, is_club_member) with multi-row INSERTs."""
+        for start in range(0, len(rows), INSERT_CHUNK):
+            db.session.execute(Player.__table__.insert().values([
+                {'name': r['name'], 'rating': r['rating'], 'tournaments_played': 0,
+                 'is_club_member': r.get('is_club_member', False)}
+                for r in rows[start:start + INSERT_CHUNK]
+            ]))
+        self._commit()
+        return len(rows)
+
+    def set_club_membership(self, player_ids: List[int], is_club_member: bool) -> int:
+        """Set club membership for many players with one UPDATE."""
+        if not player_ids:
+            return 0
+        Player.query.filter(Player.player_id.in_(player_ids)).update(
+            {Player.is_club_member: is_club_member}, synchronize_session=False,
+        )
+        self._commit()
+        return len(player_ids)
+
+    def credit_seasonal_cash(self, credits: Dict[int, float]) -> None:
+        """Add to many players' seasonal_cash with one UPDATE per distinct amount.
+
+        The caller is responsible for committing.
+        """
+        by_amount = defaultdict(list)
+        for player_id, amount in credits.items():
+            if amount:
+                by_amount[round(amount, 2)].append(player_id)
+        for amount, player_ids in by_amount.items():
+            Player.query.filter(Player.player_id.in_(player_ids)).update(
+                {Player.seasonal_cash: Player.seasonal_cash + amount},
+                synchronize_session=False,
+            )
 
     def update_player_club_membership(self, player_name: str, is_club_member: bool) -> bool:
         player = Player.query.filter(db.func.lower(Player.name) == player_name.lower()).first()
         if not player:
             return False
         player.is_club_member = is_club_member
-        db.session.commit()
+        self._commit()
         return True
 
     # ── Tournaments ──────────────────────────────────────────────────
@@ -78,38 +145,94 @@ class TournamentDBManager:
     def add_tournament(self, date: str, course: str, team_count: int, ace_pot_paid: bool = False) -> Optional[int]:
         t = Tournament(date=date, course=course, team_count=team_count, ace_pot_paid=ace_pot_paid)
         db.session.add(t)
-        db.session.commit()
+        self._commit()
+        return t.tournament_id
+
+    def complete_tournament(self, tournament_id: int, date: str, course: str, team_count: int,
+                            ace_pot_paid: bool = False) -> Optional[int]:
+        """Mark a pending tournament shell as completed in place, keeping its id."""
+        t = Tournament.query.get(tournament_id)
+        if not t:
+            return None
+        if date:
+            t.date = datetime.date.fromisoformat(date) if isinstance(date, str) else date
+        t.course = course
+        t.team_count = team_count
+        t.ace_pot_paid = ace_pot_paid
+        t.status = 'Completed'
+        self._commit()
         return t.tournament_id
 
     def get_tournaments(self) -> List[Dict[str, Any]]:
         tournaments = Tournament.query.order_by(Tournament.date.desc()).all()
         result = []
         for t in tournaments:
-            td = {
-                'id': t.tournament_id,
-                'date': t.date.isoformat() if hasattr(t.date, 'isoformat') else str(t.date),
-                'course': t.course,
-                'team_count': t.team_count,
-                'status': t.status or 'Completed',
-                'ace_pot_paid': t.ace_pot_paid,
-                'results': [],
-            }
+            td = tournament_record_encoder(t)
+            td['status'] = t.status or 'Completed'
+            td['results'] = []
             teams = Team.query.filter_by(tournament_id=t.tournament_id).order_by(Team.position).all()
             for team in teams:
                 p1 = Player.query.get(team.player1_id)
                 p2 = Player.query.get(team.player2_id) if team.player2_id else None
-                td['results'].append({
-                    'player1_name': p1.name if p1 else 'Unknown',
-                    'player2_name': p2.name if p2 else 'Ghost Player',
-                    'position': team.position,
-                    'expected_position': float(team.expected_position),
-                    'score': team.score,
-                    'team_rating': float(team.team_rating),
-                    'payout': float(team.payout) if team.payout else 0,
-                })
+                row = team_encoder(team)
+                row['player1_name'] = p1.name if p1 else 'Unknown'
+                row['player2_name'] = p2.name if p2 else 'Ghost Player'
+                row['payout'] = row['payout'] or 0
+                td['results'].append(row)
             result.append(td)
         return result
 
+    def get_tournament_detail(self, tournament_id: int) -> Optional[Dict[str, Any]]:
+        """Tournament, participants, team results and ace pot activity.
+
+        Four queries regardless of field size: the tournament row, participants
+        joined to players, teams joined to both players, and one ace pot aggregate.
+        """
+        t = Tournament.query.get(tournament_id)
+        if t is None:
+            return None
+
+        p1, p2 = aliased(Player), aliased(Player)
+        teams = (
+            db.session.query(Team, p1.name, p2.name)
+            .outerjoin(p1, Team.player1_id == p1.player_id)
+            .outerjoin(p2, Team.player2_id == p2.player_id)
+            .filter(Team.tournament_id == tournament_id)
+            .order_by(Team.position)
+            .all()
+        )
+        results = []
+        for team, p1_name, p2_name in teams:
+            row = team_encoder(team)
+            row['team'] = [p1_name or 'Unknown', p2_name or 'Ghost Player']
+            row['payout'] = row['payout'] or 0
+            results.append(row)
+
+        ace_pot = self.get_ace_pot_ledger_summary(tournament_id=tournament_id)
+        ace_pot = ace_pot[0] if ace_pot else {'entries': 0, 'buy_ins': 0.0, 'payouts': 0.0, 'net': 0.0}
+
+        return {
+            'tournament_id': t.tournament_id,
+            'date': to_iso(t.date),
+            'course': t.course,
+            'teams': t.team_count,
+            'status': t.status or 'Completed',
+            'participants': [
+                {'name': p['name'], 'rating': p['rating'], 'ace_pot_buy_in': p['ace_pot_buy_in']}
+                for p in self.get_tournament_participants(tournament_id)
+            ],
+            'results': results,
+            'total_payout': round(sum(r['payout'] for r in results), 2),
+            'ace_pot_paid': t.ace_pot_paid,
+            'ace_pot_recipient': t.ace_pot_paid_to if t.ace_pot_paid else None,
+            'ace_pot': {
+                'entries': ace_pot['entries'],
+                'buy_ins': ace_pot['buy_ins'],
+                'paid_out': abs(ace_pot['payouts']),
+                'net': ace_pot['net'],
+            },
+        }
+
     # ── Teams ────────────────────────────────────────────────────────
 
     def add_team_result(self, tournament_id: int, player1: str, player2: str,
@@ -133,7 +256,7 @@ class TournamentDBManager:
             team_rating=team_rating,
         )
         db.session.add(team)
-        db.session.commit()
+        self._commit()
         return team.team_id
 
     # ── Player History ───────────────────────────────────────────────
@@ -158,7 +281,7 @@ class TournamentDBManager:
             with_ghost=with_ghost,
         )
         db.session.add(ph)
-        db.session.commit()
+        self._commit()
         return ph.history_id
 
     def get_player_history(self, player_name: str) -> List[Dict[str, Any]]:
@@ -174,17 +297,8 @@ class TournamentDBManager:
             .all()
         )
         return [
-            {
-                'tournament_date': row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date),
-                'old_rating': float(ph.old_rating),
-                'new_rating': float(ph.new_rating),
-                'position': ph.position,
-                'expected_position': float(ph.expected_position),
-                'score': ph.score,
-                'with_ghost': ph.with_ghost,
-            }
-            for ph, _ in rows
-            for row in [type('R', (), {'date': _})]
+            {**history_record_encoder(ph), 'tournament_date': to_iso(date)}
+            for ph, date in rows
         ]
 
     # ── Ace Pot ──────────────────────────────────────────────────────
@@ -200,12 +314,16 @@ class TournamentDBManager:
         else:
             config = AcePotConfig(id=1, cap_amount=cap_amount)
             db.session.add(config)
-        db.session.commit()
+        self._commit()
         return True
 
     def get_ace_pot_balance(self) -> Dict[str, float]:
-        latest = AcePotTracker.query.order_by(AcePotTracker.entry_id.desc()).first()
-        total = float(latest.balance) if latest else 0.0
+        row = AcePotBalance.query.get(1)
+        if row:
+            total = float(row.balance)
+        else:
+            latest = AcePotTracker.query.order_by(AcePotTracker.entry_id.desc()).first()
+            total = float(latest.balance) if latest else 0.0
         cap = self.get_ace_pot_config()['cap_amount']
         return {
             'total': total,
@@ -215,56 +333,128 @@ class TournamentDBManager:
 
     def add_ace_pot_entry(self, date: str, description: str, amount: float,
                           tournament_id: int = None, player_id: int = None) -> Optional[int]:
-        latest = AcePotTracker.query.order_by(AcePotTracker.entry_id.desc()).first()
-        current_balance = float(latest.balance) if latest else 0.0
-        new_balance = current_balance + amount
-
-        entry = AcePotTracker(
-            date=date, description=description, amount=amount,
-            balance=new_balance, tournament_id=tournament_id, player_id=player_id,
-        )
-        db.session.add(entry)
-        db.session.commit()
+        entry = self.append_ace_pot_entry(date, description, amount, tournament_id, player_id)
+        self._commit()
         return entry.entry_id
 
-    def get_ace_pot_ledger(self) -> List[Dict[str, Any]]:
-        rows = (
+    def get_ace_pot_ledger(self, limit: int = None, before_id: int = None,
+                           start_date: str = None, end_date: str = None,
+                           tournament_id: int = None, player_name: str = None) -> List[Dict[str, Any]]:
+        """Ledger entries newest first, optionally filtered and keyset-paginated on entry_id."""
+        q = (
             db.session.query(AcePotTracker, Tournament.date, Tournament.course, Player.name)
             .outerjoin(Tournament, AcePotTracker.tournament_id == Tournament.tournament_id)
             .outerjoin(Player, AcePotTracker.player_id == Player.player_id)
-            .order_by(AcePotTracker.entry_id.desc())
-            .all()
         )
+        q = self._filter_ace_pot_ledger(q, start_date, end_date, tournament_id, player_name)
+        if before_id is not None:
+            q = q.filter(AcePotTracker.entry_id < before_id)
+        q = q.order_by(AcePotTracker.entry_id.desc())
+        if limit is not None:
+            q = q.limit(limit)
+
+        return [
+            {**ace_pot_entry_encoder(e), 'tournament_date': to_iso(t_date),
+             'course': t_course, 'player_name': p_name}
+            for e, t_date, t_course, p_name in q.all()
+        ]
+
+    def get_ace_pot_ledger_summary(self, limit: int = None, before_id: int = None,
+                                   start_date: str = None, end_date: str = None,
+                                   tournament_id: int = None, player_name: str = None) -> List[Dict[str, Any]]:
+        """Per-tournament ledger aggregates, newest first.
+
+        Entries without a tournament (manual adjustments) are grouped under
+        tournament_id None. ``before_id`` pages on each group's last entry_id.
+        """
+        amount = AcePotTracker.amount
+        last_entry = db.func.max(AcePotTracker.entry_id)
+        q = (
+            db.session.query(
+                AcePotTracker.tournament_id, Tournament.date, Tournament.course,
+                db.func.count(AcePotTracker.entry_id),
+                db.func.sum(db.case((amount > 0, amount), else_=0)),
+                db.func.sum(db.case((amount < 0, amount), else_=0)),
+                db.func.sum(amount),
+                last_entry,
+            )
+            .outerjoin(Tournament, AcePotTracker.tournament_id == Tournament.tournament_id)
+        )
+        q = self._filter_ace_pot_ledger(q, start_date, end_date, tournament_id, player_name)
+        q = q.group_by(AcePotTracker.tournament_id, Tournament.date, Tournament.course)
+        if before_id is not None:
+            q = q.having(last_entry < before_id)
+        q = q.order_by(last_entry.desc())
+        if limit is not None:
+            q = q.limit(limit)
+
         return [
             {
-                'id': e.entry_id,
-                'date': e.date.isoformat() if hasattr(e.date, 'isoformat') else str(e.date),
-                'description': e.description,
-                'amount': float(e.amount),
-                'balance': float(e.balance),
-                'tournament_id': e.tournament_id,
-                'tournament_date': t_date.isoformat() if t_date and hasattr(t_date, 'isoformat') else str(t_date) if t_date else None,
-                'course': t_course,
-                'player_name': p_name,
-                'player_id': e.player_id,
+                'tournament_id': tid,
+                'tournament_date': t_date.isoformat() if hasattr(t_date, 'isoformat') else t_date,
+                'course': course,
+                'entries': count,
+                'buy_ins': float(buy_ins or 0),
+                'payouts': float(payouts or 0),
+                'net': float(net or 0),
+                'last_entry_id': last_id,
             }
-            for e, t_date, t_course, p_name in rows
+            for tid, t_date, course, count, buy_ins, payouts, net, last_id in q.all()
         ]
 
+    def _filter_ace_pot_ledger(self, q, start_date: str = None, end_date: str = None,
+                               tournament_id: int = None, player_name: str = None):
+        if start_date:
+            q = q.filter(AcePotTracker.date >= start_date)
+        if end_date:
+            q = q.filter(AcePotTracker.date <= end_date)
+        if tournament_id is not None:
+            q = q.filter(AcePotTracker.tournament_id == tournament_id)
+        if player_name:
+            pid = self._get_player_id_safe(player_name)
+            if pid is None or pid == -1:
+                # No ledger entry names an unknown player or the ghost; don't fall through to the pooled rows
+                return q.filter(db.false())
+            q = q.filter(AcePotTracker.player_id == pid)
+        return q
+
     def set_ace_pot_balance(self, amount: float, date: str = None, description: str = None) -> bool:
-        latest = AcePotTracker.query.order_by(AcePotTracker.entry_id.desc()).first()
-        current = float(latest.balance) if latest else 0.0
-        adjustment = amount - current
         if date is None:
             date = datetime.datetime.now().strftime("%Y-%m-%d")
         if description is None:
             description = "Manual balance adjustment"
 
-        entry = AcePotTracker(date=date, description=description, amount=adjustment, balance=amount)
-        db.session.add(entry)
-        db.session.commit()
+        row = self.lock_ace_pot_balance()
+        adjustment = amount - float(row.balance)
+        self.append_ace_pot_entry(date, description, adjustment, balance_row=row)
+        self._commit()
         return True
 
+    def verify_ace_pot_balance(self, repair: bool = False) -> Dict[str, Any]:
+        """Recompute the ledger sum and report drift against the materialized balance."""
+        ledger_sum = db.session.query(db.func.coalesce(db.func.sum(AcePotTracker.amount), 0)).scalar()
+        ledger_sum = round(float(ledger_sum), 2)
+        latest = AcePotTracker.query.order_by(AcePotTracker.entry_id.desc()).first()
+        row = AcePotBalance.query.get(1)
+        materialized = float(row.balance) if row else None
+        drift = round(materialized - ledger_sum, 2) if materialized is not None else None
+
+        result = {
+            'ledger_sum': ledger_sum,
+            'materialized': materialized,
+            'latest_entry_balance': float(latest.balance) if latest else 0.0,
+            'drift': drift,
+            'ok': drift == 0,
+            'repaired': False,
+        }
+        if repair and not result['ok']:
+            row = self.lock_ace_pot_balance()
+            row.balance = ledger_sum
+            row.last_entry_id = latest.entry_id if latest else None
+            self._commit()
+            result['repaired'] = True
+        return result
+
     def process_ace_pot_payout(self, tournament_id: int, player_name: str) -> bool:
         player = Player.query.filter(db.func.lower(Player.name) == player_name.lower()).first()
         if not player:
@@ -273,22 +463,56 @@ class TournamentDBManager:
         t = Tournament.query.get(tournament_id)
         t_date = t.date.isoformat() if t and hasattr(t.date, 'isoformat') else datetime.datetime.now().strftime("%Y-%m-%d")
 
-        balance = self.get_ace_pot_balance()
-        payout = -balance['current']
+        row = self.lock_ace_pot_balance()
+        cap = self.get_ace_pot_config()['cap_amount']
+        payout = -min(float(row.balance), cap)
 
-        self.add_ace_pot_entry(
+        self.append_ace_pot_entry(
             date=t_date,
             description=f"Ace pot payout to {player_name}",
             amount=payout,
             tournament_id=tournament_id,
             player_id=player.player_id,
+            balance_row=row,
         )
 
         t.ace_pot_paid = True
         t.ace_pot_paid_to = player_name
-        db.session.commit()
+        self._commit()
         return True
 
+    def lock_ace_pot_balance(self) -> AcePotBalance:
+        """Fetch the running-total row FOR UPDATE, seeding it from the ledger if missing."""
+        row = AcePotBalance.query.filter_by(id=1).with_for_update().first()
+        if row is None:
+            total = db.session.query(db.func.coalesce(db.func.sum(AcePotTracker.amount), 0)).scalar()
+            last_id = db.session.query(db.func.max(AcePotTracker.entry_id)).scalar()
+            row = AcePotBalance(id=1, balance=round(float(total), 2), last_entry_id=last_id)
+            db.session.add(row)
+            db.session.flush()
+        return row
+
+    def append_ace_pot_entry(self, date: str, description: str, amount: float,
+                              tournament_id: int = None, player_id: int = None,
+                              balance_row: AcePotBalance = None) -> AcePotTracker:
+        """Insert a ledger row and move the running total in the current transaction.
+
+        The caller is responsible for committing.
+        """
+        row = balance_row or self.lock_ace_pot_balance()
+        new_balance = round(float(row.balance) + amount, 2)
+
+        entry = AcePotTracker(
+            date=date, description=description, amount=amount,
+            balance=new_balance, tournament_id=tournament_id, player_id=player_id,
+        )
+        db.session.add(entry)
+        db.session.flush()
+
+        row.balance = new_balance
+        row.last_entry_id = entry.entry_id
+        return entry
+
     # ── Tournament Participants ──────────────────────────────────────
 
     def add_tournament_participant(self, tournament_id: int, player_name: str,
@@ -304,14 +528,14 @@ class TournamentDBManager:
 
         if existing:
             existing.ace_pot_buy_in = ace_pot_buy_in
-            db.session.commit()
+            self._commit()
             return existing.participant_id
 
         tp = TournamentParticipant(
             tournament_id=tournament_id, player_id=player_id, ace_pot_buy_in=ace_pot_buy_in
         )
         db.session.add(tp)
-        db.session.commit()
+        self._commit()
 
         if ace_pot_buy_in and not skip_ace_pot_entry:
             t = Tournament.query.get(tournament_id)
@@ -326,6 +550,40 @@ class TournamentDBManager:
 
         return tp.participant_id
 
+    def bulk_upsert_tournament_participants(self, tournament_id: int, player_ids: List[int],
+                                            ace_pot_buy_in: bool = False) -> Dict[int, str]:
+        """Insert or update many participants with one multi-row statement.
+
+        Returns 'added' or 'updated' per player_id. The caller is responsible
+        for committing.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        if not player_ids:
+            return {}
+        existing = {
+            pid for (pid,) in db.session.query(TournamentParticipant.player_id).filter(
+                TournamentParticipant.tournament_id == tournament_id,
+                TournamentParticipant.player_id.in_(player_ids),
+            )
+        }
+        rows = [
+            {'tournament_id': tournament_id, 'player_id': pid, 'ace_pot_buy_in': ace_pot_buy_in}
+            for pid in player_ids
+        ]
+        self._upsert_rows(TournamentParticipant, rows, ['tournament_id', 'player_id'], ['ace_pot_buy_in'])
+        return {pid: 'updated' if pid in existing else 'added' for pid in player_ids}
+
+    def get_participant_names(self, tournament_id: int) -> List[str]:
+        """Participant names for a tournament with one joined query."""
+        rows = (
+            db.session.query(Player.name)
+            .join(TournamentParticipant, TournamentParticipant.player_id == Player.player_id)
+            .filter(TournamentParticipant.tournament_id == tournament_id)
+            .order_by(TournamentParticipant.participant_id)
+            .all()
+        )
+        return [name for (name,) in rows]
+
     def get_tournament_participants(self, tournament_id: int) -> List[Dict[str, Any]]:
         rows = (
             db.session.query(TournamentParticipant, Player)
@@ -355,5 +613,57 @@ class TournamentDBManager:
         player = Player.query.filter(db.func.lower(Player.name) == name.lower()).first()
         return player.player_id if player else None
 
+    def _upsert_rows(self, model, rows: List[Dict[str, Any]],
+                     conflict_cols: List[str], update_cols: List[str]) -> None:
+        """Multi-row INSERT that updates ``update_cols`` on unique-key conflicts."""
+        table = model.__table__
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table).values(rows)
+            stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_cols})
+        else:
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_cols,
+                set_={c: stmt.excluded[c] for c in update_cols},
+            )
+        db.session.execute(stmt)
+
     def commit_transaction(self):
-        db.session.commit()
+        self._commit()
+
+    # ── Transactions ─────────────────────────────────────────────────
+
+    def _commit(self):
+        """Commit, or only flush when running inside ``transaction()``."""
+        if getattr(self._local, 'depth', 0):
+            db.session.flush()
+        else:
+            db.session.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Group many manager calls into one commit.
+
+        Inside the block the per-call commits only flush, so generated ids are
+        still available; the outermost block commits once on success and rolls
+        back everything on error. Tracked per thread, since request threads and
+        background workers share this manager.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        try:
+            yield
+            if depth == 0:
+                db.session.commit()
+        except Exception:
+            if depth == 0:
+                db.session.rollback()
+            raise
+        finally:
+            self._local.depth = depth
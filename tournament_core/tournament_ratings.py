@@ -3,39 +3,127 @@
 Tournament-Style Disc Golf League Rating System
 
 This module implements a rating system for a doubles disc golf league
-backed by MySQL via Flask-SQLAlchemy.
+backed by MySQL via Flask-SQLAlchemy, or by an SQLStore when run standalone.
 """
 
+import bisect
 import datetime
 import math
-from typing import Dict, List, Tuple, Optional, Any
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 
-from .tournament_db_manager import TournamentDBManager
+from .player_search import PlayerSearchIndex, PlayerNotFoundError
+from .rating_state import RatingState
 
 
 class TournamentRatingSystem:
-    def __init__(self):
-        """Initialize the rating system. Requires Flask app context."""
-        self.db_manager = TournamentDBManager()
-        self.players = {}
-        self.tournaments = []
-
-        # Import ace pot manager
+    def __init__(self, db_manager=None):
+        """Initialize the rating system.
+
+        By default it uses TournamentDBManager, which requires a Flask app
+        context. Pass an SQLStore to run without Flask; the ace pot, payout
+        and live scoring managers are built on the Flask models and are only
+        available with the default manager.
+        """
+        self._state = RatingState()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self.verbose = True  # print a line for each player added and tournament recorded
+        self.ace_pot_manager = self.payout_engine = self.live_scoring = None
+        if db_manager is not None:
+            self.db_manager = db_manager
+            return
+
+        from .tournament_db_manager import TournamentDBManager
         from .ace_pot_manager import AcePotManager
+        from .payout_engine import PayoutEngine
+        from .live_scoring import LiveScoringManager
+        self.db_manager = TournamentDBManager()
         self.ace_pot_manager = AcePotManager(self.db_manager)
+        self.payout_engine = PayoutEngine(self.db_manager)
+        self.live_scoring = LiveScoringManager(self.db_manager)
+
+    # ── Snapshots ────────────────────────────────────────────────────
+
+    @property
+    def state(self) -> RatingState:
+        """The state this thread reads: its own draft while writing, else the published one.
+
+        Readers that need several values to agree should take this once and
+        read everything from it.
+        """
+        draft = getattr(self._local, 'draft', None)
+        return draft if draft is not None else self._state
+
+    @property
+    def players(self) -> Dict[str, Dict[str, Any]]:
+        return self.state.players
+
+    @property
+    def tournaments(self) -> List[Dict[str, Any]]:
+        return self.state.tournaments
+
+    @property
+    def search_index(self) -> PlayerSearchIndex:
+        return self.state.search_index
+
+    @property
+    def leaderboard(self):
+        return self.state.leaderboard
+
+    @property
+    def revision(self) -> int:
+        """Bumped whenever players or tournaments change."""
+        return self.state.revision
+
+    @contextmanager
+    def _writing(self):
+        """Build the next state on a private draft and publish it in one swap.
+
+        Writers are serialized. Other threads keep reading the previous state
+        until the reference assignment, so they never see a half-applied
+        change; an exception publishes nothing.
+        """
+        with self._write_lock:
+            draft = getattr(self._local, 'draft', None)
+            if draft is not None:
+                yield draft
+                return
+            draft = self._state.draft()
+            self._local.draft = draft
+            try:
+                yield draft
+                draft.views.clear()  # anything cached mid-write may predate later changes
+                draft.published_at = time.time()
+                self._state = draft
+            finally:
+                self._local.draft = None
+
+    @contextmanager
+    def batch(self):
+        """Apply many writes as one: a single store transaction and one published state.
+
+        Nothing is persisted or published if the block raises.
+        """
+        with self._writing(), self.db_manager.transaction():
+            yield
 
     def load_data(self):
         """Load player and tournament data from the database."""
-        self._load_from_db()
+        # Held across the reads so a concurrent write can't be overwritten by older rows
+        with self._write_lock:
+            self._load_from_db()
 
     def _load_from_db(self):
         """Load player and tournament data from database."""
         players_data = self.db_manager.get_all_players()
-        self.players = {}
+        players = {}
 
         for player in players_data:
             name = player['name']
-            self.players[name] = {
+            players[name] = {
                 'rating': player['rating'],
                 'tournaments_played': player['tournaments_played'],
                 'is_club_member': player.get('is_club_member', False),
@@ -43,7 +131,7 @@ class TournamentRatingSystem:
             }
             history_entries = self.db_manager.get_player_history(name)
             for entry in history_entries:
-                self.players[name]['history'].append({
+                players[name]['history'].append({
                     'tournament_date': entry['tournament_date'],
                     'old_rating': entry['old_rating'],
                     'new_rating': entry['new_rating'],
@@ -55,13 +143,14 @@ class TournamentRatingSystem:
                 })
 
         tournaments_data = self.db_manager.get_tournaments()
-        self.tournaments = []
+        tournaments = []
         for tournament in tournaments_data:
             td = {
                 'id': tournament['id'],
                 'date': tournament['date'],
                 'course': tournament['course'],
                 'teams': tournament['team_count'],
+                'status': tournament['status'],
                 'results': [],
             }
             for result in tournament['results']:
@@ -73,55 +162,119 @@ class TournamentRatingSystem:
                     'team_rating': result['team_rating'],
                     'payout': result.get('payout', 0),
                 })
-            self.tournaments.append(td)
+            tournaments.append(td)
 
-    # ── Lookup helpers ───────────────────────────────────────────────
+        self._state = RatingState(players, tournaments, revision=self._state.revision + 1)
 
-    def _create_case_insensitive_lookup(self) -> Dict[str, str]:
-        return {name.lower(): name for name in self.players.keys()}
+    # ── Lookup helpers ───────────────────────────────────────────────
 
     def player_exists(self, name: str) -> bool:
         if name == "Ghost Player":
             return True
-        return name.lower() in self._create_case_insensitive_lookup()
+        return self.search_index.resolve(name) is not None
 
     def get_player(self, name: str) -> Dict[str, Any]:
         if name == "Ghost Player":
             return {'rating': self.get_ghost_player_rating(), 'tournaments_played': 0, 'history': []}
-        lookup = self._create_case_insensitive_lookup()
-        if name.lower() in lookup:
-            return self.players[lookup[name.lower()]]
-        raise ValueError(f"Player {name} not found")
+        return self.players[self.get_player_name(name)]
 
     def get_player_name(self, name: str) -> str:
         if name == "Ghost Player":
             return "Ghost Player"
-        lookup = self._create_case_insensitive_lookup()
-        if name.lower() in lookup:
-            return lookup[name.lower()]
-        raise ValueError(f"Player {name} not found")
+        canonical = self.search_index.resolve(name)
+        if canonical is None:
+            raise self.player_not_found(name)
+        return canonical
+
+    def player_not_found(self, name: str) -> PlayerNotFoundError:
+        return PlayerNotFoundError(name, self.search_index.suggest(name))
+
+    def search_players(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked name matches with each player's current rating."""
+        matches = self.search_index.search(query, limit)
+        for m in matches:
+            m['rating'] = self.players[m['name']]['rating']
+        return matches
 
     # ── Player management ────────────────────────────────────────────
 
     def add_player(self, name: str, initial_rating: int = 1000, is_club_member: bool = False):
-        if self.player_exists(name):
-            raise ValueError(f"Player {name} already exists")
-
-        self.db_manager.add_player(name, initial_rating, is_club_member)
-        self.players[name] = {
-            'rating': initial_rating,
-            'tournaments_played': 0,
-            'history': [],
-            'is_club_member': is_club_member,
-        }
-        print(f"Added player {name} with initial rating {initial_rating}")
+        with self._writing() as draft:
+            if self.player_exists(name):
+                raise ValueError(f"Player {name} already exists")
+
+            self.db_manager.add_player(name, initial_rating, is_club_member)
+            draft.players[name] = {
+                'rating': initial_rating,
+                'tournaments_played': 0,
+                'history': [],
+                'is_club_member': is_club_member,
+            }
+            # The published index is shared with readers; copy it with the new name added
+            draft.search_index = draft.search_index.with_names([name])
+            draft.leaderboard.add(name, initial_rating)
+        if self.verbose:
+            print(f"Added player {name} with initial rating {initial_rating}")
+
+    def add_players(self, roster: Iterable[Tuple[str, float, Optional[bool]]]) -> Dict[str, int]:
+        """Add many players at once from (name, initial_rating, is_club_member) entries.
+
+        Names are matched case-insensitively against the store with one query.
+        New players go in with multi-row INSERTs; existing players keep their
+        rating and only have club membership changed (None leaves it as is),
+        with one UPDATE per membership value. Returns created/updated/skipped counts.
+        """
+        counts = {'created': 0, 'updated': 0, 'skipped': 0}
+        entries = {}
+        for name, rating, is_club_member in roster:
+            key = name.lower()
+            if name == "Ghost Player" or key in entries:
+                counts['skipped'] += 1
+                continue
+            entries[key] = (name, rating, is_club_member)
+
+        with self._writing() as draft, self.db_manager.transaction():
+            existing = self.db_manager.find_players(list(entries))
+            new_rows, changes = [], {True: [], False: []}
+            for key, (name, rating, is_club_member) in entries.items():
+                found = existing.get(key)
+                if found is None:
+                    new_rows.append({'name': name, 'rating': rating, 'is_club_member': bool(is_club_member)})
+                elif is_club_member is None or found['is_club_member'] == is_club_member:
+                    counts['skipped'] += 1
+                else:
+                    changes[is_club_member].append(found)
+
+            self.db_manager.add_players(new_rows)
+            for is_club_member, players in changes.items():
+                self.db_manager.set_club_membership([p['id'] for p in players], is_club_member)
+
+            for row in new_rows:
+                draft.players[row['name']] = {
+                    'rating': row['rating'],
+                    'tournaments_played': 0,
+                    'history': [],
+                    'is_club_member': row['is_club_member'],
+                }
+                draft.leaderboard.add(row['name'], row['rating'])
+            for is_club_member, players in changes.items():
+                for p in players:
+                    if p['name'] in draft.players:
+                        draft.own_player(p['name'])['is_club_member'] = is_club_member
+            if new_rows:
+                draft.search_index = draft.search_index.with_names(row['name'] for row in new_rows)
+
+        counts['created'] = len(new_rows)
+        counts['updated'] = len(changes[True]) + len(changes[False])
+        return counts
 
     def update_player_club_membership(self, name: str, is_club_member: bool):
         if not self.player_exists(name):
-            raise ValueError(f"Player {name} not found")
+            raise self.player_not_found(name)
         player_name = self.get_player_name(name)
-        self.players[player_name]['is_club_member'] = is_club_member
-        self.db_manager.update_player_club_membership(player_name, is_club_member)
+        with self._writing() as draft:
+            draft.own_player(player_name)['is_club_member'] = is_club_member
+            self.db_manager.update_player_club_membership(player_name, is_club_member)
 
     # ── Rating helpers ───────────────────────────────────────────────
 
@@ -152,7 +305,7 @@ class TournamentRatingSystem:
         for team in teams:
             for p in team:
                 if p != "Ghost Player" and not self.player_exists(p):
-                    raise ValueError(f"Player {p} not found")
+                    raise self.player_not_found(p)
             team_ratings[team] = self.calculate_team_rating(team[0], team[1])
 
         expected_position = 1
@@ -174,26 +327,41 @@ class TournamentRatingSystem:
 
     def record_tournament(self, team_results: List[Tuple[Tuple[str, str], int]],
                           course_name: str = None, date: str = None,
-                          ace_pot_paid: bool = False) -> Optional[int]:
+                          ace_pot_paid: bool = False, tournament_id: int = None) -> Optional[int]:
+        """Apply rating changes for a finished tournament and persist it.
+
+        With ``tournament_id`` the pending shell is completed in place;
+        otherwise a new tournament row is created. The new ratings are
+        published to readers only once every team has been applied.
+        """
         if date is None:
             date = datetime.datetime.now().strftime("%Y-%m-%d")
+        with self._writing() as draft, self.db_manager.transaction():
+            return self._record_tournament(draft, team_results, course_name, date, ace_pot_paid, tournament_id)
+
+    def _record_tournament(self, draft, team_results, course_name, date, ace_pot_paid, tournament_id):
 
         teams = [team for team, _ in team_results]
         for p1, p2 in teams:
             for p in (p1, p2):
                 if p != "Ghost Player" and not self.player_exists(p):
-                    raise ValueError(f"Player {p} not found")
+                    raise self.player_not_found(p)
 
         predictions = self.predict_tournament_outcome(teams)
 
-        tournament_id = self.db_manager.add_tournament(date, course_name, len(teams), ace_pot_paid)
+        if tournament_id is not None:
+            tournament_id = self.db_manager.complete_tournament(
+                tournament_id, date, course_name, len(teams), ace_pot_paid)
+            draft.tournaments = [t for t in draft.tournaments if t['id'] != tournament_id]
+        else:
+            tournament_id = self.db_manager.add_tournament(date, course_name, len(teams), ace_pot_paid)
         if tournament_id is None:
             print("Error: Failed to add tournament to database")
             return None
 
         tournament = {
             'id': tournament_id, 'date': date, 'course': course_name,
-            'teams': len(teams), 'results': [],
+            'teams': len(teams), 'status': 'Completed', 'results': [],
         }
 
         for position, (team, score) in self.resolve_tournament_positions(team_results):
@@ -226,13 +394,14 @@ class TournamentRatingSystem:
                 if player == "Ghost Player":
                     continue
                 k_factor = self.get_k_factor(player)
-                player_data = self.get_player(player)
+                player_data = draft.own_player(player)
                 old_rating = player_data['rating']
                 tournament_bonus = 1 + (len(teams) - 4) * 0.05
                 adjustment = k_factor * (position_diff + overall_modifier) * tournament_bonus
                 new_rating = old_rating + adjustment
 
                 player_data['rating'] = new_rating
+                self.leaderboard.update(player, old_rating, new_rating)
                 player_data['tournaments_played'] += 1
                 player_data['history'].append({
                     'tournament_date': date, 'old_rating': old_rating,
@@ -249,9 +418,10 @@ class TournamentRatingSystem:
                     "Ghost Player" in [player1, player2],
                 )
 
-        self.tournaments.append(tournament)
+        draft.tournaments.append(tournament)
         self.db_manager.commit_transaction()
-        print(f"Tournament recorded with {len(teams)} teams (ID: {tournament_id})")
+        if self.verbose:
+            print(f"Tournament recorded with {len(teams)} teams (ID: {tournament_id})")
         return tournament_id
 
     def resolve_tournament_positions(self, team_results):
@@ -271,7 +441,7 @@ class TournamentRatingSystem:
     def generate_balanced_teams(self, players: List[str]) -> List[Tuple[str, str]]:
         for p in players:
             if not self.player_exists(p):
-                raise ValueError(f"Player {p} not found")
+                raise self.player_not_found(p)
         players = [self.get_player_name(p) for p in players]
 
         if len(players) % 2 == 1:
@@ -289,6 +459,63 @@ class TournamentRatingSystem:
             teams.append((p1, p2))
         return teams
 
+    # ── Listing views ────────────────────────────────────────────────
+
+    PLAYER_SORT_FIELDS = ('rating', 'name', 'tournaments_played')
+
+    def _cached_view(self, key, build):
+        """Build a derived view once per published state; ``build`` receives that state."""
+        state = self.state
+        view = state.views.get(key)
+        if view is None:
+            view = state.views[key] = build(state)
+        return view
+
+    def player_page(self, sort: str = 'rating', descending: bool = True,
+                    after: Tuple = None, limit: int = None) -> Tuple[List[str], Optional[Tuple]]:
+        """Player names in sort order, keyset-paginated on (sort value, name).
+
+        The sorted key list is built once per published state, so a
+        page costs O(log n + limit). Returns (names, cursor key or None).
+        """
+        if sort not in self.PLAYER_SORT_FIELDS:
+            raise ValueError(f"Unknown sort field: {sort}")
+        if sort == 'rating' and descending:
+            # The default ordering is served straight from the rank index
+            return self.leaderboard.after(after, limit)
+
+        def build(state):
+            if sort == 'name':
+                return sorted((name.lower(), name) for name in state.players)
+            return sorted((data[sort], name) for name, data in state.players.items())
+
+        keys = self._cached_view(('players', sort), build)
+        if descending:
+            stop = len(keys) if after is None else bisect.bisect_left(keys, tuple(after))
+            start = 0 if limit is None else max(0, stop - limit)
+            page = keys[start:stop][::-1]
+            more = start > 0
+        else:
+            start = 0 if after is None else bisect.bisect_right(keys, tuple(after))
+            stop = len(keys) if limit is None else start + limit
+            page = keys[start:stop]
+            more = stop < len(keys)
+        return [name for _, name in page], (page[-1] if page and more else None)
+
+    def player_standing(self, name: str) -> Dict[str, Any]:
+        """Leaderboard rank (ties share a rank) and percentile for one player."""
+        rating = self.get_player(name)['rating']
+        return {
+            'rank': self.leaderboard.rank(rating),
+            'percentile': self.leaderboard.percentile(rating),
+            'ranked_players': len(self.leaderboard),
+        }
+
+    def get_tournament_record(self, tournament_id: int) -> Optional[Dict[str, Any]]:
+        """In-memory results for one tournament via a cached id index."""
+        index = self._cached_view('tournaments', lambda state: {t['id']: t for t in state.tournaments if 'id' in t})
+        return index.get(tournament_id)
+
     # ── Details ──────────────────────────────────────────────────────
 
     def get_player_details(self, name: str) -> Dict[str, Any]:
@@ -3,20 +3,37 @@
 Tournament Manager CLI
 
 This script provides a command-line interface for the tournament rating system.
+It runs the rating engine directly against a local SQLite file (or any
+SQLAlchemy URL, or a throwaway in-memory database) without Flask.
 """
 
 import argparse
 import sys
 import os
-import sys
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from tournament_core import TournamentRatingSystem
+from tournament_core.tournament_ratings import TournamentRatingSystem
+from tournament_core.sql_store import SQLStore
+
+DEFAULT_DB = os.environ.get('DG_DUBS_DB', 'tournament_data.db')
+
+
+def open_store(args):
+    """SQLStore for --memory, a SQLAlchemy URL, or a SQLite file path."""
+    if args.memory:
+        return SQLStore.memory()
+    if '://' in args.db:
+        from sqlalchemy import create_engine
+        return SQLStore(create_engine(args.db))
+    return SQLStore.sqlite(args.db)
+
 
 def main():
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(description='Disc Golf League Tournament Rating System')
-    parser.add_argument('--use-json', action='store_true', help='Use JSON storage instead of database')
+    parser.add_argument('--db', default=DEFAULT_DB,
+                        help=f'SQLite file or SQLAlchemy URL to use (default: {DEFAULT_DB}, or $DG_DUBS_DB)')
+    parser.add_argument('--memory', action='store_true', help='Use a throwaway in-memory database')
     
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
@@ -24,7 +41,9 @@ def main():
     add_parser = subparsers.add_parser('add', help='Add a player')
     add_parser.add_argument('name', nargs='?', help='Player name')
     add_parser.add_argument('--rating', type=float, default=1000, help='Initial rating')
-    add_parser.add_argument('--file', help='CSV file with player names and skill classes')
+    add_parser.add_argument('--file', help='CSV roster with player names and skill classes')
+    add_parser.add_argument('--no-club', action='store_true',
+                            help="Don't mark players in the roster as club members")
     
     # List players command
     subparsers.add_parser('list', help='List all players')
@@ -46,59 +65,49 @@ def main():
     
     # Generate teams command
     teams_parser = subparsers.add_parser('teams', help='Generate balanced teams')
-    teams_parser.add_argument('--players', nargs='+', help='List of players')
+    teams_parser.add_argument('players', nargs='*', help='Players to split into teams')
+    teams_parser.add_argument('--players', nargs='+', dest='player_list', help='List of players')
     teams_parser.add_argument('--allow-ghost', action='store_true', help='Allow ghost player for odd number of players')
     
+    # Bulk import command
+    import_parser = subparsers.add_parser('import', help='Import historical tournaments')
+    import_parser.add_argument('path', help='Directory of results files, or a JSONL file with one event per line')
+    import_parser.add_argument('--batch-size', type=int, default=50, help='Tournaments per transaction')
+
     # Tournament history command
     history_parser = subparsers.add_parser('history', help='Show tournament history')
     history_parser.add_argument('--limit', type=int, help='Limit number of tournaments to show')
     
-    # Storage command
-    storage_parser = subparsers.add_parser('storage', help='Change storage mode')
-    storage_parser.add_argument('mode', choices=['db', 'json'], help='Storage mode')
-    
     args = parser.parse_args()
-    
-    # Initialize rating system with appropriate storage
-    rating_system = TournamentRatingSystem(use_db=not args.use_json)
+    if args.command is None:
+        parser.print_help()
+        return
+
+    rating_system = TournamentRatingSystem(db_manager=open_store(args))
+    rating_system.load_data()
     
     # Execute command
     if args.command == 'add':
         if args.file:
-            # Add players from file
+            # Add a roster of players from file in one transaction
+            from tournament_core.roster_import import read_roster
             try:
-                with open(args.file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                            
-                        parts = line.split(',')
-                        if len(parts) >= 2:
-                            name = parts[0].strip()
-                            skill_class = parts[1].strip().upper()
-                            
-                            # Set rating based on skill class
-                            if skill_class == 'A':
-                                rating = 1300
-                            else:
-                                rating = 1000
-                                
-                            try:
-                                rating_system.add_player(name, rating)
-                                print(f"Added player {name} with initial rating {rating}")
-                            except ValueError as e:
-                                print(f"Error adding player {name}: {e}")
-                        else:
-                            print(f"Invalid line in player file: {line}")
+                entries, errors = read_roster(args.file, club_members=None if args.no_club else True)
             except FileNotFoundError:
                 print(f"File not found: {args.file}")
                 sys.exit(1)
+            if errors:
+                for location, message in errors:
+                    print(f"{location}: {message}")
+                print("Roster import failed; nothing was added.")
+                sys.exit(1)
+            counts = rating_system.add_players(entries)
+            print(f"Players created: {counts['created']}, updated: {counts['updated']}, "
+                  f"skipped: {counts['skipped']}")
         elif args.name:
             # Add single player
             try:
                 rating_system.add_player(args.name, args.rating)
-                print(f"Added player {args.name} with initial rating {args.rating}")
             except ValueError as e:
                 print(f"Error: {e}")
                 sys.exit(1)
@@ -121,7 +130,7 @@ def main():
             print(f"{'Player':<20} {'Rating':<10}")
             print("-" * 30)
             for name, rating, _ in players:
-                print(f"{name:<20} {rating:<10}")
+                print(f"{name:<20} {rating:<10.1f}")
         else:
             print("No players found.")
             
@@ -133,7 +142,7 @@ def main():
             
             print(f"\nPlayer: {player_name}")
             print("-" * 40)
-            print(f"Current Rating: {player_data['rating']}")
+            print(f"Current Rating: {player_data['rating']:.1f}")
             print(f"Tournaments Played: {player_data['tournaments_played']}")
             
             if player_data['history']:
@@ -143,7 +152,7 @@ def main():
                 
                 for entry in player_data['history']:
                     change = entry['new_rating'] - entry['old_rating']
-                    change_str = f"+{change}" if change > 0 else str(change)
+                    change_str = f"{change:+.1f}"
                     ghost = "Yes" if entry['with_ghost'] else "No"
                     
                     print(f"{entry['tournament_date']:<12} {entry['position']:<10} {entry['expected_position']:<10.1f} "
@@ -183,7 +192,6 @@ def main():
                     
                 try:
                     rating_system.record_tournament(team_results, args.course, args.date)
-                    print(f"Tournament recorded with {len(team_results)} teams")
                 except ValueError as e:
                     print(f"Error: {e}")
                     sys.exit(1)
@@ -220,7 +228,6 @@ def main():
                 
             try:
                 rating_system.record_tournament(team_results, args.course, args.date)
-                print(f"Tournament recorded with {len(team_results)} teams")
             except ValueError as e:
                 print(f"Error: {e}")
                 sys.exit(1)
@@ -291,7 +298,7 @@ def main():
             
             for team, data in sorted_teams:
                 team_str = f"{team[0]} & {team[1]}"
-                team_rating = data.get('team_rating', 0)
+                team_rating = data.get('rating', 0)
                 expected_position = data.get('expected_position', 0)
                 print(f"{team_str:<30} {team_rating:<10.1f} {expected_position:<20.1f}")
                 
@@ -310,9 +317,8 @@ def main():
             
     elif args.command == 'teams':
         # Generate balanced teams
-        if args.players:
-            players = args.players
-        else:
+        players = args.players or args.player_list
+        if not players:
             # Interactive mode
             print("Enter player names (one per line):")
             print("Enter a blank line when done.")
@@ -328,8 +334,12 @@ def main():
                 print("No players entered.")
                 sys.exit(1)
                 
+        if len(players) % 2 == 1 and not args.allow_ghost:
+            print("Error: Odd number of players; use --allow-ghost to pair one with the Ghost Player")
+            sys.exit(1)
+
         try:
-            teams = rating_system.generate_balanced_teams(players, args.allow_ghost)
+            teams = rating_system.generate_balanced_teams(players)
             predictions = rating_system.predict_tournament_outcome([tuple(team) for team in teams])
             scores = rating_system.predict_scores([tuple(team) for team in teams], 54)  # Assume par 54
             
@@ -337,7 +347,7 @@ def main():
             print("-" * 50)
             for i, team in enumerate(teams):
                 team_rating = rating_system.calculate_team_rating(team[0], team[1])
-                print(f"Team {i+1}: {team[0]} & {team[1]} (Rating: {team_rating})")
+                print(f"Team {i+1}: {team[0]} & {team[1]} (Rating: {team_rating:.1f})")
                 
             print("\nTournament Predictions:")
             print("-" * 60)
@@ -348,7 +358,7 @@ def main():
                 team_tuple = tuple(team)
                 team_str = f"{team[0]} & {team[1]}"
                 data = predictions[team_tuple]
-                team_rating = data.get('team_rating', 0)
+                team_rating = data.get('rating', 0)
                 expected_position = data.get('expected_position', 0)
                 print(f"{team_str:<30} {team_rating:<10.1f} {expected_position:<20.1f}")
                 
@@ -367,6 +377,28 @@ def main():
             print(f"Error: {e}")
             sys.exit(1)
             
+    elif args.command == 'import':
+        # Bulk import historical tournaments
+        from tournament_core.bulk_import import BulkImporter, BulkImportError
+
+        def progress(done, total):
+            print(f"  {done}/{total} tournaments", end='\r' if done < total else '\n', flush=True)
+
+        try:
+            stats = BulkImporter(rating_system, args.batch_size).run(args.path, progress)
+        except BulkImportError as e:
+            for location, message in e.errors[:50]:
+                print(f"{location}: {message}")
+            if len(e.errors) > 50:
+                print(f"... and {len(e.errors) - 50} more")
+            if e.imported:
+                print(f"Import failed after {e.imported} tournaments; the rest were not recorded.")
+            else:
+                print("Import failed; nothing was recorded.")
+            sys.exit(1)
+        print(f"Imported {stats['events']} tournaments ({stats['rows']} team results) in {stats['seconds']}s, "
+              f"{stats['rows_per_second']} rows/s")
+
     elif args.command == 'history':
         # Show tournament history
         tournaments = rating_system.tournaments
@@ -390,16 +422,7 @@ def main():
             for result in tournament['results']:
                 team_str = f"{result['team'][0]} & {result['team'][1]}"
                 print(f"{result['position']:<10} {team_str:<30} {result['score']:<10}")
-                
-    elif args.command == 'storage':
-        # Change storage mode
-        if args.mode == 'db':
-            rating_system.switch_storage_mode(True)
-            print("Switched to database storage (tournament_data.db)")
-        else:
-            rating_system.switch_storage_mode(False)
-            print("Switched to JSON storage (tournament_data.json)")
-            
+
     else:
         parser.print_help()
 